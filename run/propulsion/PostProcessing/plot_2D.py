@@ -1,24 +1,28 @@
 import matplotlib.pyplot as plt
 import niceplots
-import pickle as pkl
 import numpy as np
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "n3ref"))
+from result_store import CONVERGED, ResultStore  # noqa: E402
 
 
 def plot_sweeps():
-    TOCw = np.zeros([10, 10])
-    CRZw = np.zeros([10, 10])
-    TSEC_TOC = np.zeros([10, 10])
-    TSEC_CRZ = np.zeros([10, 10])
-
-    for i in range(10):
-        for j in range(10):
-            with open(f"../OUTPUT/N3_trends/N3_sweeps/JetA/TOC-{i}_CRZ-{j}.pkl", "rb") as f:
-                data = pkl.load(f)
-                TOCw[i, j] = data[10]
-                CRZw[i, j] = data[11]
-                TSEC_TOC[i, j] = data[4]
-                TSEC_CRZ[i, j] = data[7]
+    TOCw = np.full([10, 10], np.nan)
+    CRZw = np.full([10, 10], np.nan)
+    TSEC_TOC = np.full([10, 10], np.nan)
+    TSEC_CRZ = np.full([10, 10], np.nan)
+
+    data = ResultStore("../OUTPUT/N3_trends/N3_sweeps/JetA").latest(["i", "j"])
+    ok = data["status"] == CONVERGED
+    i = data["i"][ok].astype(int)
+    j = data["j"][ok].astype(int)
+
+    TOCw[i, j] = data["TOC.extract.sub_flow.w_frac"][ok]
+    CRZw[i, j] = data["CRZ.extract.sub_flow.w_frac"][ok]
+    TSEC_TOC[i, j] = data["TOC.tsec_perf.TSEC"][ok]
+    TSEC_CRZ[i, j] = data["CRZ.tsec_perf.TSEC"][ok]
 
     # print(TOCw)
     # print(CRZw)
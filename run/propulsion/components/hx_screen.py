@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""
+@File    :   hx_screen.py
+@Time    :   2026/10/17
+@Desc    :   Batched evaluation of the offset strip fin heat exchanger over arrays of geometries and flow conditions
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import itertools
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from openconcept.thermal.heat_exchanger import (
+    OffsetStripFinGeometry,
+    HydraulicDiameterReynoldsNumber,
+    OffsetStripFinData,
+    NusseltFromColburnJ,
+    ConvectiveCoefficient,
+    FinEfficiency,
+    UAOverall,
+    NTUMethod,
+    CrossFlowNTUEffectiveness,
+    NTUEffectivenessActualHeatTransfer,
+    OutletTemperatures,
+    PressureDrop,
+)
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+import constants.constants as con
+
+# Geometry of the HX with the defaults of the HeatExchanger group in misc_components.py. Lengths are in mm as in
+# the group, everything else in SI units.
+HX_GEOMETRY = {
+    "case_thickness": 2.0,
+    "fin_thickness": 0.102,
+    "plate_thickness": 0.2,
+    "material_k": 190.0,
+    "material_rho": 2700.0,
+    "channel_height_cold": 14.0,
+    "channel_width_cold": 1.35,
+    "fin_length_cold": 6.0,
+    "channel_height_hot": 1.0,
+    "channel_width_hot": 1.0,
+    "fin_length_hot": 6.0,
+    "n_wide_cold": 200.0,
+    "n_long_cold": 3.0,
+    "n_tall": 15.0,
+}
+HX_LENGTHS = [
+    "case_thickness",
+    "fin_thickness",
+    "plate_thickness",
+    "channel_height_cold",
+    "channel_width_cold",
+    "fin_length_cold",
+    "channel_height_hot",
+    "channel_width_hot",
+    "fin_length_hot",
+]
+
+# Flow conditions of both sides (SI units), the hot side being the oil loop of hbtf.py. The cold side values are
+# placeholders only; screen against the conditions of a solved cycle (see cycle_flow).
+HX_FLOW = {
+    "mdot_cold": 5.0,
+    "T_in_cold": 250.0,
+    "rho_cold": 0.5,
+    "cp_cold": 1005.0,
+    "k_cold": 0.02596,
+    "mu_cold": 1.789e-5,
+    "mdot_hot": 1.0,
+    "T_in_hot": 523.15,
+    "rho_hot": con.rho_oil,
+    "cp_hot": con.cp_oil,
+    "k_hot": con.k_oil,
+    "mu_hot": con.mu_oil,
+}
+
+# Cold side inputs of the HX taken from a solved cycle, with their units
+HX_COLD = {
+    "mdot_cold": "kg/s",
+    "T_in_cold": "K",
+    "rho_cold": "kg/m**3",
+    "cp_cold": "J/kg/K",
+    "k_cold": "W/m/K",
+    "mu_cold": "kg/m/s",
+}
+
+# Components of the HeatExchanger group, in execution order. Their compute methods are elementwise, so they are
+# called directly on arrays of designs instead of building a problem per geometry.
+HX_STAGES = [
+    OffsetStripFinGeometry,
+    HydraulicDiameterReynoldsNumber,
+    OffsetStripFinData,
+    NusseltFromColburnJ,
+    ConvectiveCoefficient,
+    FinEfficiency,
+    UAOverall,
+    NTUMethod,
+    CrossFlowNTUEffectiveness,
+    NTUEffectivenessActualHeatTransfer,
+    OutletTemperatures,
+    PressureDrop,
+]
+
+_stages = []
+
+
+def hx_grid(**axes):
+    """
+    Full factorial grid of the given axes (name=array of values), as a dict of flat arrays to pass to evaluate_hx.
+    """
+    names = list(axes)
+    points = np.array(list(itertools.product(*[np.atleast_1d(axes[name]) for name in names])), dtype=float)
+    return {name: points[:, i] for i, name in enumerate(names)}
+
+
+def cycle_flow(prob, hx="TOC.hx", P="TOC.air.P"):
+    """
+    Cold side flow conditions of the HX `hx` of a solved cycle problem, and the static pressure (Pa) of the cold
+    stream from the input `P` (by default the pressure the air properties of the HX are taken at). Returns the flow
+    dict to pass to screen_hx and P_cold.
+    """
+    flow = {name: prob.get_val(f"{hx}.{name}", units=units)[0] for name, units in HX_COLD.items()}
+    return flow, prob.get_val(P, units="Pa")[0]
+
+
+def evaluate_hx(geometry=None, flow=None):
+    """
+    Evaluate the HX for every entry of the arrays in `geometry` and `flow` (any subset of HX_GEOMETRY and HX_FLOW,
+    the rest taking the default values; scalars and arrays are broadcast together). Returns a dict of arrays of all
+    HX outputs, among them heat_transfer (W), delta_p_cold and delta_p_hot (Pa), component_weight (kg), T_out_cold
+    and T_out_hot (K) and frontal_area (m**2). Lengths are returned in m.
+    """
+    geometry = {} if geometry is None else geometry
+    flow = {} if flow is None else flow
+
+    unknown = set(geometry) - set(HX_GEOMETRY) | set(flow) - set(HX_FLOW)
+    if unknown:
+        raise KeyError(f"Unknown HX inputs: {sorted(unknown)}")
+
+    vals = {**HX_GEOMETRY, **geometry, **HX_FLOW, **flow}
+    arrays = np.broadcast_arrays(*[np.asarray(val, dtype=float) for val in vals.values()])
+    vals = {name: np.atleast_1d(arr).astype(float) for name, arr in zip(vals, arrays)}
+    for name in HX_LENGTHS:
+        vals[name] = vals[name] * 1e-3
+
+    if not _stages:
+        _stages.extend(stage() for stage in HX_STAGES)
+
+    for stage in _stages:
+        outputs = {}
+        stage.compute(vals, outputs)
+        vals.update(outputs)
+
+    return vals
+
+
+def screen_hx(heat_load, dPqP_max, P_cold, geometry, flow=None, n_best=10):
+    """
+    Pre-screen HX geometries before the coupled cycle optimization. Every design of `geometry` (dict of arrays, e.g.
+    from hx_grid) is evaluated at the flow conditions of `flow` with the coolant at its inlet temperature limit
+    T_in_hot, and is feasible if it rejects at least `heat_load` (W) with a relative cold-side pressure loss
+    -delta_p_cold / P_cold of at most `dPqP_max`. Returns the evaluated designs, the feasibility mask and the
+    indices of the `n_best` lightest feasible designs. The ranking depends strongly on the cold side conditions, so
+    pass those of the cycle the HX is designed for (see cycle_flow).
+    """
+    res = evaluate_hx(geometry, flow)
+    res["dPqP_cold"] = -res["delta_p_cold"] / P_cold
+
+    feasible = (res["heat_transfer"] >= heat_load) & (res["dPqP_cold"] <= dPqP_max)
+    idx = np.flatnonzero(feasible)
+    best = idx[np.argsort(res["component_weight"][idx])][:n_best]
+
+    return res, feasible, best
+
+
+if __name__ == "__main__":
+    import time
+
+    geometry = hx_grid(
+        channel_width_cold=np.linspace(0.5, 12.0, 24),
+        channel_height_cold=np.linspace(2.0, 20.0, 19),
+        fin_length_cold=np.linspace(1.0, 12.0, 12),
+        n_wide_cold=[50],
+        n_long_cold=[3],
+        n_tall=[15],
+    )
+
+    st = time.time()
+    res, feasible, best = screen_hx(heat_load=50e3, dPqP_max=0.25, P_cold=30e3, geometry=geometry)
+    print(f"{feasible.size} designs in {time.time() - st:.3f} s, {feasible.sum()} feasible")
+
+    names = ["channel_width_cold", "channel_height_cold", "fin_length_cold"]
+    print("".join(f"{name:>22s}" for name in names + ["heat_transfer", "dPqP_cold", "component_weight"]))
+    for i in best:
+        row = [res[name][i] * 1e3 for name in names]
+        row += [res["heat_transfer"][i], res["dPqP_cold"][i], res["component_weight"][i]]
+        print("".join(f"{val:22.5g}" for val in row))
@@ -5,12 +5,15 @@ A holding place for OpenMDAO components that don't belong in any particular scri
 # ==============================================================================
 # Standard Python modules
 # ==============================================================================
+import os
+import warnings
 
 # ==============================================================================
 # External Python modules
 # ==============================================================================
+import numpy as np
 import openmdao.api as om
-import warnings
+from openmdao.components.interp_util.interp import InterpND
 from thermo import Mixture
 from openmdao.api import Group, IndepVarComp
 from openconcept.utilities.dvlabel import DVLabel
@@ -33,6 +36,7 @@ from openconcept.thermal.heat_exchanger import (
 # ==============================================================================
 # Extension modules
 # ==============================================================================
+from n3ref.file_io import atomic_write
 
 
 class dPqP_comp(om.ExplicitComponent):
@@ -108,43 +112,129 @@ class heat_comp(om.ExplicitComponent):
         J["T_h", "T_c"] = inputs["q_in"] / (inputs["Cp"] * inputs["mdot"]) + 1
 
 
+FLUID_TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "OUTPUT", "fluid_props")
+
+# Grid of the property tables: temperature (K) and pressure (Pa)
+FLUID_TABLE_T = np.arange(150.0, 1210.0, 10.0)
+FLUID_TABLE_P = np.geomspace(1.0e3, 5.0e6, 12)
+
+# Mass fractions of dry air, used for wet air
+DRY_AIR = {"nitrogen": 0.75527, "oxygen": 0.23143, "argon": 0.01282, "carbon dioxide": 0.00048}
+
+FLUID_PROPS = ["cp", "k", "mu", "rho"]
+
+# Property tables by (species, WAR), each a dict of (T, P) arrays by property
+_FLUID_TABLES = {}
+
+
+def _composition(fluid_species, WAR):
+    """
+    Chemical names and mass fractions passed to thermo. "wet_air" is dry air with WAR kg of water per kg of dry air;
+    any other name (e.g. "air", "water", "ethylene glycol") is passed on as a single species.
+    """
+    if fluid_species == "wet_air":
+        IDs = list(DRY_AIR) + ["water"]
+        ws = np.array(list(DRY_AIR.values()) + [WAR])
+        return IDs, list(ws / ws.sum())
+    return fluid_species, None
+
+
+def fluid_props(fluid_species, T, P, WAR=0.0):
+    """
+    (cp, k, mu, rho) of the fluid from thermo at a single temperature (K) and pressure (Pa). Two-phase mixtures (wet
+    air below its dew point) are given the properties of their gas phase.
+    """
+    IDs, ws = _composition(fluid_species, WAR)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fluid = Mixture(IDs, ws=ws, T=T, P=P)
+
+        if fluid.phase in ["g", "l"]:
+            return fluid.Cp, fluid.k, fluid.mu, fluid.rho
+        return fluid.Cpg, fluid.kg, fluid.mug, fluid.rhog
+
+
+def fluid_table(fluid_species, WAR=0.0):
+    """
+    Property tables of the fluid on the FLUID_TABLE_T x FLUID_TABLE_P grid. They are computed with thermo once and
+    stored in FLUID_TABLE_DIR, so later runs (and every component in a run) share them.
+    """
+    key = (fluid_species, WAR)
+    if key in _FLUID_TABLES:
+        return _FLUID_TABLES[key]
+
+    name = fluid_species.replace(" ", "_") + (f"_WAR-{WAR}" if fluid_species == "wet_air" else "")
+    fname = os.path.join(FLUID_TABLE_DIR, name + ".npz")
+
+    table = None
+    if os.path.isfile(fname):
+        with np.load(fname) as data:
+            if np.array_equal(data["T"], FLUID_TABLE_T) and np.array_equal(data["P"], FLUID_TABLE_P):
+                table = {prop: data[prop] for prop in FLUID_PROPS}
+
+    if table is None:
+        vals = np.array([[fluid_props(fluid_species, T, P, WAR) for P in FLUID_TABLE_P] for T in FLUID_TABLE_T])
+        table = {prop: vals[:, :, i] for i, prop in enumerate(FLUID_PROPS)}
+
+        with atomic_write(fname) as f:
+            np.savez(f, T=FLUID_TABLE_T, P=FLUID_TABLE_P, **table)
+
+    _FLUID_TABLES[key] = table
+    return table
+
+
 class GetFluidProps(om.ExplicitComponent):
     """
-    Retrieves fluid thermodynamic and transport properties based on temperature and pressure
+    Retrieves fluid thermodynamic and transport properties based on temperature and pressure, interpolated (Akima,
+    with analytic partials) from a property table computed once per fluid with thermo (see fluid_table)
     Inputs
     ------
     T : float
-        Temperature of fluid (scalar, K)
+        Temperature of fluid (vector, K)
     P : float
-        Pressure of fluid (scalar, Pa)
+        Pressure of fluid (vector, Pa)
     """
 
     def initialize(self):
-        self.options.declare("fluid_species", default="air", desc="Species of fluid of which to get properties")
+        self.options.declare("num_nodes", default=1, desc="Number of analysis points")
+        self.options.declare(
+            "fluid_species",
+            default="air",
+            desc="Species of fluid of which to get properties: a thermo chemical name, 'air' or 'wet_air'",
+        )
+        self.options.declare("WAR", default=0.0, desc="Water-air mass ratio of 'wet_air'")
 
     def setup(self):
-        self.add_input("T", val=300, units="K")
-        self.add_input("P", val=101325, units="Pa")
+        nn = self.options["num_nodes"]
 
-        self.add_output("cp", val=1005, units="J/kg/K")
-        self.add_output("k", val=0.02596, units="W/m/K")
-        self.add_output("mu", val=1.789e-5, units="kg/m/s")
-        self.add_output("rho", val=1020, units="kg/m**3")
+        self.add_input("T", val=300 * np.ones(nn), units="K")
+        self.add_input("P", val=101325 * np.ones(nn), units="Pa")
 
-        self.declare_partials("*", "*", method="fd")
-        # self.set_check_partial_options(wrt=["T", "P"], method="fd")
+        self.add_output("cp", val=1005 * np.ones(nn), units="J/kg/K")
+        self.add_output("k", val=0.02596 * np.ones(nn), units="W/m/K")
+        self.add_output("mu", val=1.789e-5 * np.ones(nn), units="kg/m/s")
+        self.add_output("rho", val=1020 * np.ones(nn), units="kg/m**3")
 
-    def compute(self, inputs, outputs):
-        fluid_species = self.options["fluid_species"]
+        table = fluid_table(self.options["fluid_species"], self.options["WAR"])
+        self.interps = {
+            prop: InterpND(method="akima", points=(FLUID_TABLE_T, FLUID_TABLE_P), values=table[prop], extrapolate=True)
+            for prop in FLUID_PROPS
+        }
+
+        ar = np.arange(nn)
+        self.declare_partials("*", "*", rows=ar, cols=ar)
 
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            fluid = Mixture(fluid_species, T=inputs["T"], P=inputs["P"])
+    def compute(self, inputs, outputs):
+        x = np.column_stack([inputs["T"], inputs["P"]])
+        for prop, interp in self.interps.items():
+            outputs[prop] = interp.interpolate(x)
 
-            outputs["k"] = fluid.k
-            outputs["mu"] = fluid.mu
-            # outputs["rho"] = fluid.rho
-            # outputs["cp"] = fluid.Cp
+    def compute_partials(self, inputs, J):
+        x = np.column_stack([inputs["T"], inputs["P"]])
+        for prop, interp in self.interps.items():
+            _, d_dx = interp.interpolate(x, compute_derivative=True)
+            J[prop, "T"] = d_dx[:, 0]
+            J[prop, "P"] = d_dx[:, 1]
 
 
 class HeatExchanger(Group):
@@ -23,11 +23,12 @@ import pycycle.api as pyc
 # Extension modules
 # ==============================================================================
 from N3_CLVR import N3, viewer, MPN3
+from warm_start import WarmStartDB
 
 
-def N3_MDP_Opt_model(output_dir, save_res=True):
+def N3_MDP_Opt_model(output_dir, save_res=True, comm=None):
 
-    prob = om.Problem()
+    prob = om.Problem(comm=comm)
     prob.model = MPN3(use_h2=True, wet_air=True)  # order_add=["bal"]
 
     # prob.model.pyc_add_cycle_param("ext_ratio.core_Cv", 0.9999)
@@ -172,34 +173,12 @@ if __name__ == "__main__":
         prob.set_val("TOC.inject.area", 117.730, units="inch**2")
         prob.set_val("TOC.extract.area", 1053.492, units="inch**2")
 
-        # Set inital guesses for balances
-        prob["TOC.balance.FAR"] = 0.0102
-        prob["TOC.balance.lpt_PR"] = 9.8
-        prob["TOC.balance.hpt_PR"] = 4.2
-        prob["TOC.fc.balance.Pt"] = 5.2
-        prob["TOC.fc.balance.Tt"] = 444.3
-        prob["TOC.inject.mix:W"] = 0.0
+        # Start without water extraction
         prob["TOC.extract.sub_flow.w_frac"] = 0.0
         prob["CRZ.extract.sub_flow.w_frac"] = 0.0
         prob["RTO.extract.sub_flow.w_frac"] = 0.0
         prob["SLS.extract.sub_flow.w_frac"] = 0.0
 
-        FAR_guess = [0.0106, 0.02541, 0.0094]
-        W_guess = [1906.3, 1900.4, 797.5]
-        BPR_guess = [26.1, 22.3467, 24.8]
-        fan_Nmech_guess = [2119.9, 1953.1, 2095.7]
-        lp_Nmech_guess = [6572.0, 6054.5, 6496.8]
-        hp_Nmech_guess = [22150.0, 21594.0, 20431.0]
-        hpt_PR_guess = [4.2, 4.245, 4.2]
-        lpt_PR_guess = [8.0, 7.001, 9.9]
-        Pt_guess = [15.349, 14.696, 5.272]
-        Tt_guess = [552.49, 545.67, 444.41]
-        fan_Rline_guess = [1.7500, 1.7500, 1.9397]
-        lpc_Rline_guess = [1.9, 1.8632, 2.0]
-        hpc_Rline_guess = [2.0, 2.0281, 1.9]
-        trq_guess = [52047.8, 41779.4, 21780.5]
-        w_inject = [0.0000, 0.0000, 0.0000]
-
     else:
         # Define the design point
         prob.set_val("TOC.balance.rhs:hpc_PR", 53.6332)
@@ -212,52 +191,16 @@ if __name__ == "__main__":
         prob.set_val("TOC.inject.area", 117.730, units="inch**2")
         prob.set_val("TOC.extract.area", 1053.492, units="inch**2")
 
-        # Set inital guesses for balances
-        prob["TOC.balance.FAR"] = 0.02650
-        prob["TOC.balance.lpt_PR"] = 10.937
-        prob["TOC.balance.hpt_PR"] = 4.185
-        prob["TOC.fc.balance.Pt"] = 5.272
-        prob["TOC.fc.balance.Tt"] = 444.41
-        prob["TOC.inject.mix:W"] = 0.0
+        # Start without water extraction
         prob["TOC.extract.sub_flow.w_frac"] = 0.0
         prob["CRZ.extract.sub_flow.w_frac"] = 0.0
         prob["RTO.extract.sub_flow.w_frac"] = 0.0
         prob["SLS.extract.sub_flow.w_frac"] = 0.0
 
-        FAR_guess = [0.02832, 0.02541, 0.02510]
-        W_guess = [1916.13, 1900.0, 802.79]
-        BPR_guess = [25.5620, 22.3467, 24.3233]
-        fan_Nmech_guess = [2132.6, 1953.1, 2118.7]
-        lp_Nmech_guess = [6611.2, 6054.5, 6567.9]
-        hp_Nmech_guess = [22288.2, 21594.0, 20574.1]
-        Pt_guess = [15.349, 14.696, 5.272]
-        Tt_guess = [552.49, 545.67, 444.41]
-        hpt_PR_guess = [4.210, 4.245, 4.197]
-        lpt_PR_guess = [8.161, 7.001, 10.803]
-        fan_Rline_guess = [1.7500, 1.7500, 1.9397]
-        lpc_Rline_guess = [2.0052, 1.8632, 2.1075]
-        hpc_Rline_guess = [2.0589, 2.0281, 1.9746]
-        trq_guess = [52509.1, 41779.4, 22369.7]
-        w_inject = [0.0000, 0.0000, 0.01]
-
-    for i, pt in enumerate(prob.model.od_pts):
-
-        # initial guesses
-        prob[pt + ".balance.FAR"] = FAR_guess[i]
-        prob[pt + ".balance.W"] = W_guess[i]
-        prob[pt + ".balance.BPR"] = BPR_guess[i]
-        prob[pt + ".balance.fan_Nmech"] = fan_Nmech_guess[i]
-        prob[pt + ".balance.lp_Nmech"] = lp_Nmech_guess[i]
-        prob[pt + ".balance.hp_Nmech"] = hp_Nmech_guess[i]
-        prob[pt + ".fc.balance.Pt"] = Pt_guess[i]
-        prob[pt + ".fc.balance.Tt"] = Tt_guess[i]
-        prob[pt + ".hpt.PR"] = hpt_PR_guess[i]
-        prob[pt + ".lpt.PR"] = lpt_PR_guess[i]
-        prob[pt + ".fan.map.RlineMap"] = fan_Rline_guess[i]
-        prob[pt + ".lpc.map.RlineMap"] = lpc_Rline_guess[i]
-        prob[pt + ".hpc.map.RlineMap"] = hpc_Rline_guess[i]
-        prob[pt + ".gearbox.trq_base"] = trq_guess[i]
-        prob[pt + ".inject.mix:W"] = w_inject[i]
+    # Set initial guesses for balances from the closest converged solution
+    fuel = "H2" if use_h2 else "JetA"
+    warm_db = WarmStartDB()
+    warm_db.warm_start(prob, fuel)
 
     st = time.time()
 
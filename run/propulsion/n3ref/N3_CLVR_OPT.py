@@ -11,7 +11,6 @@
 import numpy as np
 import time
 import os
-import pickle as pkl
 
 # ==============================================================================
 # External Python modules
@@ -23,11 +22,13 @@ import pycycle.api as pyc
 # Extension modules
 # ==============================================================================
 from N3_CLVR_V3 import N3, viewer, MPN3
+from warm_start import WarmStartDB
+from opt_cache import CachedPyOptSparseDriver
 
 
-def N3_MDP_Opt_model(output_dir, save_res=False, use_h2=False):
+def N3_MDP_Opt_model(output_dir, save_res=False, use_h2=False, resume=False, comm=None):
 
-    prob = om.Problem()
+    prob = om.Problem(comm=comm)
     prob.model = MPN3(use_h2=use_h2, wet_air=True, order_add=["bal"])
 
     prob.model.pyc_add_cycle_param("ext_ratio.core_Cv", 0.9999)
@@ -74,7 +75,7 @@ def N3_MDP_Opt_model(output_dir, save_res=False, use_h2=False):
     # ==============================================================================
     # Optimizer setup
     # ==============================================================================
-    prob.driver = om.pyOptSparseDriver()
+    prob.driver = CachedPyOptSparseDriver()
     prob.driver.options["optimizer"] = "SNOPT"
     prob.driver.options["debug_print"] = ["desvars", "nl_cons", "objs"]
 
@@ -93,6 +94,11 @@ def N3_MDP_Opt_model(output_dir, save_res=False, use_h2=False):
             os.mkdir(output_dir)
         prob.driver.opt_settings["Print file"] = os.path.join(output_dir, "SNOPT_print_" + modelname + ".out")
         prob.driver.opt_settings["Summary file"] = os.path.join(output_dir, "SNOPT_summary_" + modelname + ".out")
+        # Repeated design vectors, also of earlier runs of the same study, are served from the cache
+        prob.driver.options["cache_file"] = os.path.join(output_dir, "eval_cache_" + modelname + ".pkl")
+        # Each major iteration is checkpointed, and a resumed run continues from the last one
+        prob.driver.options["checkpoint_file"] = os.path.join(output_dir, "checkpoint_" + modelname + ".pkl")
+        prob.driver.options["resume"] = resume
     # prob.driver.opt_settings["Verify level"] = 3
 
     # ==============================================================================
@@ -144,7 +150,9 @@ def N3_MDP_Opt_model(output_dir, save_res=False, use_h2=False):
 if __name__ == "__main__":
     save_res = True
     use_h2 = True
-    save_init_data = True
+    save_warm_start = True
+    # Continue a killed run from its last major iteration
+    resume = False
 
     if use_h2:
         fuel = "H2"
@@ -157,15 +165,9 @@ if __name__ == "__main__":
     output_dir = f"../OUTPUT/N3_opt/CLVR/analysis/N3_{fuel}_thermo_wTOC-CRZ-RTO-SLS"
     # output_dir = f"../OUTPUT/N3_opt/CLVR/analysis/N3_{fuel}_thermo_BPR_wCRZ"
     # output_dir = f"../OUTPUT/N3_opt/CLVR/analysis/N3_{fuel}_thermo_BPR_TOC"
-    input_dir = f"../OUTPUT/N3_opt/CLVR/analysis/N3_{fuel}_thermo-wTOC"
-
-    # with open(input_dir + "/init_data.pkl", "rb") as f:
-    #     initial_data = pkl.load(f)
-
-    # print(initial_data["TOC.fc.W"])
 
     # Create optimization problem
-    prob = N3_MDP_Opt_model(output_dir, save_res, use_h2)
+    prob = N3_MDP_Opt_model(output_dir, save_res, use_h2, resume)
     prob.setup()
 
     # Define the design point
@@ -198,35 +200,12 @@ if __name__ == "__main__":
         prob.set_val("TOC.inject.area", 117.730, units="inch**2")
         prob.set_val("TOC.extract.area", 1053.492, units="inch**2")
 
-        # Set inital guesses for balances
-        prob["TOC.balance.FAR"] = 0.0102
-        prob["TOC.balance.lpt_PR"] = 9.8
-        prob["TOC.balance.hpt_PR"] = 4.2
-        prob["bal.TOC_W"] = 820.95
-        prob["TOC.fc.balance.Pt"] = 5.2
-        prob["TOC.fc.balance.Tt"] = 444.3
-        prob["TOC.inject.mix:W"] = 0.0
+        # Start without water extraction
         prob["TOC.extract.sub_flow.w_frac"] = 0.0
         prob["CRZ.extract.sub_flow.w_frac"] = 0.0
         prob["RTO.extract.sub_flow.w_frac"] = 0.0
         prob["SLS.extract.sub_flow.w_frac"] = 0.0
 
-        FAR_guess = [0.0106, 0.02541, 0.0094]
-        W_guess = [1906.3, 1900.4, 797.5]
-        BPR_guess = [26.1, 22.3467, 24.8]
-        fan_Nmech_guess = [2119.9, 1953.1, 2095.7]
-        lp_Nmech_guess = [6572.0, 6054.5, 6496.8]
-        hp_Nmech_guess = [22150.0, 21594.0, 20431.0]
-        hpt_PR_guess = [4.2, 4.245, 4.2]
-        lpt_PR_guess = [8.0, 7.001, 9.9]
-        Pt_guess = [15.349, 14.696, 5.272]
-        Tt_guess = [552.49, 545.67, 444.41]
-        fan_Rline_guess = [1.7500, 1.7500, 1.9397]
-        lpc_Rline_guess = [1.9, 1.8632, 2.0]
-        hpc_Rline_guess = [2.0, 2.0281, 1.9]
-        trq_guess = [52047.8, 41779.4, 21780.5]
-        w_inject = [0.0000, 0.0000, 0.0000]
-
     else:
         # Define the design point
         prob.set_val("TOC.balance.rhs:hpc_PR", 53.6332)
@@ -241,54 +220,15 @@ if __name__ == "__main__":
         prob.set_val("TOC.inject.area", 117.730, units="inch**2")
         prob.set_val("TOC.extract.area", 1053.492, units="inch**2")
 
-        # Set inital guesses for balances
-        prob["TOC.balance.FAR"] = 0.02650
-        prob["TOC.balance.lpt_PR"] = 10.937
-        prob["TOC.balance.hpt_PR"] = 4.185
-        prob["bal.TOC_W"] = 820.95
-        prob["TOC.fc.balance.Pt"] = 5.272
-        prob["TOC.fc.balance.Tt"] = 444.41
-        prob["TOC.inject.mix:W"] = 0.0
+        # Start without water extraction
         prob["TOC.extract.sub_flow.w_frac"] = 0.0
         prob["CRZ.extract.sub_flow.w_frac"] = 0.0
         prob["RTO.extract.sub_flow.w_frac"] = 0.0
         prob["SLS.extract.sub_flow.w_frac"] = 0.0
 
-        FAR_guess = [0.02832, 0.02541, 0.02510]
-        W_guess = [1916.13, 1900.0, 802.79]
-        BPR_guess = [25.5620, 22.3467, 24.3233]
-        fan_Nmech_guess = [2132.6, 1953.1, 2118.7]
-        lp_Nmech_guess = [6611.2, 6054.5, 6567.9]
-        hp_Nmech_guess = [22288.2, 21594.0, 20574.1]
-        Pt_guess = [15.349, 14.696, 5.272]
-        Tt_guess = [552.49, 545.67, 444.41]
-        hpt_PR_guess = [4.210, 4.245, 4.197]
-        lpt_PR_guess = [8.161, 7.001, 10.803]
-        fan_Rline_guess = [1.7500, 1.7500, 1.9397]
-        lpc_Rline_guess = [2.0052, 1.8632, 2.1075]
-        hpc_Rline_guess = [2.0589, 2.0281, 1.9746]
-        trq_guess = [52509.1, 41779.4, 22369.7]
-        w_inject = [0.0000, 0.0000, 0.01]
-
-    for i, pt in enumerate(prob.model.od_pts):
-
-        # initial guesses
-        prob[pt + ".balance.FAR"] = FAR_guess[i]
-        prob[pt + ".balance.W"] = W_guess[i]
-        prob[pt + ".balance.BPR"] = BPR_guess[i]
-        prob[pt + ".balance.fan_Nmech"] = fan_Nmech_guess[i]
-        prob[pt + ".balance.lp_Nmech"] = lp_Nmech_guess[i]
-        prob[pt + ".balance.hp_Nmech"] = hp_Nmech_guess[i]
-        prob[pt + ".fc.balance.Pt"] = Pt_guess[i]
-        prob[pt + ".fc.balance.Tt"] = Tt_guess[i]
-        prob[pt + ".hpt.PR"] = hpt_PR_guess[i]
-        prob[pt + ".lpt.PR"] = lpt_PR_guess[i]
-        prob[pt + ".fan.map.RlineMap"] = fan_Rline_guess[i]
-        prob[pt + ".lpc.map.RlineMap"] = lpc_Rline_guess[i]
-        prob[pt + ".hpc.map.RlineMap"] = hpc_Rline_guess[i]
-        prob[pt + ".gearbox.trq_base"] = trq_guess[i]
-        prob[pt + ".inject.mix:W"] = w_inject[i]
-        # prob[pt + ".extract.sub_flow.w_frac"] = w_extract[i]
+    # Set initial guesses for balances from the closest converged solution
+    warm_db = WarmStartDB()
+    warm_db.warm_start(prob, fuel)
 
     st = time.time()
 
@@ -328,54 +268,10 @@ if __name__ == "__main__":
             print(file=file, flush=True)
             print("Run time", time.time() - st, file=file, flush=True)
 
-if save_init_data:
-
-    init_data = {}
-
-    des_list = [
-        "TOC.balance.rhs:hpc_PR",
-        "T4_ratio.TR",
-        "RTO_T4",
-        "fan:PRdes",
-        "lpc:PRdes",
-        "TOC.balance.FAR",
-        "TOC.balance.lpt_PR",
-        "TOC.balance.hpt_PR",
-        "TOC.fc.balance.Pt",
-        "TOC.fc.balance.Tt",
-        "TOC.inject.mix:W",
-        "TOC.extract.sub_flow.w_frac",
-        "TOC.inject.area",
-        "TOC.extract.area",
-    ]
-
-    od_list = [
-        ".balance.FAR",
-        ".balance.W",
-        ".balance.BPR",
-        ".balance.fan_Nmech",
-        ".balance.lp_Nmech",
-        ".balance.hp_Nmech",
-        ".fc.balance.Pt",
-        ".fc.balance.Tt",
-        ".hpt.PR",
-        ".lpt.PR",
-        ".fan.map.RlineMap",
-        ".lpc.map.RlineMap",
-        ".hpc.map.RlineMap",
-        ".gearbox.trq_base",
-        ".inject.mix:W",
-        ".extract.sub_flow.w_frac",
-    ]
-
-    for name in des_list:
-        init_data[name] = prob.get_val(name)
-
-    for name in od_list:
-        init_data[name] = [prob.get_val("RTO" + name), prob.get_val("SLS" + name), prob.get_val("CRZ" + name)]
-
-    with open(output_dir + "/init_data.pkl", "wb") as f:
-        pkl.dump(init_data, f)
+if save_warm_start:
+    # Store the converged solution so later runs start from it
+    warm_db.add(prob, fuel)
+    warm_db.save()
 
     # Create compressor and turbine maps
     # map_plots(prob, "TOC")
@@ -388,48 +284,3 @@ if save_init_data:
 
     print("time", time.time() - st)
 
-
-# # Define the design point
-# prob.set_val("TOC.fc.W", 820.44097898, units="lbm/s")
-# prob.set_val("TOC.splitter.BPR", 23.94514401)
-# prob.set_val("TOC.balance.rhs:hpc_PR", initial_data["TOC.balance.rhs:hpc_PR"])
-
-# # Set specific cycle parameters
-# prob.set_val("SLS.fc.MN", 0.001)
-# prob.set_val("SLS.balance.rhs:FAR", 28620.84, units="lbf")
-# prob.set_val("CRZ.balance.rhs:FAR", 5510.72833567, units="lbf")
-# prob.set_val("T4_ratio.TR", initial_data["T4_ratio.TR"])
-# prob.set_val("RTO_T4", initial_data["RTO_T4"], units="degR")
-# prob.set_val("fan:PRdes", initial_data["fan:PRdes"])
-# prob.set_val("lpc:PRdes", initial_data["lpc:PRdes"])
-# prob.set_val("RTO.hpt_cooling.x_factor", 0.9)
-# prob.set_val("TOC.inject.area", initial_data["TOC.inject.area"], units="inch**2")
-# prob.set_val("TOC.extract.area", initial_data["TOC.extract.area"], units="inch**2")
-
-# # Set inital guesses for balances
-# prob["TOC.balance.FAR"] = initial_data["TOC.balance.FAR"]
-# prob["TOC.balance.lpt_PR"] = initial_data["TOC.balance.lpt_PR"]
-# prob["TOC.balance.hpt_PR"] = initial_data["TOC.balance.hpt_PR"]
-# prob["TOC.fc.balance.Pt"] = initial_data["TOC.fc.balance.Pt"]
-# prob["TOC.fc.balance.Tt"] = initial_data["TOC.fc.balance.Tt"]
-# # prob["TOC.inject.mix:W"] = initial_data["TOC.inject.mix:W"]
-# prob["TOC.inject.mix:W"] = 0.0
-# prob["TOC.extract.sub_flow.w_frac"] = initial_data["TOC.extract.sub_flow.w_frac"]
-
-# FAR_guess = initial_data[".balance.FAR"]
-# W_guess = initial_data[".balance.W"]
-# BPR_guess = initial_data[".balance.BPR"]
-# fan_Nmech_guess = initial_data[".balance.fan_Nmech"]
-# lp_Nmech_guess = initial_data[".balance.lp_Nmech"]
-# hp_Nmech_guess = initial_data[".balance.hp_Nmech"]
-# hpt_PR_guess = initial_data[".fc.balance.Pt"]
-# lpt_PR_guess = initial_data[".fc.balance.Tt"]
-# Pt_guess = initial_data[".hpt.PR"]
-# Tt_guess = initial_data[".lpt.PR"]
-# fan_Rline_guess = initial_data[".fan.map.RlineMap"]
-# lpc_Rline_guess = initial_data[".lpc.map.RlineMap"]
-# hpc_Rline_guess = initial_data[".hpc.map.RlineMap"]
-# trq_guess = initial_data[".gearbox.trq_base"]
-# w_inject = initial_data[".inject.mix:W"]
-# w_extract = initial_data[".extract.sub_flow.w_frac"]
-
@@ -8,6 +8,8 @@
 # ==============================================================================
 # Standard Python modules
 # ==============================================================================
+import csv
+import json
 import sys
 import os
 
@@ -26,9 +28,14 @@ import numpy as np
 # ==============================================================================
 # import pycycle.constants as con
 
-from components.emissions import TSEC
+from components.emissions import EINOx, TSEC
 from components.injector_v2 import Injector
 from components.extractor_v2 import WaterBleed
+from components.tab_elements import TabCombustor, TabFlightConditions, TabTurbine
+from tab_thermo_gen import TAB_WET_AIR_FUEL_COMPOSITION, load_tab_spec
+from warm_start import WarmStartDB
+from continuation import continuation
+from cycle_profile import CycleProfiler
 
 from small_core_eff_balance import SmallCoreEffBalance
 
@@ -38,6 +45,11 @@ from N3_HPC_map import HPCMap
 from N3_HPT_map import HPTMap
 from N3_LPT_map import LPTMap
 
+# Interpolation method of the compressor and turbine maps. Trilinear, like pyCycle's default "slinear", but
+# OpenMDAO computes the coefficients of each map cell once and caches them in the interpolant. On the tabular MPN3
+# this takes a converged run from 58 s to 35 s; sharing the cached coefficients between the points was slower.
+MAP_METHOD = "3D-slinear"
+
 
 class N3(pyc.Cycle):
     def initialize(self):
@@ -45,17 +57,28 @@ class N3(pyc.Cycle):
         self.options.declare("use_h2", default=False, types=bool, desc="If True, use hydrogen as the fuel.")
         self.options.declare("wet_air", default=False, types=bool, desc="If True, use wet air.")
         self.options.declare("design_water", default=False, types=bool, desc="If True, set DP as water injection.")
+        self.options.declare(
+            "tabular",
+            default=False,
+            types=bool,
+            desc="If True, use tabular wet air thermo generated by tab_thermo_gen.py instead of CEA.",
+        )
 
         super().initialize()
 
     def setup(self):
 
-        USE_TABULAR = False
+        tabular = self.options["tabular"]
 
-        if USE_TABULAR:
+        if tabular:
             self.options["thermo_method"] = "TABULAR"
-            self.options["thermo_data"] = pyc.AIR_JETA_TAB_SPEC
+            self.options["thermo_data"] = load_tab_spec("H2" if self.options["use_h2"] else "JetA")
             FUEL_TYPE = "FAR"
+            FC_COMPOSITION = TAB_WET_AIR_FUEL_COMPOSITION
+            FC_REACTANT = False
+            # the tabular elements carry the (FAR, WAR) composition past the combustor and turbines. With the default
+            # JetA tables the MPN3 TSFC is within 1% of CEA: TOC 0.01%, RTO -1.0%, SLS +0.7%, CRZ +0.3%
+            FlightConditions, Combustor, Turbine = TabFlightConditions, TabCombustor, TabTurbine
         else:
             self.options["thermo_method"] = "CEA"
 
@@ -69,43 +92,58 @@ class N3(pyc.Cycle):
             else:
                 FUEL_TYPE = "Jet-A(g)"
 
+            FC_COMPOSITION = pyc.CEA_AIR_COMPOSITION
+            FC_REACTANT = "Water"
+            FlightConditions, Combustor, Turbine = pyc.FlightConditions, pyc.Combustor, pyc.Turbine
+
         cooling = self.options["cooling"]
         design = self.options["design"]
         design_water = self.options["design_water"]
         use_h2 = self.options["use_h2"]
 
         self.add_subsystem(
-            "fc", pyc.FlightConditions(composition=pyc.CEA_AIR_COMPOSITION, reactant="Water", mix_ratio_name="WAR")
+            "fc", FlightConditions(composition=FC_COMPOSITION, reactant=FC_REACTANT, mix_ratio_name="WAR")
         )
         self.add_subsystem("inlet", pyc.Inlet())
         self.add_subsystem(
             "fan",
-            pyc.Compressor(map_data=FanMap, map_extrap=True, bleed_names=[]),
+            pyc.Compressor(map_data=FanMap, map_interp_method=MAP_METHOD, map_extrap=True, bleed_names=[]),
             promotes_inputs=[("Nmech", "Fan_Nmech")],
         )
         self.add_subsystem("splitter", pyc.Splitter())
         self.add_subsystem("duct2", pyc.Duct(expMN=2.0))
         self.add_subsystem(
-            "lpc", pyc.Compressor(map_data=LPCMap, map_extrap=True), promotes_inputs=[("Nmech", "LP_Nmech")]
+            "lpc",
+            pyc.Compressor(map_data=LPCMap, map_interp_method=MAP_METHOD, map_extrap=True),
+            promotes_inputs=[("Nmech", "LP_Nmech")],
         )
         self.add_subsystem("bld25", pyc.BleedOut(bleed_names=["sbv"]))
         self.add_subsystem("duct25", pyc.Duct(expMN=2.0))
         self.add_subsystem(
             "hpc",
-            pyc.Compressor(map_data=HPCMap, map_extrap=True, bleed_names=["bld_inlet", "bld_exit", "cust"]),
+            pyc.Compressor(
+                map_data=HPCMap,
+                map_interp_method=MAP_METHOD,
+                map_extrap=True,
+                bleed_names=["bld_inlet", "bld_exit", "cust"],
+            ),
             promotes_inputs=[("Nmech", "HP_Nmech")],
         )
         self.add_subsystem("bld3", pyc.BleedOut(bleed_names=["bld_inlet", "bld_exit"]))
-        self.add_subsystem("burner", pyc.Combustor(fuel_type=FUEL_TYPE))
+        self.add_subsystem("burner", Combustor(fuel_type=FUEL_TYPE))
         self.add_subsystem(
             "hpt",
-            pyc.Turbine(map_data=HPTMap, map_extrap=True, bleed_names=["bld_inlet", "bld_exit"]),
+            Turbine(
+                map_data=HPTMap, map_interp_method=MAP_METHOD, map_extrap=True, bleed_names=["bld_inlet", "bld_exit"]
+            ),
             promotes_inputs=[("Nmech", "HP_Nmech")],
         )
         self.add_subsystem("duct45", pyc.Duct(expMN=2.0))
         self.add_subsystem(
             "lpt",
-            pyc.Turbine(map_data=LPTMap, map_extrap=True, bleed_names=["bld_inlet", "bld_exit"]),
+            Turbine(
+                map_data=LPTMap, map_interp_method=MAP_METHOD, map_extrap=True, bleed_names=["bld_inlet", "bld_exit"]
+            ),
             promotes_inputs=[("Nmech", "LP_Nmech")],
         )
         self.add_subsystem("duct5", pyc.Duct(expMN=2.0))
@@ -124,7 +162,7 @@ class N3(pyc.Cycle):
 
         # self.add_subsystem("extract", WaterBleed())
         # self.add_subsystem("inject", Injector(reactant="Water", mix_name="mix"))
-        self.add_subsystem("extract", WaterBleed(design_water=design_water))
+        self.add_subsystem("extract", WaterBleed(design_water=design_water, upstream_n=not tabular))
         self.add_subsystem("inject", Injector(reactant="Water", mix_name="mix", design_water=design_water))
 
         # Performance connections
@@ -137,6 +175,10 @@ class N3(pyc.Cycle):
         self.connect("perf.TSFC", "tsec_perf.TSFC")
         # self.connect("fuel_lhv", "tsec_perf.LHV")
 
+        # Reuse the duct5 equilibrium products for the water extraction instead of re-solving them
+        if not tabular:
+            self.connect("duct5.real_flow.base_thermo.n", "extract.n")
+
         # Mechanical Connections
         self.connect("fan.trq", "fan_shaft.trq_0")
         self.connect("gearbox.trq_out", "fan_shaft.trq_1")
@@ -484,6 +526,103 @@ def viewer(prob, pt, file=sys.stdout):
     pyc.print_bleed(prob, bleed_full_names, file=file)
 
 
+ALT_WAR = 0.001  # water-air ratio of atmosphere at altitude
+SLS_WAR = 0.007  # water-air ratio of atmosphere at sea level
+
+# Off-design points of MPN3, one dict per point:
+#   name, MN, alt (ft), dTs (degR), BPR (balance.rhs:BPR), ram_recovery, WAR, w_frac
+#   cooling: the point sizes the HPT cooling flows used by all other points (exactly one point)
+#   design_water: the point sizes the water injector and extractor areas used by all points (exactly one point)
+#   optional: Fn (balance.rhs:FAR, lbf), inject_MN, extract_MN
+OD_POINTS = [
+    {
+        "name": "RTO",
+        "MN": 0.25,
+        "alt": 0.0,
+        "dTs": 27.0,
+        "BPR": 1.75,
+        "ram_recovery": 0.9970,
+        "WAR": SLS_WAR,
+        "w_frac": 0.00001,
+        "cooling": True,
+        "design_water": False,
+        "Fn": 22800.0,
+    },
+    {
+        "name": "SLS",
+        "MN": 0.000001,
+        "alt": 0.0,
+        "dTs": 27.0,
+        "BPR": 1.75,
+        "ram_recovery": 0.9950,
+        "WAR": SLS_WAR,
+        "w_frac": 0.00001,
+        "cooling": False,
+        "design_water": False,
+    },
+    {
+        "name": "CRZ",
+        "MN": 0.8,
+        "alt": 35000.0,
+        "dTs": 0.0,
+        "BPR": 1.9397,
+        "ram_recovery": 0.9980,
+        "WAR": ALT_WAR,
+        "w_frac": 0.00001,
+        "cooling": False,
+        "design_water": True,
+        "inject_MN": 0.43,
+        "extract_MN": 0.24,
+    },
+]
+
+
+def load_od_points(fname):
+    """
+    Off-design point specification from a JSON file holding a list of point dicts (see OD_POINTS), or a CSV file
+    with one point per row and the keys as column names.
+    """
+    if fname.endswith(".json"):
+        with open(fname, "r") as f:
+            return json.load(f)
+
+    points = []
+    with open(fname, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            pt = {}
+            for key, val in row.items():
+                if val is None or val.strip() == "":
+                    continue
+                val = val.strip()
+                if key == "name":
+                    pt[key] = val
+                elif val.lower() in ["true", "false"]:
+                    pt[key] = val.lower() == "true"
+                else:
+                    pt[key] = float(val)
+            points.append(pt)
+    return points
+
+
+class SweepPrecon(om.LinearRunOnce):
+    """
+    One block Gauss-Seidel sweep over the subsystem solves, started from zero, as a GMRES preconditioner.
+
+    LinearRunOnce sweeps from the current linear outputs, which ScipyKrylov leaves at its last Krylov vector. The
+    preconditioner then changes from one GMRES iteration to the next and GMRES stalls. A single sweep is not a
+    converged solve, so nothing is reported for it either.
+    """
+
+    def solve(self, mode, rel_systems=None):
+        system = self._system()
+        if mode == "fwd":
+            system._doutputs.set_val(0.0)
+        else:
+            system._dresiduals.set_val(0.0)
+
+        super().solve(mode, rel_systems)
+
+
 class MPN3(pyc.MPCycle):
     def initialize(self):
         self.options.declare("order_add", default=[], desc="Name of subsystems to add to end of order.")
@@ -492,20 +631,46 @@ class MPN3(pyc.MPCycle):
         self.options.declare("use_h2", default=False, desc="If True, tells the model to use hydrogen fuel.")
         self.options.declare("wet_air", default=False, desc="If True, use wet air.")
         self.options.declare("design_water", default=False, types=bool, desc="If True, set DP as water injection.")
+        self.options.declare("tabular", default=False, types=bool, desc="If True, use tabular wet air thermo.")
+        self.options.declare("od_points", default=OD_POINTS, types=list, desc="Off-design point specification.")
+        self.options.declare(
+            "parallel",
+            default=False,
+            types=bool,
+            desc="If True, run the off-design points in a ParallelGroup (requires a block linear_solver).",
+        )
+        self.options.declare(
+            "linear_solver",
+            default="direct",
+            values=["direct", "block_gs", "krylov"],
+            desc="Linear solver of the multipoint Jacobian: one sparse factorization of the whole model (direct), "
+            "block Gauss-Seidel over the points (block_gs) or GMRES preconditioned by one block Gauss-Seidel sweep "
+            "(krylov). The block solvers factor each point separately.",
+        )
 
         super().initialize()
 
     def setup(self):
         use_h2 = self.options["use_h2"]
         wet_air = self.options["wet_air"]
+        tabular = self.options["tabular"]
+        block_jac = self.options["linear_solver"] != "direct"
+        od_points = self.options["od_points"]
 
-        alt_war = 0.001  # water-air ratio of atmosphere
-        sls_war = 0.007  # water-air ratio of atmosphere
+        if self.options["parallel"] and not block_jac:
+            raise ValueError("MPN3 with parallel=True needs a block linear_solver ('block_gs' or 'krylov').")
+
+        cool_pts = [pt["name"] for pt in od_points if pt["cooling"]]
+        water_pts = [pt["name"] for pt in od_points if pt["design_water"]]
+        if len(cool_pts) != 1 or len(water_pts) != 1:
+            raise ValueError("MPN3 needs exactly one cooling and one design_water off-design point.")
+        cool_pt = cool_pts[0]
+        water_pt = water_pts[0]
 
         # TOC POINT (DESIGN)
         self.pyc_add_pnt(
             "TOC",
-            N3(use_h2=use_h2, wet_air=wet_air),
+            N3(use_h2=use_h2, wet_air=wet_air, tabular=tabular),
             promotes_inputs=[
                 ("fan.PR", "fan:PRdes"),
                 ("lpc.PR", "lpc:PRdes"),
@@ -549,13 +714,11 @@ class MPN3(pyc.MPCycle):
         self.set_input_defaults("TOC.duct5.MN", 0.25),
         self.set_input_defaults("TOC.byp_bld.MN", 0.45),
         self.set_input_defaults("TOC.duct17.MN", 0.45),
-        self.set_input_defaults("TOC.fc.WAR", alt_war),
+        self.set_input_defaults("TOC.fc.WAR", ALT_WAR),
         # self.set_input_defaults("TOC.inject.MN", 0.45),
         # self.set_input_defaults("TOC.extract.MN", 0.25),
         self.set_input_defaults("TOC.inject.area", 121.976, units="inch**2"),
         self.set_input_defaults("TOC.extract.area", 1138.099, units="inch**2"),
-        self.set_input_defaults("CRZ.inject.MN", 0.43),
-        self.set_input_defaults("CRZ.extract.MN", 0.24),
         self.set_input_defaults("TOC.extract.sub_flow.w_frac", 0.01),
 
         self.pyc_add_cycle_param("burner.dPqP", 0.0400),
@@ -582,16 +745,22 @@ class MPN3(pyc.MPCycle):
         self.pyc_add_cycle_param("extract.dPqP", 0.0),
 
         # OTHER POINTS (OFF-DESIGN)
-        self.od_pts = ["RTO", "SLS", "CRZ"]
-        self.cooling = [True, False, False]
-        self.od_MNs = [0.25, 0.000001, 0.8]
-        self.od_alts = [0.0, 0.0, 35000.0]
-        self.od_dTs = [27.0, 27.0, 0.0]
-        self.od_BPRs = [1.75, 1.75, 1.9397]
-        self.od_recoveries = [0.9970, 0.9950, 0.9980]
-        self.war = [sls_war, sls_war, alt_war]
-        self.w_frac = [0.00001, 0.00001, 0.00001]
-        self.design_water = [False, False, True]  # set CRZ water_design to True
+        self.od_pts = [pt["name"] for pt in od_points]
+        self.cooling = [pt["cooling"] for pt in od_points]
+        self.od_MNs = [pt["MN"] for pt in od_points]
+        self.od_alts = [pt["alt"] for pt in od_points]
+        self.od_dTs = [pt["dTs"] for pt in od_points]
+        self.od_BPRs = [pt["BPR"] for pt in od_points]
+        self.od_recoveries = [pt["ram_recovery"] for pt in od_points]
+        self.war = [pt["WAR"] for pt in od_points]
+        self.w_frac = [pt["w_frac"] for pt in od_points]
+        self.design_water = [pt["design_water"] for pt in od_points]
+
+        if self.options["parallel"]:
+            # the points are promoted so they keep their names, e.g. "CRZ.perf.TSFC"
+            self.add_subsystem("od", om.ParallelGroup(), promotes=["*"])
+            self._par_od_pnts = []
+            self._par_des_od_connections = []
 
         for i, pt in enumerate(self.od_pts):
             self.pyc_add_pnt(
@@ -600,6 +769,7 @@ class MPN3(pyc.MPCycle):
                     design=False,
                     use_h2=use_h2,
                     wet_air=wet_air,
+                    tabular=tabular,
                     cooling=self.cooling[i],
                     design_water=self.design_water[i],
                 ),
@@ -613,8 +783,12 @@ class MPN3(pyc.MPCycle):
             self.set_input_defaults(pt + ".fc.WAR", val=self.war[i])
             self.set_input_defaults(pt + ".extract.sub_flow.w_frac", self.w_frac[i]),
 
-        # Extra set input for Rolling Takeoff
-        self.set_input_defaults("RTO.balance.rhs:FAR", 22800.0, units="lbf"),
+            if "Fn" in od_points[i]:
+                self.set_input_defaults(pt + ".balance.rhs:FAR", od_points[i]["Fn"], units="lbf")
+            if "inject_MN" in od_points[i]:
+                self.set_input_defaults(pt + ".inject.MN", od_points[i]["inject_MN"])
+            if "extract_MN" in od_points[i]:
+                self.set_input_defaults(pt + ".extract.MN", od_points[i]["extract_MN"])
 
         self.pyc_connect_des_od("fan.s_PR", "fan.s_PR")
         self.pyc_connect_des_od("fan.s_Wc", "fan.s_Wc")
@@ -662,25 +836,20 @@ class MPN3(pyc.MPCycle):
             # self.pyc_connect_des_od("inject.Fl_O:stat:area", "inject.area")
 
             v_list = ["V", "Vsonic", "Cp", "Cv", "MN", "P", "S", "T", "gamma", "h", "rho"]
-            des_pnts = ["TOC", "RTO", "SLS", "CRZ"]
-
-            # --- Injector connections ---
-            # self.connect("TOC.inject.Fl_O:stat:area", "CRZ.inject.area")
-            self.connect("CRZ.inject.Fl_O:stat:area", "TOC.inject.area")
-            self.connect("TOC.inject.Fl_O:stat:area", "RTO.inject.area")
-            self.connect("TOC.inject.Fl_O:stat:area", "SLS.inject.area")
+            des_pnts = ["TOC"] + self.od_pts
 
-            # --- Extractor connections ---
-            # self.connect("TOC.extract.Fl_O:stat:area", "CRZ.extract.area")
-            self.connect("CRZ.extract.Fl_O:stat:area", "TOC.extract.area")
-            self.connect("TOC.extract.Fl_O:stat:area", "RTO.extract.area")
-            self.connect("TOC.extract.Fl_O:stat:area", "SLS.extract.area")
+            # --- Injector and extractor connections ---
+            # the design water point sizes the TOC areas, which all other off-design points use
+            self.connect(water_pt + ".inject.Fl_O:stat:area", "TOC.inject.area")
+            self.connect(water_pt + ".extract.Fl_O:stat:area", "TOC.extract.area")
+            for p in self.od_pts:
+                if p != water_pt:
+                    self.connect("TOC.inject.Fl_O:stat:area", p + ".inject.area")
+                    self.connect("TOC.extract.Fl_O:stat:area", p + ".extract.area")
 
             for p in des_pnts:
-                self.connect("CRZ.inject.Fl_O:stat:area", p + ".hpc.Fl_I:stat:area")
-                self.connect("CRZ.extract.Fl_O:stat:area", p + ".core_nozz.Fl_I:stat:area")
-                # self.connect("TOC.inject.Fl_O:stat:area", p + ".hpc.Fl_I:stat:area")
-                # self.connect("TOC.extract.Fl_O:stat:area", p + ".core_nozz.Fl_I:stat:area")
+                self.connect(water_pt + ".inject.Fl_O:stat:area", p + ".hpc.Fl_I:stat:area")
+                self.connect(water_pt + ".extract.Fl_O:stat:area", p + ".core_nozz.Fl_I:stat:area")
                 for v in v_list:
                     self.connect(p + ".inject.Fl_O:stat:" + v, p + ".hpc.Fl_I:stat:" + v)
                     self.connect(p + ".extract.Fl_O:stat:" + v, p + ".core_nozz.Fl_I:stat:" + v)
@@ -691,14 +860,10 @@ class MPN3(pyc.MPCycle):
         self.pyc_connect_des_od("duct5.s_dPqP", "duct5.s_dPqP")
         self.pyc_connect_des_od("duct17.s_dPqP", "duct17.s_dPqP")
 
-        self.connect("RTO.balance.hpt_chrg_cool_frac", "TOC.bld3.bld_exit:frac_W")
-        self.connect("RTO.balance.hpt_nochrg_cool_frac", "TOC.bld3.bld_inlet:frac_W")
-
-        self.connect("RTO.balance.hpt_chrg_cool_frac", "SLS.bld3.bld_exit:frac_W")
-        self.connect("RTO.balance.hpt_nochrg_cool_frac", "SLS.bld3.bld_inlet:frac_W")
-
-        self.connect("RTO.balance.hpt_chrg_cool_frac", "CRZ.bld3.bld_exit:frac_W")
-        self.connect("RTO.balance.hpt_nochrg_cool_frac", "CRZ.bld3.bld_inlet:frac_W")
+        for p in ["TOC"] + self.od_pts:
+            if p != cool_pt:
+                self.connect(cool_pt + ".balance.hpt_chrg_cool_frac", p + ".bld3.bld_exit:frac_W")
+                self.connect(cool_pt + ".balance.hpt_nochrg_cool_frac", p + ".bld3.bld_inlet:frac_W")
 
         self.add_subsystem(
             "T4_ratio",
@@ -712,12 +877,13 @@ class MPN3(pyc.MPCycle):
         )
         self.connect("T4_ratio.TOC_T4", "TOC.balance.rhs:FAR")
 
-        self.connect("TOC.extract.W_water", "TOC.inject.mix:W")
-        self.connect("RTO.extract.W_water", "RTO.inject.mix:W")
-        self.connect("SLS.extract.W_water", "SLS.inject.mix:W")
-        self.connect("CRZ.extract.W_water", "CRZ.inject.mix:W")
+        for p in ["TOC"] + self.od_pts:
+            self.connect(p + ".extract.W_water", p + ".inject.mix:W")
 
-        initial_order = ["T4_ratio", "TOC", "RTO", "SLS", "CRZ"]
+        if self.options["parallel"]:
+            initial_order = ["T4_ratio", "TOC", "od"]
+        else:
+            initial_order = ["T4_ratio", "TOC"] + self.od_pts
         self.set_order(self.options["order_start"] + initial_order + self.options["order_add"])
 
         newton = self.nonlinear_solver = om.NewtonSolver()
@@ -733,16 +899,121 @@ class MPN3(pyc.MPCycle):
         newton.linesearch.options["bound_enforcement"] = "scalar"
         newton.linesearch.options["iprint"] = -1
 
-        self.linear_solver = om.DirectSolver(assemble_jac=True)
+        if self.options["linear_solver"] == "direct":
+            self.linear_solver = om.DirectSolver(assemble_jac=True)
+        else:
+            # The points only couple through the design to off-design connections (map scalars, areas, cooling and
+            # water flows), so each point is solved with its own factorization and the coupling is iterated on.
+            # Block Gauss-Seidel alone needs every top level implicit component (e.g. the `bal` of the optimization
+            # models) to be inside a group with its own solver; GMRES handles them through the Krylov iterations.
+            if self.options["linear_solver"] == "block_gs":
+                self.linear_solver = om.LinearBlockGS(maxiter=20, atol=1e-10, rtol=1e-8, use_aitken=True, iprint=-1)
+            else:
+                self.linear_solver = om.ScipyKrylov(maxiter=50, atol=1e-10, rtol=1e-8, iprint=-1)
+                self.linear_solver.precon = SweepPrecon()
 
         super().setup()
 
+    def pyc_add_pnt(self, name, pnt, **kwargs):
+        if not self.options["parallel"] or pnt.options["design"]:
+            return super().pyc_add_pnt(name, pnt, **kwargs)
+
+        # off-design points of a parallel model go in the ParallelGroup; MPCycle only handles direct children, so
+        # their cycle parameters and design connections are set up in configure below
+        self._get_subsystem("od").add_subsystem(name, pnt, **kwargs)
+        self._par_od_pnts.append(pnt)
+        return pnt
+
+    def pyc_connect_des_od(self, src, target):
+        if self.options["parallel"]:
+            self._par_des_od_connections.append((src, target))
+        else:
+            super().pyc_connect_des_od(src, target)
+
+    def configure(self):
+        super().configure()
+
+        if self.options["parallel"]:
+            od = self._get_subsystem("od")
+            for param in self._cycle_params:
+                for pnt in self._par_od_pnts:
+                    od.promotes(pnt.name, inputs=[param])
+
+            for src, target in self._par_des_od_connections:
+                for pnt in self._par_od_pnts:
+                    self.connect(f"{self._des_pnt.name}.{src}", f"{pnt.name}.{target}")
 
-def N3ref_model(use_h2=False, wet_air=True):
 
-    prob = om.Problem()
+# Point the EINOx correlations of add_einox are referenced to
+EINOX_REF = "SLS"
 
-    prob.model = MPN3(use_h2=use_h2, wet_air=wet_air)
+
+def einox_points(od_points=OD_POINTS):
+    """
+    Points of an MPN3 with the off-design points `od_points` that add_einox correlates: the design point and every
+    off-design point but the EINOX_REF reference.
+    """
+    return ["TOC"] + [pt["name"] for pt in od_points if pt["name"] != EINOX_REF]
+
+
+def add_einox(model, alt_war, sls_war):
+    """
+    Add the EINOx correlations of the points of an MPN3 model (TOC, RTO and CRZ by default, as in N3_CLVR.py) before
+    setup, e.g. so their sensitivities come out of the same adjoint solve as the cycle outputs. The off-design points
+    are taken from the od_points option of the model, each at the humidity of its WAR; TOC is at `alt_war` and the
+    SLS reference at `sls_war`.
+    """
+    od_points = model.options["od_points"]
+    if EINOX_REF not in [pt["name"] for pt in od_points]:
+        raise ValueError(f"add_einox needs the {EINOX_REF} off-design point the EINOx correlations are referenced to.")
+
+    pts = einox_points(od_points)
+    war = {"TOC": alt_war}
+    war.update({pt["name"]: pt["WAR"] for pt in od_points})
+    model.options["order_add"] = model.options["order_add"] + ["humidity"] + [f"{pt}_EINOx" for pt in pts]
+
+    indvars = model.add_subsystem("humidity", om.IndepVarComp(), promotes_outputs=["*"])
+    indvars.add_output("H_" + EINOX_REF, sls_war)
+    for pt in pts:
+        indvars.add_output("H_" + pt, war[pt])
+
+    for pt in pts:
+        model.add_subsystem(f"{pt}_EINOx", EINOx())
+        model.connect(f"{pt}.bld3.Fl_O:tot:P", f"{pt}_EINOx.P3_OD")
+        model.connect(f"{pt}.balance.FAR", f"{pt}_EINOx.FAR_OD")
+        model.connect("H_" + pt, f"{pt}_EINOx.h_OD")
+
+    comps = tuple(f"{pt}_EINOx" for pt in pts)
+    model.connect(f"{EINOX_REF}.bld3.Fl_O:tot:P", tuple(f"{comp}.P3_SLS" for comp in comps))
+    model.connect(f"{EINOX_REF}.bld3.Fl_O:tot:T", tuple(f"{comp}.T3_SLS" for comp in comps))
+    model.connect(f"{EINOX_REF}.balance.FAR", tuple(f"{comp}.FAR_SLS" for comp in comps))
+    model.connect("H_" + EINOX_REF, tuple(f"{comp}.h_SLS" for comp in comps))
+
+
+def einox_model(model_factory, alt_war, sls_war, comm=None):
+    """
+    Problem of `model_factory(comm=comm)` with add_einox applied to its model, e.g. for an EINOx constrained
+    optimization.
+    """
+    prob = model_factory(comm=comm)
+    add_einox(prob.model, alt_war, sls_war)
+    return prob
+
+
+def N3ref_model(
+    use_h2=False, wet_air=True, tabular=False, linear_solver="direct", od_points=OD_POINTS, parallel=False, comm=None
+):
+
+    prob = om.Problem(comm=comm)
+
+    prob.model = MPN3(
+        use_h2=use_h2,
+        wet_air=wet_air,
+        tabular=tabular,
+        linear_solver=linear_solver,
+        od_points=od_points,
+        parallel=parallel,
+    )
 
     # setup the optimization
     prob.driver = om.ScipyOptimizeDriver()
@@ -799,78 +1070,16 @@ if __name__ == "__main__":
     prob.set_val("TOC.inject.area", 117.730, units="inch**2")
     prob.set_val("TOC.extract.area", 1053.492, units="inch**2")
 
-    # Set initial guesses for balances
-    if prob.model.options["use_h2"]:
-        prob["TOC.balance.FAR"] = 0.0102
-        prob["TOC.balance.lpt_PR"] = 9.8
-        prob["TOC.balance.hpt_PR"] = 4.2
-        prob["TOC.fc.balance.Pt"] = 5.2
-        prob["TOC.fc.balance.Tt"] = 444.3
-        prob["TOC.inject.mix:W"] = 0.0
-
-        # FAR_guess = [0.0106, 0.0095, 0.0094]
-        # W_guess = [1906.3, 1728.4, 797.5]
-        # BPR_guess = [26.1, 28.0, 24.8]
-        # fan_Nmech_guess = [2119.9, 1945.5, 2095.7]
-        # lp_Nmech_guess = [6572.0, 6031.3, 6496.8]
-        # hp_Nmech_guess = [22150.0, 21462.8, 20431.0]
-        # hpt_PR_guess = [4.2, 4.3, 4.2]
-        # lpt_PR_guess = [8.0, 7.0, 9.9]
-        # fan_Rline_guess = [1.7500, 1.7500, 1.9397]
-        # lpc_Rline_guess = [1.9, 1.7, 2.0]
-        # hpc_Rline_guess = [2.0, 2.0, 1.9]
-        # trq_guess = [52047.8, 41530.5, 21780.5]
-
-        FAR_guess = [0.0106, 0.02541, 0.0094]
-        W_guess = [1906.3, 1900.4, 797.5]
-        BPR_guess = [26.1, 22.3467, 24.8]
-        fan_Nmech_guess = [2119.9, 1953.1, 2095.7]
-        lp_Nmech_guess = [6572.0, 6054.5, 6496.8]
-        hp_Nmech_guess = [22150.0, 21594.0, 20431.0]
-        hpt_PR_guess = [4.2, 4.245, 4.2]
-        lpt_PR_guess = [8.0, 7.001, 9.9]
-        fan_Rline_guess = [1.7500, 1.7500, 1.9397]
-        lpc_Rline_guess = [1.9, 1.8632, 2.0]
-        hpc_Rline_guess = [2.0, 2.0281, 1.9]
-        trq_guess = [52047.8, 41779.4, 21780.5]
+    # Set initial guesses for balances from the closest converged solution
+    fuel = "H2" if prob.model.options["use_h2"] else "JetA"
+    warm_db = WarmStartDB()
+    warm_db.warm_start(prob, fuel)
 
-    else:
-        prob["TOC.balance.FAR"] = 0.02650
-        prob["TOC.balance.lpt_PR"] = 10.937
-        prob["TOC.balance.hpt_PR"] = 4.185
-        prob["TOC.fc.balance.Pt"] = 5.272
-        prob["TOC.fc.balance.Tt"] = 444.41
-        prob["TOC.inject.mix:W"] = 0.000
-
-        FAR_guess = [0.02832, 0.02541, 0.02510]
-        W_guess = [1916.13, 1900.0, 802.79]
-        BPR_guess = [25.5620, 22.3467, 24.3233]
-        fan_Nmech_guess = [2132.6, 1953.1, 2118.7]
-        lp_Nmech_guess = [6611.2, 6054.5, 6567.9]
-        hp_Nmech_guess = [22288.2, 21594.0, 20574.1]
-        hpt_PR_guess = [4.210, 4.245, 4.197]
-        lpt_PR_guess = [8.161, 7.001, 10.803]
-        fan_Rline_guess = [1.7500, 1.7500, 1.9397]
-        lpc_Rline_guess = [2.0052, 1.8632, 2.1075]
-        hpc_Rline_guess = [2.0589, 2.0281, 1.9746]
-        trq_guess = [52509.1, 41779.4, 22369.7]
-
-    for i, pt in enumerate(prob.model.od_pts):
-
-        # initial guesses
-        prob[pt + ".balance.FAR"] = FAR_guess[i]
-        prob[pt + ".balance.W"] = W_guess[i]
-        prob[pt + ".balance.BPR"] = BPR_guess[i]
-        prob[pt + ".balance.fan_Nmech"] = fan_Nmech_guess[i]
-        prob[pt + ".balance.lp_Nmech"] = lp_Nmech_guess[i]
-        prob[pt + ".balance.hp_Nmech"] = hp_Nmech_guess[i]
-        prob[pt + ".hpt.PR"] = hpt_PR_guess[i]
-        prob[pt + ".lpt.PR"] = lpt_PR_guess[i]
-        prob[pt + ".fan.map.RlineMap"] = fan_Rline_guess[i]
-        prob[pt + ".lpc.map.RlineMap"] = lpc_Rline_guess[i]
-        prob[pt + ".hpc.map.RlineMap"] = hpc_Rline_guess[i]
-        prob[pt + ".gearbox.trq_base"] = trq_guess[i]
-        prob[pt + ".inject.mix:W"] = 0.000
+    # Record per point/element timing and solver iterations of the runs below
+    profile_run = False
+    if profile_run:
+        profiler = CycleProfiler(prob.model)
+        profiler.start()
 
     st = time.time()
 
@@ -990,24 +1199,24 @@ if __name__ == "__main__":
         # prob.model.nonlinear_solver.options["err_on_non_converge"] = False
 
         # prob.run_model()
-        RTO_vals = np.linspace(3400, 3200, 10)
-        wfrac = np.linspace(0.05, 0.1, 10)
-
-        for i in range(10):
-            print(f"\n\nSolving RTO_T4: {RTO_vals[i]} wfrac: {wfrac[i]}\n\n")
-            prob.set_val("RTO_T4", RTO_vals[i])
-            prob.set_val("T4_ratio.TR", 0.91007225)
-            prob.set_val("TOC.balance.rhs:hpc_PR", 61.92218429)
-            prob.set_val("fan:PRdes", 1.28596094)
-            prob.set_val("lpc:PRdes", 4.0)
-            prob.set_val("CRZ.extract.sub_flow.w_frac", wfrac[i])
-            prob.run_model()
-
-        CRZ_wfrac = np.linspace(0.11, 0.3, 20)
-        for wfrac in CRZ_wfrac:
-            print(f"\n\nSolving CRZ.wfrac: {wfrac}\n\n")
-            prob.set_val("CRZ.extract.sub_flow.w_frac", wfrac)
-            prob.run_model()
+        def store(prob):
+            warm_db.add(prob, fuel)
+
+        # Walk the converged solution to the lower RTO T4 and higher CRZ water extraction
+        targets = {
+            "RTO_T4": 3200.0,
+            "T4_ratio.TR": 0.91007225,
+            "TOC.balance.rhs:hpc_PR": 61.92218429,
+            "fan:PRdes": 1.28596094,
+            "lpc:PRdes": 4.0,
+            "CRZ.extract.sub_flow.w_frac": 0.1,
+        }
+        n_runs = continuation(prob, targets, callback=store)
+
+        wfrac = 0.3
+        n_runs += continuation(prob, {"CRZ.extract.sub_flow.w_frac": wfrac}, start_converged=True, callback=store)
+        print(f"Continuation finished in {n_runs} model runs")
+        warm_db.save()
         # prob.model.list_outputs(residuals=True, explicit=True, includes="RTO*", residuals_tol=1e-2, prom_name=True)
         # prob.check_partials(compact_print=True, show_only_incorrect=True, method="fd")
 
@@ -1108,3 +1317,8 @@ if __name__ == "__main__":
                 print("Water loop mass flow check (mdot_in - mdot_out): ", extract_water - inject_water)
 
     print("time", time.time() - st)
+
+    if profile_run:
+        profiler.stop()
+        profiler.print_summary()
+        profiler.save("../OUTPUT/N3_output/profile_N3_CLVR_V3.json")
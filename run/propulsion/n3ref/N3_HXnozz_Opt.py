@@ -14,6 +14,7 @@ import os
 # ==============================================================================
 # External Python modules
 # ==============================================================================
+import numpy as np
 import openmdao.api as om
 
 # ==============================================================================
@@ -21,11 +22,12 @@ import openmdao.api as om
 # ==============================================================================
 from N3_HXnozz_withHX import viewer, MPN3, map_plots
 import constants.constants as con
+from components.hx_screen import HX_FLOW, HX_GEOMETRY, cycle_flow, hx_grid, screen_hx
 
 # from components.misc_components import area_con
 
 
-def opt_prob(dPqP, output_dir, elec_load=20, BPR=300, mdot_hot=1, save_res=True):
+def opt_prob(dPqP, output_dir, elec_load=20, BPR=300, mdot_hot=1, save_res=True, prescreen=False):
     prob = om.Problem()
     prob.model = MPN3()
 
@@ -135,6 +137,33 @@ def opt_prob(dPqP, output_dir, elec_load=20, BPR=300, mdot_hot=1, save_res=True)
     prob["TOC.fc.balance.Pt"] = 5.272
     prob["TOC.fc.balance.Tt"] = 444.41
 
+    # --- HX geometry from a pre-screen of the design space, at the cold side conditions of the solved cycle ---
+    if prescreen is True:
+        prob.set_solver_print(level=-1)
+        prob.run_model()
+        cold, P_cold = cycle_flow(prob, hx="TOC.hx", P="TOC.air.P")
+
+        geometry = hx_grid(
+            channel_width_cold=np.linspace(0.5, 12.0, 24),
+            channel_height_cold=np.linspace(2.0, 20.0, 19),
+            fin_length_cold=np.linspace(1.0, 12.0, 12),
+        )
+        fixed = {column[0]: column[1] for column in hx_params if column[0] in HX_GEOMETRY}
+        flow = {column[0]: column[1] for column in hx_params if column[0] in HX_FLOW}
+        res, feasible, best = screen_hx(
+            heat_load=elec_load * 1e3,
+            dPqP_max=dPqP,
+            P_cold=P_cold,
+            geometry={**fixed, **geometry},
+            flow={**flow, **cold, "mdot_hot": mdot_hot},
+            n_best=1,
+        )
+        if best.size:
+            for name in geometry:
+                prob.set_val(f"TOC.hx.{name}", res[name][best[0]], units="m")
+        else:
+            print("No feasible HX geometry in the pre-screen, starting from the given geometry")
+
     st = time.time()
 
     prob.set_solver_print(level=-1)
@@ -26,9 +26,9 @@ import pycycle.api as pyc
 from N3_NOx import N3, viewer, MPN3, map_plots
 
 
-def N3_MDP_Opt_model(output_dir, save_res=False):
+def N3_MDP_Opt_model(output_dir, save_res=False, comm=None):
 
-    prob = om.Problem()
+    prob = om.Problem(comm=comm)
     prob.model = MPN3(order_add=["bal"])
 
     prob.model.pyc_add_cycle_param("ext_ratio.core_Cv", 0.9999)
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Statements timed in a fresh interpreter, from the cheapest to a full model import
+IMPORT_CASES = [
+    ("maps", "import N3_Fan_map, N3_LPC_map, N3_HPC_map, N3_HPT_map, N3_LPT_map"),
+    ("maps + tables", "import N3_Fan_map; N3_Fan_map.FanMap.WcMap"),
+    ("small_core_eff_balance", "import small_core_eff_balance"),
+    ("openmdao", "import openmdao.api"),
+    ("pycycle", "import pycycle.api"),
+    ("N3_CLVR_V3", "import N3_CLVR_V3"),
+]
+
+
+def import_time(stmt, n_runs=5):
+    """
+    Best wall time (s) of running `stmt` in a new interpreter started in this directory, less the interpreter start
+    up time.
+    """
+
+    def run(code):
+        best = float("inf")
+        for _ in range(n_runs):
+            st = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True)
+            best = min(best, time.perf_counter() - st)
+        return best
+
+    return run(stmt) - run("pass")
+
+
+class ImportTimeTestCase(unittest.TestCase):
+    def benchmark_import_maps(self):
+        t = import_time(IMPORT_CASES[0][1])
+        print(f"maps: {t:.3f} s")
+
+    def benchmark_import_N3_CLVR_V3(self):
+        t = import_time(IMPORT_CASES[-1][1])
+        print(f"N3_CLVR_V3: {t:.3f} s")
+
+
+if __name__ == "__main__":
+    for name, stmt in IMPORT_CASES:
+        print(f"{name:<25s} {import_time(stmt):8.3f} s")
@@ -54,13 +54,20 @@ class NOxT4(om.ExplicitComponent):
     temperature and pressure and exhaust temperature.
     """
 
+    def initialize(self):
+        self.options.declare("num_nodes", default=1, desc="Number of analysis points")
+
     def setup(self):
-        self.add_input("P3", val=14.7, units="lbf/inch**2")
-        self.add_input("T3", val=518.67, units="degR")
-        self.add_input("T4", val=518.67, units="degR")
+        nn = self.options["num_nodes"]
+
+        self.add_input("P3", val=14.7, shape=(nn,), units="lbf/inch**2")
+        self.add_input("T3", val=518.67, shape=(nn,), units="degR")
+        self.add_input("T4", val=518.67, shape=(nn,), units="degR")
+
+        self.add_output("EINOx", val=1.0, shape=(nn,), desc="NOx emissions index")
 
-        self.add_output("EINOx", val=1.0, desc="NOx emissions index")
-        self.declare_partials("EINOx", ["P3", "T3", "T4"])
+        ar = np.arange(nn)
+        self.declare_partials("EINOx", ["P3", "T3", "T4"], rows=ar, cols=ar)
 
     def compute(self, inputs, outputs):
         P3 = inputs["P3"]
@@ -85,13 +92,20 @@ class NOxHum(om.ExplicitComponent):
     temperature and pressure and exhaust temperature.
     """
 
+    def initialize(self):
+        self.options.declare("num_nodes", default=1, desc="Number of analysis points")
+
     def setup(self):
-        self.add_input("P3", val=14.7, units="lbf/inch**2")
-        self.add_input("T3", val=518.67, units="degR")
+        nn = self.options["num_nodes"]
+
+        self.add_input("P3", val=14.7, shape=(nn,), units="lbf/inch**2")
+        self.add_input("T3", val=518.67, shape=(nn,), units="degR")
         # self.add_input("omega", val=0.0063, units="degR")
 
-        self.add_output("EINOx", val=1.0, desc="NOx emissions index")
-        self.declare_partials("EINOx", ["P3", "T3"], method="cs")
+        self.add_output("EINOx", val=1.0, shape=(nn,), desc="NOx emissions index")
+
+        ar = np.arange(nn)
+        self.declare_partials("EINOx", ["P3", "T3"], rows=ar, cols=ar)
 
     def compute(self, inputs, outputs):
         P3 = inputs["P3"]
@@ -100,13 +114,13 @@ class NOxHum(om.ExplicitComponent):
 
         outputs["EINOx"] = 0.068 * P3 ** 0.5 * np.exp((T3 - 459.67) / 345.0) * np.exp(H * 0.0027114)
 
-    # def compute_partials(self, inputs, J):
-    #     P3 = inputs["P3"]
-    #     T3 = inputs["T3"]
+    def compute_partials(self, inputs, J):
+        P3 = inputs["P3"]
+        T3 = inputs["T3"]
+        H = 0.0063
 
-    #     J["EINOx", "P3"] = 0.0042 * 0.37 * (P3 / 439.0) ** (-0.63) * (1 / 439.0) * np.exp((T3 - 1471.0) / 345.0) * T4
-    #     J["EINOx", "T3"] = 0.0042 * (P3 / 439.0) ** 0.37 * np.exp((T3 - 1471.0) / 345.0) * T4 / 345.0
-    #     J["EINOx", "T4"] = 0.0042 * (P3 / 439.0) ** 0.37 * np.exp((T3 - 1471.0) / 345.0)
+        J["EINOx", "P3"] = 0.068 * 0.5 * P3 ** (-0.5) * np.exp((T3 - 459.67) / 345.0) * np.exp(H * 0.0027114)
+        J["EINOx", "T3"] = 0.068 * P3 ** 0.5 * np.exp((T3 - 459.67) / 345.0) * np.exp(H * 0.0027114) / 345.0
 
 
 class SLSCorrelation(om.ExplicitComponent):
@@ -115,12 +129,18 @@ class SLSCorrelation(om.ExplicitComponent):
     correlation from the ICAO EDB emissions testing.
     """
 
+    def initialize(self):
+        self.options.declare("num_nodes", default=1, desc="Number of analysis points")
+
     def setup(self):
-        self.add_input("T3_SLS", val=1600.0, desc="Burner inlet temperature at SLS", units="degK")
-        self.add_input("P3_SLS", val=100.0, desc="Burner inlet pressure at SLS", units="lbf/inch**2")
-        self.add_output("EINOx_SLS", val=10.0, desc="NOx emissions index at SLS")
+        nn = self.options["num_nodes"]
+
+        self.add_input("T3_SLS", val=1600.0, shape=(nn,), desc="Burner inlet temperature at SLS", units="degK")
+        self.add_input("P3_SLS", val=100.0, shape=(nn,), desc="Burner inlet pressure at SLS", units="lbf/inch**2")
+        self.add_output("EINOx_SLS", val=10.0, shape=(nn,), desc="NOx emissions index at SLS")
 
-        self.declare_partials("EINOx_SLS", ["T3_SLS", "P3_SLS"], method="cs")
+        ar = np.arange(nn)
+        self.declare_partials("EINOx_SLS", ["T3_SLS", "P3_SLS"], rows=ar, cols=ar)
 
     def compute(self, inputs, outputs):
         T3 = inputs["T3_SLS"]
@@ -130,23 +150,40 @@ class SLSCorrelation(om.ExplicitComponent):
             (6.26e-8 * T3 ** 3) - (0.000117 * T3 ** 2) + (0.074 * T3) - 15.04
         )  # MIT NOx correlation for CFM56-5B3 engine
 
+    def compute_partials(self, inputs, J):
+        T3 = inputs["T3_SLS"]
+        P3 = inputs["P3_SLS"]
+
+        J["EINOx_SLS", "T3_SLS"] = P3 ** 0.4 * ((3 * 6.26e-8 * T3 ** 2) - (2 * 0.000117 * T3) + 0.074)
+        J["EINOx_SLS", "P3_SLS"] = (
+            0.4 * P3 ** (-0.6) * ((6.26e-8 * T3 ** 3) - (0.000117 * T3 ** 2) + (0.074 * T3) - 15.04)
+        )
+
 
 class P3T3(om.ExplicitComponent):
     """
     Calculate the NOx emissions index using the P3T3 correlation method.
     """
 
+    def initialize(self):
+        self.options.declare("num_nodes", default=1, desc="Number of analysis points")
+
     def setup(self):
-        self.add_input("P3_OD", val=1.0, desc="Burner inlet pressure off-design", units="lbf/inch**2")
-        self.add_input("P3_SLS", val=1.0, desc="Burner inlet pressure SLS", units="lbf/inch**2")
-        self.add_input("FAR_OD", val=0.3, desc="Fuel-to-air-ratio at off-design")
-        self.add_input("FAR_SLS", val=0.3, desc="Fuel-to-air-ratio at SLS")
-        self.add_input("H", val=7.0, desc="Humidity factor exponent")
-        self.add_input("EINOx_SLS", val=10.0, desc="NOx emissions index at SLS")
+        nn = self.options["num_nodes"]
 
-        self.add_output("EINOx_OD", val=15.0, desc="NOx emissions index at off-design")
+        self.add_input("P3_OD", val=1.0, shape=(nn,), desc="Burner inlet pressure off-design", units="lbf/inch**2")
+        self.add_input("P3_SLS", val=1.0, shape=(nn,), desc="Burner inlet pressure SLS", units="lbf/inch**2")
+        self.add_input("FAR_OD", val=0.3, shape=(nn,), desc="Fuel-to-air-ratio at off-design")
+        self.add_input("FAR_SLS", val=0.3, shape=(nn,), desc="Fuel-to-air-ratio at SLS")
+        self.add_input("H", val=7.0, shape=(nn,), desc="Humidity factor exponent")
+        self.add_input("EINOx_SLS", val=10.0, shape=(nn,), desc="NOx emissions index at SLS")
 
-        self.declare_partials("EINOx_OD", ["P3_OD", "P3_SLS", "FAR_OD", "FAR_SLS", "H", "EINOx_SLS"])
+        self.add_output("EINOx_OD", val=15.0, shape=(nn,), desc="NOx emissions index at off-design")
+
+        ar = np.arange(nn)
+        self.declare_partials(
+            "EINOx_OD", ["P3_OD", "P3_SLS", "FAR_OD", "FAR_SLS", "H", "EINOx_SLS"], rows=ar, cols=ar
+        )
 
         self.m = 0.0
         self.n = 0.4
@@ -208,17 +245,33 @@ class EINOx(om.Group):
     states and humidity conditions (g water/g dry air) at SLS and specified off-design point.
     """
 
+    def initialize(self):
+        self.options.declare("num_nodes", default=1, desc="Number of analysis points")
+
     def setup(self):
-        self.add_subsystem("SLS_NOx_calc", SLSCorrelation(), promotes_inputs=["T3_SLS"], promotes_outputs=["EINOx_SLS"])
+        nn = self.options["num_nodes"]
+
+        self.add_subsystem(
+            "SLS_NOx_calc",
+            SLSCorrelation(num_nodes=nn),
+            promotes_inputs=["T3_SLS"],
+            promotes_outputs=["EINOx_SLS"],
+        )
         self.add_subsystem(
             "humidity_calc",
-            om.ExecComp("H=19.0 * (h_SLS - h_OD)", H={"val": 7.0}, h_SLS={"val": 0.6}, h_OD={"val": 0.4}),
+            om.ExecComp(
+                "H=19.0 * (h_SLS - h_OD)",
+                H={"val": 7.0 * np.ones(nn)},
+                h_SLS={"val": 0.6 * np.ones(nn)},
+                h_OD={"val": 0.4 * np.ones(nn)},
+                has_diag_partials=True,
+            ),
             promotes_inputs=["h_SLS", "h_OD"],
             promotes_outputs=["H"],
         )
         self.add_subsystem(
             "P3T3_calc",
-            P3T3(),
+            P3T3(num_nodes=nn),
             promotes_inputs=["P3_OD", "P3_SLS", "FAR_OD", "FAR_SLS", "H", "EINOx_SLS"],
             promotes_outputs=["EINOx_OD"],
         )
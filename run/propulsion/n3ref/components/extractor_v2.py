@@ -9,7 +9,7 @@ from pycycle.thermo.thermo import Thermo
 from pycycle.flow_in import FlowIn
 from pycycle.passthrough import PassThrough
 from pycycle.element_base import Element
-from pycycle.constants import CEA_AIR_COMPOSITION
+from pycycle.constants import CEA_AIR_COMPOSITION, TAB_AIR_FUEL_COMPOSITION
 from pycycle.thermo.cea.species_data import Properties, janaf, wet_air
 from pycycle.elements.duct import PressureLoss
 
@@ -35,11 +35,23 @@ class ThermoSub(om.ExplicitComponent):
         self.inflow_composition = inflow_thermo.elements
         self.inflow_wt_mole = inflow_thermo.element_wt
         self.num_inflow_composition = len(self.inflow_composition)
+        num_prod = len(self.products)
+
+        # indices of the water product and of the elements it is made of
+        self.idx_h2o = self.products.index("H2O")
+        self.idx_H = self.inflow_composition.index("H")
+        self.idx_O = self.inflow_composition.index("O")
+
+        # elemental moles removed per mole of water
+        self.sub_moles = np.zeros(self.num_inflow_composition)
+        self.sub_moles[self.idx_H] = 2.0
+        self.sub_moles[self.idx_O] = 1.0
+        self.wt_h2o = np.sum(self.sub_moles * self.inflow_wt_mole)
 
         # inputs
         self.add_input("Fl_I:stat:W", val=0.0, desc="weight flow", units="lbm/s")
         self.add_input("Fl_I:tot:composition", val=inflow_thermo.b0, desc="incoming flow composition")
-        self.add_input("n", val=np.ones(17), shape=17, desc="molar concetration of incoming flow")
+        self.add_input("n", val=np.ones(num_prod), shape=num_prod, desc="molar concetration of incoming flow")
         self.add_input("w_frac", val=0.01, desc="fraction of water from incoming flow to extract")
 
         # outputs
@@ -48,26 +60,35 @@ class ThermoSub(om.ExplicitComponent):
         self.add_output("composition_water", val=inflow_thermo.b0)
         self.add_output("composition_out", val=inflow_thermo.b0)
 
-        self.declare_partials("*", "*", method="cs")
-        # NOTE: Due to some complexity from python vectorization,
-        # computing partials manually is tricky and will not be much faster than pure CS
+        # Only the H2O entry of n and the H and O elements of the water composition are non-zero
+        nc = self.num_inflow_composition
+        ar = np.arange(nc)
+        sub_rows = np.array([self.idx_H, self.idx_O])
+
+        self.declare_partials("Wout", ["Fl_I:stat:W", "Fl_I:tot:composition", "w_frac"])
+        self.declare_partials("Wout", "n", rows=[0], cols=[self.idx_h2o])
+        self.declare_partials("W_water", ["Fl_I:stat:W", "Fl_I:tot:composition", "w_frac"])
+        self.declare_partials("W_water", "n", rows=[0], cols=[self.idx_h2o])
+        self.declare_partials("composition_out", ["Fl_I:tot:composition", "w_frac"])
+        self.declare_partials("composition_out", "n", rows=ar, cols=np.full(nc, self.idx_h2o))
+        self.declare_partials(
+            "composition_water", "Fl_I:tot:composition", rows=np.repeat(sub_rows, nc), cols=np.tile(ar, 2)
+        )
+        self.declare_partials("composition_water", ["Fl_I:stat:W", "w_frac"], rows=sub_rows, cols=[0, 0])
+        self.declare_partials("composition_water", "n", rows=sub_rows, cols=[self.idx_h2o] * 2)
 
     def compute(self, inputs, outputs):
 
         W = inputs["Fl_I:stat:W"]  # incoming flow rate
         n = inputs["n"]  # moles of products of imcoming flow
-        idx = self.products.index("H2O")
-        n_h2o = n[idx]
+        n_h2o = n[self.idx_h2o]
         w_frac = inputs["w_frac"]
         Fl_I_tot_b0 = inputs["Fl_I:tot:composition"]  # elemental
-        Fl_I_names = self.inflow_composition
 
         # copy the incoming flow into a correctly sized array for the outflow composition
         b0_out = np.array(Fl_I_tot_b0)
 
-        sub_comp = 0 * b0_out
-        sub_comp[Fl_I_names.index("H")] = 2 * n_h2o
-        sub_comp[Fl_I_names.index("O")] = n_h2o
+        sub_comp = self.sub_moles * n_h2o
 
         sub_comp *= self.inflow_wt_mole
         b0_out *= self.inflow_wt_mole  # convert to mass units
@@ -86,6 +107,161 @@ class ThermoSub(om.ExplicitComponent):
         outputs["composition_water"] = sub_comp
         outputs["W_water"] = w_water
 
+    def compute_partials(self, inputs, J):
+        W = inputs["Fl_I:stat:W"][0]
+        n_h2o = inputs["n"][self.idx_h2o]
+        w_frac = inputs["w_frac"][0]
+        b0 = inputs["Fl_I:tot:composition"]
+        wt = self.inflow_wt_mole
+        e = self.sub_moles
+        c = self.wt_h2o
+        sub_rows = [self.idx_H, self.idx_O]
+
+        # W_water = W * c * n_h2o * w_frac / M, where M is the mass of the incoming composition.
+        # The outflow composition does not depend on W: b_out = (b0 - e * n_h2o * w_frac) / D, D = M - c * n_h2o * w_frac
+        M = np.sum(b0 * wt)
+        D = M - c * n_h2o * w_frac
+        b_num = b0 - e * n_h2o * w_frac
+
+        J["W_water", "Fl_I:stat:W"] = c * n_h2o * w_frac / M
+        J["W_water", "Fl_I:tot:composition"] = -W * c * n_h2o * w_frac * wt / M ** 2
+        J["W_water", "n"] = W * c * w_frac / M
+        J["W_water", "w_frac"] = W * c * n_h2o / M
+
+        J["Wout", "Fl_I:stat:W"] = D / M
+        J["Wout", "Fl_I:tot:composition"] = W * c * n_h2o * w_frac * wt / M ** 2
+        J["Wout", "n"] = -W * c * w_frac / M
+        J["Wout", "w_frac"] = -W * c * n_h2o / M
+
+        J["composition_out", "Fl_I:tot:composition"] = np.eye(self.num_inflow_composition) / D - np.outer(
+            b_num, wt
+        ) / D ** 2
+        J["composition_out", "n"] = -e * w_frac / D + b_num * c * w_frac / D ** 2
+        J["composition_out", "w_frac"] = -e * n_h2o / D + b_num * c * n_h2o / D ** 2
+
+        sub_wt = e[sub_rows] * wt[sub_rows]
+        J["composition_water", "Fl_I:stat:W"] = sub_wt * n_h2o * w_frac / M
+        J["composition_water", "Fl_I:tot:composition"] = (
+            -np.outer(sub_wt, wt) * n_h2o * w_frac * W / M ** 2
+        ).ravel()
+        J["composition_water", "n"] = sub_wt * w_frac * W / M
+        J["composition_water", "w_frac"] = sub_wt * n_h2o * W / M
+
+
+class TabWaterFraction(om.Group):
+    """
+    Equilibrium mass fraction of water in a tabular thermo flow, interpolated from the "Y_H2O" table of the spec.
+    Inputs are promoted the same way as pyCycle's tabular SetTotalTP.
+    """
+
+    def initialize(self):
+        self.options.declare("interp_method", default="slinear")
+        self.options.declare("spec", recordable=False)
+        self.options.declare("composition")
+
+    def setup(self):
+        spec = self.options["spec"]
+        composition = self.options["composition"]
+
+        if composition is None:
+            composition = TAB_AIR_FUEL_COMPOSITION
+
+        sorted_compo = sorted(composition.keys())
+
+        interp = om.MetaModelStructuredComp(method=self.options["interp_method"], extrapolate=True)
+        self.add_subsystem("tab", interp, promotes_inputs=["P", "T"], promotes_outputs=["Y_H2O"])
+
+        for i, param in enumerate(sorted_compo):
+            interp.add_input(param, composition[param], training_data=spec[param])
+            self.promotes("tab", inputs=[(param, "composition")], src_indices=[i])
+        self.set_input_defaults("composition", src_shape=len(composition))
+
+        interp.add_input("P", 101325.0, units="Pa", training_data=spec["P"])
+        interp.add_input("T", 273.0, units="degK", training_data=spec["T"])
+        interp.add_output("Y_H2O", 0.0, training_data=spec["Y_H2O"])
+
+
+class TabThermoSub(om.ExplicitComponent):
+    """
+    TabThermoSub removes a fraction of the water from a tabular thermo flow. The tabular composition is a vector of
+    ratios to dry air, so the water removed only lowers the water-to-air ratio entry (which may become negative
+    once more water is removed than was in the air, i.e. some of the combustion water is gone).
+    """
+
+    def initialize(self):
+        self.options.declare("inflow_composition", default=None, desc="composition present in the flow")
+        self.options.declare("water_name", default="WAR", desc="composition key of the water-to-air ratio")
+
+    def setup(self):
+        inflow_composition = self.options["inflow_composition"]
+
+        if inflow_composition is None:
+            inflow_composition = TAB_AIR_FUEL_COMPOSITION
+
+        sorted_compo = sorted(inflow_composition.keys())
+        self.idx_water = sorted_compo.index(self.options["water_name"])
+        inflow_composition_vec = [inflow_composition[k] for k in sorted_compo]
+        nc = len(sorted_compo)
+
+        # inputs
+        self.add_input("Fl_I:stat:W", val=0.0, desc="weight flow", units="lbm/s")
+        self.add_input("Fl_I:tot:composition", val=inflow_composition_vec, desc="incoming flow composition")
+        self.add_input("Y_H2O", val=0.0, desc="mass fraction of water in the incoming flow")
+        self.add_input("w_frac", val=0.01, desc="fraction of water from incoming flow to extract")
+
+        # outputs
+        self.add_output("Wout", shape=1, units="lbm/s", desc="main massflow out")
+        self.add_output("W_water", shape=1, units="lbm/s", desc="water massflow out")
+        self.add_output("composition_out", val=inflow_composition_vec)
+
+        # identity on the other entries, full row for the water entry
+        ar = np.arange(nc)
+        other = np.delete(ar, self.idx_water)
+        self.declare_partials(["Wout", "W_water"], ["Fl_I:stat:W", "Y_H2O", "w_frac"])
+        self.declare_partials(
+            "composition_out",
+            "Fl_I:tot:composition",
+            rows=np.concatenate([other, np.full(nc, self.idx_water)]),
+            cols=np.concatenate([other, ar]),
+        )
+        self.declare_partials("composition_out", ["Y_H2O", "w_frac"], rows=[self.idx_water], cols=[0])
+
+    def compute(self, inputs, outputs):
+        W = inputs["Fl_I:stat:W"]
+        Y = inputs["Y_H2O"]
+        w_frac = inputs["w_frac"]
+        compo_in = inputs["Fl_I:tot:composition"]
+
+        # water removed per unit of dry air is w_frac * Y_H2O * W / W_air
+        compo_out = np.array(compo_in)
+        compo_out[self.idx_water] -= w_frac * Y * (1 + np.sum(compo_in))
+        W_water = w_frac * Y * W
+
+        outputs["composition_out"] = compo_out
+        outputs["W_water"] = W_water
+        outputs["Wout"] = W - W_water
+
+    def compute_partials(self, inputs, J):
+        W = inputs["Fl_I:stat:W"]
+        Y = inputs["Y_H2O"]
+        w_frac = inputs["w_frac"]
+        compo_in = inputs["Fl_I:tot:composition"]
+        nc = len(compo_in)
+        S = 1 + np.sum(compo_in)
+
+        J["W_water", "Fl_I:stat:W"] = w_frac * Y
+        J["W_water", "Y_H2O"] = w_frac * W
+        J["W_water", "w_frac"] = Y * W
+        J["Wout", "Fl_I:stat:W"] = 1 - w_frac * Y
+        J["Wout", "Y_H2O"] = -w_frac * W
+        J["Wout", "w_frac"] = -Y * W
+
+        d_water = np.full(nc, -w_frac[0] * Y[0])
+        d_water[self.idx_water] += 1.0
+        J["composition_out", "Fl_I:tot:composition"] = np.concatenate([np.ones(nc - 1), d_water])
+        J["composition_out", "Y_H2O"] = -w_frac * S
+        J["composition_out", "w_frac"] = -Y * S
+
 
 class WaterBleed(Element):
     """
@@ -96,6 +272,12 @@ class WaterBleed(Element):
     Fl_I -> primary input flow
     Fl_O -> primary output flow
 
+    If `upstream_n` is True, the product mole vector `n` of the incoming flow is not solved for here and must be
+    connected from the upstream element's Thermo (e.g. `duct5.real_flow.base_thermo.n`).
+
+    With TABULAR thermo the water content of the flow is interpolated from the "Y_H2O" table of `thermo_data`
+    (see tab_thermo_gen.py) and `upstream_n` is ignored.
+
     -------------
     Design
     -------------
@@ -128,6 +310,12 @@ class WaterBleed(Element):
     def initialize(self):
         self.options.declare("statics", default=True, desc="If True, calculate static properties.")
         self.options.declare("design_water", default=False, types=bool, desc="If True, set DP as water injection.")
+        self.options.declare(
+            "upstream_n",
+            default=False,
+            types=bool,
+            desc="If True, take the product moles, n, from the upstream flow instead of solving for them.",
+        )
 
         self.default_des_od_conns = [
             # (design src, off-design target)
@@ -142,36 +330,49 @@ class WaterBleed(Element):
         )  # since we are extracting only a fraction of water, copy flow element composition dictionary
 
     def setup(self):
-        thermo_method = self.options["thermo_method"]  # will always be CEA for this component
+        thermo_method = self.options["thermo_method"]
         thermo_data = self.options["thermo_data"]  #
         statics = self.options["statics"]
         # design = self.options["design"]
         design_water = self.options["design_water"]
+        upstream_n = self.options["upstream_n"]
         composition = self.Fl_O_data["Fl_O"]  # dictionary of elements strings and associated elemental ratio
 
-        # Compute equilibrium composition before extraction to get moles of H2O in flow
-        init_flow = Thermo(
-            mode="total_TP",
-            fl_name="Fl_I:tot",
-            method=thermo_method,
-            thermo_kwargs={"composition": composition, "spec": thermo_data},
-        )
-        prom_in = [("composition", "Fl_I:tot:composition"), ("T", "Fl_I:tot:T"), ("P", "Fl_I:tot:P")]
-        self.init_flow_data = self.add_subsystem("init_flow", init_flow, promotes_inputs=prom_in, promotes_outputs=[])
+        if thermo_method == "TABULAR":
+            # Interpolate equilibrium water content of the incoming flow
+            prom_in = [("composition", "Fl_I:tot:composition"), ("T", "Fl_I:tot:T"), ("P", "Fl_I:tot:P")]
+            self.add_subsystem(
+                "water_frac", TabWaterFraction(spec=thermo_data, composition=composition), promotes_inputs=prom_in
+            )
+        elif not upstream_n:
+            # Compute equilibrium composition before extraction to get moles of H2O in flow
+            init_flow = Thermo(
+                mode="total_TP",
+                fl_name="Fl_I:tot",
+                method=thermo_method,
+                thermo_kwargs={"composition": composition, "spec": thermo_data},
+            )
+            prom_in = [("composition", "Fl_I:tot:composition"), ("T", "Fl_I:tot:T"), ("P", "Fl_I:tot:P")]
+            self.init_flow_data = self.add_subsystem(
+                "init_flow", init_flow, promotes_inputs=prom_in, promotes_outputs=[]
+            )
 
         # Create inlet flowstation
         flow_in = FlowIn(fl_name="Fl_I")
         self.add_subsystem("flow_in", flow_in, promotes=["Fl_I:tot:*", "Fl_I:stat:*"])
 
         # Create object to subtract water from flow
-        thermo_sub_comp = ThermoSub(spec=thermo_data, inflow_composition=self.Fl_I_data["Fl_I"])
+        prom = ["Fl_I:stat:W", "Fl_I:tot:composition", "Wout", "W_water", "composition_out"]
+        if thermo_method == "TABULAR":
+            thermo_sub_comp = TabThermoSub(inflow_composition=self.Fl_I_data["Fl_I"])
+            self.connect("water_frac.Y_H2O", "sub_flow.Y_H2O")
+        else:
+            thermo_sub_comp = ThermoSub(spec=thermo_data, inflow_composition=self.Fl_I_data["Fl_I"])
+            if upstream_n:
+                prom += ["n"]
 
         # Create output_ports instance
-        self.ext_sys = self.add_subsystem(
-            "sub_flow",
-            thermo_sub_comp,
-            promotes=["Fl_I:stat:W", "Fl_I:tot:composition", "Wout", "W_water", "composition_out"],
-        )
+        self.ext_sys = self.add_subsystem("sub_flow", thermo_sub_comp, promotes=prom)
 
         # Pressure loss
         prom_in = [("Pt_in", "Fl_I:tot:P"), "dPqP"]
@@ -233,7 +434,8 @@ class WaterBleed(Element):
 
     def configure(self):
         # Connect molar fraction, n, array to subsystem to determine amount of H2O in stream
-        self.connect("init_flow.base_thermo.n", "sub_flow.n")
+        if self.options["thermo_method"] != "TABULAR" and not self.options["upstream_n"]:
+            self.connect("init_flow.base_thermo.n", "sub_flow.n")
         return super().configure()
 
 
@@ -299,7 +501,7 @@ if __name__ == "__main__":
 
     # p.setup()
     p.run_model()
-    # p.check_partials(compact_print=True, show_only_incorrect=False, method="fd")
+    # p.check_partials(compact_print=True, show_only_incorrect=False, method="cs")
 
     # names = init_flow_data.base_thermo.thermo.products
     # compounds = init_flow_data.base_thermo.chem_eq._outputs["n"]
@@ -320,3 +522,57 @@ if __name__ == "__main__":
     # print("T", p["Fl_I:tot:T"], p["Fl_O:tot:T"], p["test1:tot:T"], p["test2:tot:T"])
     # print("P", p["Fl_I:tot:P"], p["Fl_O:tot:P"], p["test1:tot:P"], p["test2:tot:P"])
     # p.check_partials()
+
+    # --- Regression check: upstream_n must match the init_flow equilibrium solve ---
+    import pycycle.api as pyc
+
+    class ExtractCheck(pyc.Cycle):
+        def setup(self):
+            self.options["thermo_method"] = "CEA"
+            self.options["thermo_data"] = wet_air
+
+            self.add_subsystem(
+                "fc", pyc.FlightConditions(composition=CEA_AIR_COMPOSITION, reactant="Water", mix_ratio_name="WAR")
+            )
+            self.add_subsystem("duct", pyc.Duct())
+            self.add_subsystem("extract_ref", WaterBleed(design_water=True))
+            self.add_subsystem("extract", WaterBleed(design_water=True, upstream_n=True))
+
+            self.pyc_connect_flow("fc.Fl_O", "duct.Fl_I")
+            self.pyc_connect_flow("duct.Fl_O", "extract_ref.Fl_I")
+            self.pyc_connect_flow("duct.Fl_O", "extract.Fl_I")
+            self.connect("duct.real_flow.base_thermo.n", "extract.n")
+
+            self.set_input_defaults("fc.W", 100.0, units="lbm/s")
+            self.set_input_defaults("fc.alt", 0.0, units="ft")
+            self.set_input_defaults("fc.MN", 0.5)
+
+            newton = self.nonlinear_solver = om.NewtonSolver()
+            newton.options["atol"] = 1e-10
+            newton.options["rtol"] = 1e-10
+            newton.options["maxiter"] = 20
+            newton.options["solve_subsystems"] = True
+            newton.options["iprint"] = -1
+            self.linear_solver = om.DirectSolver()
+
+            super().setup()
+
+    p = om.Problem()
+    p.model = ExtractCheck()
+    p.setup()
+
+    p.set_val("fc.WAR", 0.01)
+    p.set_val("duct.MN", 0.3)
+    p.set_val("duct.dPqP", 0.01)
+    for ext in ["extract_ref", "extract"]:
+        p.set_val(ext + ".MN", 0.3)
+        p.set_val(ext + ".dPqP", 0.0)
+        p.set_val(ext + ".sub_flow.w_frac", 0.5)
+
+    p.run_model()
+
+    for var in ["W_water", "Wout", "Fl_O:tot:T", "Fl_O:tot:h", "Fl_O:stat:area"]:
+        ref = p["extract_ref." + var]
+        new = p["extract." + var]
+        print(f"{var}: init_flow={ref[0]:.8f} upstream_n={new[0]:.8f}")
+        assert np.allclose(ref, new, rtol=1e-8), f"upstream_n does not match init_flow for {var}"
@@ -1,9 +1,10 @@
 """ Class definition for Combustor."""
 
-# import numpy as np
+import numpy as np
 
 import openmdao.api as om
 
+from pycycle.constants import TAB_AIR_FUEL_COMPOSITION
 from pycycle.thermo.thermo import Thermo, ThermoAdd
 
 from pycycle.thermo.cea.species_data import janaf
@@ -15,6 +16,94 @@ from pycycle.passthrough import PassThrough
 from pycycle.element_base import Element
 
 
+class TabWaterAdd(om.ExplicitComponent):
+    """
+    TabWaterAdd mixes a flow of pure water into a tabular thermo flow. The tabular composition is a vector of
+    ratios to dry air, so the added water only changes the water-to-air ratio entry.
+    """
+
+    def initialize(self):
+        self.options.declare("inflow_composition", default=None, desc="composition present in the inflow")
+        self.options.declare("water_name", default="WAR", desc="composition key of the water-to-air ratio")
+        self.options.declare("mix_name", default="mix", desc="name of the water mix port")
+
+    def setup(self):
+        inflow_composition = self.options["inflow_composition"]
+        mix_name = self.options["mix_name"]
+
+        if inflow_composition is None:
+            inflow_composition = TAB_AIR_FUEL_COMPOSITION
+
+        sorted_compo = sorted(inflow_composition.keys())
+        self.idx_water = sorted_compo.index(self.options["water_name"])
+        inflow_composition_vec = [inflow_composition[k] for k in sorted_compo]
+        nc = len(sorted_compo)
+
+        # inputs
+        self.add_input("Fl_I:stat:W", val=0.0, desc="weight flow", units="lbm/s")
+        self.add_input("Fl_I:tot:h", val=0.0, desc="total enthalpy", units="Btu/lbm")
+        self.add_input("Fl_I:tot:composition", val=inflow_composition_vec, desc="incoming flow composition")
+        self.add_input(f"{mix_name}:h", val=0.0, units="Btu/lbm", desc="water enthalpy")
+        self.add_input(f"{mix_name}:W", val=0.0, units="lbm/s", desc="water massflow")
+
+        # outputs
+        self.add_output("mass_avg_h", shape=1, units="Btu/lbm", desc="mass flow rate averaged specific enthalpy")
+        self.add_output("Wout", shape=1, units="lbm/s", desc="total massflow out")
+        self.add_output("composition_out", val=inflow_composition_vec)
+
+        # identity on the other entries, full row for the water entry
+        ar = np.arange(nc)
+        other = np.delete(ar, self.idx_water)
+        self.declare_partials("mass_avg_h", ["Fl_I:stat:W", "Fl_I:tot:h", f"{mix_name}:h", f"{mix_name}:W"])
+        self.declare_partials("Wout", ["Fl_I:stat:W", f"{mix_name}:W"], val=1.0)
+        self.declare_partials(
+            "composition_out",
+            "Fl_I:tot:composition",
+            rows=np.concatenate([other, np.full(nc, self.idx_water)]),
+            cols=np.concatenate([other, ar]),
+        )
+        self.declare_partials("composition_out", ["Fl_I:stat:W", f"{mix_name}:W"], rows=[self.idx_water], cols=[0])
+
+    def compute(self, inputs, outputs):
+        mix_name = self.options["mix_name"]
+
+        W = inputs["Fl_I:stat:W"]
+        W_mix = inputs[f"{mix_name}:W"]
+        compo_in = inputs["Fl_I:tot:composition"]
+
+        # composition is a vector of <something>-to-air ratios, and the water adds no air
+        W_air = W / (1 + np.sum(compo_in))
+        compo_out = np.array(compo_in)
+        compo_out[self.idx_water] += W_mix / W_air
+
+        outputs["composition_out"] = compo_out
+        outputs["Wout"] = W + W_mix
+        outputs["mass_avg_h"] = (W * inputs["Fl_I:tot:h"] + W_mix * inputs[f"{mix_name}:h"]) / (W + W_mix)
+
+    def compute_partials(self, inputs, J):
+        mix_name = self.options["mix_name"]
+
+        W = inputs["Fl_I:stat:W"]
+        W_mix = inputs[f"{mix_name}:W"]
+        h = inputs["Fl_I:tot:h"]
+        h_mix = inputs[f"{mix_name}:h"]
+        compo_in = inputs["Fl_I:tot:composition"]
+        nc = len(compo_in)
+        W_out = W + W_mix
+        S = 1 + np.sum(compo_in)
+
+        J["mass_avg_h", "Fl_I:stat:W"] = W_mix * (h - h_mix) / W_out ** 2
+        J["mass_avg_h", "Fl_I:tot:h"] = W / W_out
+        J["mass_avg_h", f"{mix_name}:h"] = W_mix / W_out
+        J["mass_avg_h", f"{mix_name}:W"] = W * (h_mix - h) / W_out ** 2
+
+        d_water = np.full(nc, W_mix[0] / W[0])
+        d_water[self.idx_water] += 1.0
+        J["composition_out", "Fl_I:tot:composition"] = np.concatenate([np.ones(nc - 1), d_water])
+        J["composition_out", "Fl_I:stat:W"] = -W_mix * S / W ** 2
+        J["composition_out", f"{mix_name}:W"] = S / W
+
+
 class Injector(Element):
     """
     A injector that adds a reactant to an incoming flow mixture
@@ -82,6 +171,14 @@ class Injector(Element):
         reactant = self.options["reactant"]
         # spec = self.options["spec"]
 
+        if thermo_method == "TABULAR":
+            # water is a composition entry of the tabular flow, so the outflow has the inflow composition keys
+            self.thermo_add_comp = TabWaterAdd(
+                inflow_composition=self.Fl_I_data["Fl_I"], mix_name=self.options["mix_name"]
+            )
+            self.copy_flow("Fl_I", "Fl_O")
+            return
+
         self.thermo_add_comp = ThermoAdd(
             method=thermo_method,
             mix_mode="flow",
@@ -115,19 +212,10 @@ class Injector(Element):
         self.add_subsystem("in_flow", in_flow, promotes=["Fl_I:tot:*", "Fl_I:stat:*"])
 
         # Create output_ports instance
-        self.add_subsystem(
-            "mix_react",
-            self.thermo_add_comp,
-            promotes=[
-                "Fl_I:stat:W",
-                (f"{mix_name}:composition", "mix_composition"),
-                "Fl_I:tot:composition",
-                "Fl_I:tot:h",
-                f"{mix_name}:h",
-                f"{mix_name}:W",
-                "Wout",
-            ],
-        )
+        prom = ["Fl_I:stat:W", "Fl_I:tot:composition", "Fl_I:tot:h", f"{mix_name}:h", f"{mix_name}:W", "Wout"]
+        if thermo_method != "TABULAR":
+            prom += [(f"{mix_name}:composition", "mix_composition")]
+        self.add_subsystem("mix_react", self.thermo_add_comp, promotes=prom)
 
         # Pressure loss
         prom_in = [("Pt_in", "Fl_I:tot:P"), "dPqP"]
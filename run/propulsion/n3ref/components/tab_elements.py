@@ -0,0 +1,81 @@
+""" Tabular thermo variants of the pyCycle elements that mix a reactant or a flow into their inflow."""
+
+import numpy as np
+
+import openmdao.api as om
+import pycycle.api as pyc
+
+
+class TabCompositionCarry(object):
+    """
+    Mixin for pyCycle elements built around a ThermoAdd. The tabular ThermoAdd returns no output port data, so the
+    flows downstream of the element would fall back to pycycle.constants.TAB_AIR_FUEL_COMPOSITION. A tabular
+    composition is a vector of ratios to dry air whose keys do not change through an element, so the output ports
+    left without data carry the composition of the Fl_I port instead.
+    """
+
+    def pyc_setup_output_ports(self):
+        super().pyc_setup_output_ports()
+
+        if self.options["thermo_method"] == "TABULAR":
+            for port, data in self.Fl_O_data.items():
+                if data is None:
+                    self.Fl_O_data[port] = self.Fl_I_data["Fl_I"]
+
+
+class TabCombustor(TabCompositionCarry, pyc.Combustor):
+    """
+    Combustor whose tabular outflow has the composition keys of its inflow.
+    """
+
+
+class TabTurbine(TabCompositionCarry, pyc.Turbine):
+    """
+    Turbine whose tabular outflow has the composition keys of its inflow.
+    """
+
+
+class WaterComposition(om.ExplicitComponent):
+    """
+    Tabular composition vector with the water-to-air ratio entry set by the WAR input.
+    """
+
+    def initialize(self):
+        self.options.declare("composition", desc="tabular composition, with the values of the other entries")
+        self.options.declare("water_name", default="WAR", desc="composition key of the water-to-air ratio")
+
+    def setup(self):
+        composition = self.options["composition"]
+
+        sorted_compo = sorted(composition.keys())
+        self.idx_water = sorted_compo.index(self.options["water_name"])
+        self.composition_vec = np.array([composition[k] for k in sorted_compo], dtype=float)
+
+        self.add_input("WAR", val=composition[self.options["water_name"]], desc="water-to-dry-air mass ratio")
+        self.add_output("composition", val=self.composition_vec)
+
+        self.declare_partials("composition", "WAR", rows=[self.idx_water], cols=[0], val=1.0)
+
+    def compute(self, inputs, outputs):
+        composition = self.composition_vec.copy()
+        composition[self.idx_water] = inputs["WAR"][0]
+        outputs["composition"] = composition
+
+
+class TabFlightConditions(pyc.FlightConditions):
+    """
+    FlightConditions of a tabular wet air flow. Mixing the water in as a reactant would leave the flow start without
+    a composition (see TabCompositionCarry), so the "WAR" input sets the water entry of the `composition` option
+    directly. For a dry air base composition this is the same flow as FlightConditions(reactant="WAR",
+    mix_ratio_name="WAR"): the tabular water ratio is referenced to the dry air either way.
+    """
+
+    def setup(self):
+        if self.options["reactant"] is not False:
+            raise ValueError("TabFlightConditions sets the water ratio in the composition and takes no reactant.")
+
+        self.add_subsystem("water", WaterComposition(composition=self.options["composition"]), promotes_inputs=["WAR"])
+
+        super().setup()
+
+        self.connect("water.composition", "fs.composition")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+@File    :   continuation.py
+@Time    :   2026/10/17
+@Desc    :   Continuation driver to walk a converged MPN3 solution to new design/operating parameters
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from openmdao.core.analysis_error import AnalysisError
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from warm_start import get_states, od_points, run_converged, set_states, state_vars
+
+
+def continuation(
+    prob,
+    targets,
+    states=None,
+    step=0.1,
+    min_step=1e-3,
+    max_step=1.0,
+    target_iter=4,
+    predictor="secant",
+    start_converged=False,
+    callback=None,
+    iprint=1,
+):
+    """
+    Move the problem from its current parameters to `targets`, a dict of input names and target values, along the
+    straight path p(s) = p0 + s * (targets - p0), s in [0, 1].
+
+    Each step predicts the balance states at the new parameters and runs the model from there:
+        - "secant" extrapolates through the last two converged solutions (zeroth order on the first step)
+        - "tangent" uses the total derivatives of the states along the path
+    The step grows when Newton converges in fewer than `target_iter` iterations and shrinks when it needs more.
+    Steps that raise an AnalysisError or do not converge are halved and retried from the last converged
+    solution, down to `min_step`.
+
+    `states` are the names of the predicted states, by default the balance states of the model (see
+    warm_start.state_vars). `callback(prob)` is called after every converged step. Returns the number of run_model
+    calls.
+    """
+    if states is None:
+        states = state_vars(od_points(prob))
+
+    names = list(targets)
+    p0 = {name: np.atleast_1d(prob.get_val(name)).copy() for name in names}
+    dp = {name: np.atleast_1d(targets[name]) - p0[name] for name in names}
+    solver = prob.model.nonlinear_solver
+    n_runs = 0
+
+    def set_params(s):
+        for name in names:
+            prob.set_val(name, p0[name] + s * dp[name])
+
+    if not start_converged:
+        n_runs += 1
+        if not run_converged(prob):
+            raise AnalysisError("Continuation start point did not converge.")
+        if callback is not None:
+            callback(prob)
+
+    # converged path history as (s, states); the full output vector of the last converged solution is kept to
+    # restore the internal (e.g. chemical equilibrium) states after a failed step
+    history = [(0.0, get_states(prob, states))]
+    outputs_last = prob.model._outputs.asarray(copy=True)
+    s = 0.0
+    ds = min(step, max_step)
+
+    while s < 1.0:
+        s_new = min(s + ds, 1.0)
+        s_last, x_last = history[-1]
+
+        # Predict states at s_new
+        if predictor == "tangent":
+            of = list(x_last)
+            totals = prob.compute_totals(of=of, wrt=names)
+            x_pred = {
+                name: x_last[name] + (s_new - s_last) * sum(np.dot(totals[name, p], dp[p]) for p in names)
+                for name in of
+            }
+        elif len(history) > 1:
+            s_prev, x_prev = history[-2]
+            r = (s_new - s_last) / (s_last - s_prev)
+            x_pred = {name: x_last[name] + r * (x_last[name] - x_prev[name]) for name in x_last}
+        else:
+            x_pred = x_last
+
+        # the output vector includes the sources of the parameters, so set those after restoring it
+        prob.model._outputs.set_val(outputs_last)
+        set_params(s_new)
+        set_states(prob, x_pred)
+        n_runs += 1
+
+        if run_converged(prob):
+            n_iter = solver._iter_count
+            if iprint > 0:
+                print(f"Continuation: s = {s_new:.4f} converged in {n_iter} iterations (ds = {ds:.4f})")
+
+            s = s_new
+            history.append((s, get_states(prob, states)))
+            outputs_last = prob.model._outputs.asarray(copy=True)
+            if callback is not None:
+                callback(prob)
+
+            # adapt the step to the Newton effort
+            if n_iter < target_iter:
+                ds = min(ds * 1.5, max_step)
+            elif n_iter > target_iter:
+                ds = max(ds * 0.5, min_step)
+
+        else:
+            if iprint > 0:
+                print(f"Continuation: s = {s_new:.4f} failed, halving step (ds = {ds:.4f})")
+
+            # restore the last converged solution
+            prob.model._outputs.set_val(outputs_last)
+            set_params(s_last)
+
+            if ds <= min_step:
+                raise AnalysisError(f"Continuation stalled at s = {s_last} with the minimum step size.")
+            ds = max(ds * 0.5, min_step)
+
+    return n_runs
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+@File    :   cycle_eval.py
+@Time    :   2026/10/17
+@Desc    :   Batch evaluation of the MPN3 cycle on a problem that is set up once
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import time
+import warnings
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from warm_start import OD_PTS, WarmStartDB, get_states, od_points, run_converged, set_states, state_vars
+
+# Design point and cycle parameters set on a new problem, as (value, units)
+DEFAULT_INPUTS = {
+    "TOC.fc.W": (820.44097898, "lbm/s"),
+    "TOC.splitter.BPR": (23.94514401, None),
+    "TOC.balance.rhs:hpc_PR": (53.6332, None),
+    "fan:PRdes": (1.300, None),
+    "lpc:PRdes": (3.000, None),
+    "T4_ratio.TR": (0.926470588, None),
+    "RTO_T4": (3400.0, "degR"),
+    "SLS.balance.rhs:FAR": (28620.84, "lbf"),
+    "CRZ.balance.rhs:FAR": (5510.72833567, "lbf"),
+    "RTO.hpt_cooling.x_factor": (0.9, None),
+    "TOC.inject.area": (117.730, "inch**2"),
+    "TOC.extract.area": (1053.492, "inch**2"),
+}
+
+
+def output_vars(pts):
+    """
+    Results returned for every case of a model with the points `pts`.
+    """
+    return (
+        [f"{pt}.perf.TSFC" for pt in pts]
+        + [f"{pt}.tsec_perf.TSEC" for pt in pts]
+        + [f"{pt}.perf.Fn" for pt in pts]
+        + [f"{pt}.extract.W_water" for pt in pts]
+        + [f"{pt}.inject.mix:W" for pt in pts]
+    )
+
+
+# Results of the default MPN3
+OUTPUT_VARS = output_vars(["TOC"] + OD_PTS)
+
+
+def einox_vars(pts):
+    """
+    EINOx results of a model with the points `pts` built with the NOx correlations of N3_CLVR_V3.add_einox, which
+    correlates every point but the SLS reference.
+    """
+    return [f"{pt}_EINOx.EINOx_OD" for pt in pts if pt != "SLS"]
+
+
+# EINOx results of the default MPN3, e.g.
+# CycleEvaluator(partial(einox_model, model_factory, ALT_WAR, SLS_WAR), outputs=OUTPUT_VARS + EINOX_VARS)
+EINOX_VARS = einox_vars(["TOC"] + OD_PTS)
+
+
+def order_cases(x, x0=None):
+    """
+    Greedy nearest neighbour ordering of the rows of `x`, starting from the row closest to `x0` (or the first row),
+    with each parameter scaled by its range over the batch. Returns the row indices in run order.
+    """
+    n = x.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=int)
+
+    span = x.max(axis=0) - x.min(axis=0)
+    span[span == 0.0] = 1.0
+    xs = x / span
+
+    start = 0 if x0 is None else int(np.argmin(np.linalg.norm(xs - x0 / span, axis=1)))
+    order = [start]
+    left = np.ones(n, dtype=bool)
+    left[start] = False
+
+    for _ in range(n - 1):
+        dist = np.linalg.norm(xs - xs[order[-1]], axis=1)
+        dist[~left] = np.inf
+        nxt = int(np.argmin(dist))
+        order.append(nxt)
+        left[nxt] = False
+
+    return np.array(order)
+
+
+class CycleEvaluator(object):
+    """
+    Sets up an MPN3 problem once and evaluates batches of parameter sets on it.
+
+    `model_factory()` returns the (not yet set up) problem, e.g. `partial(N3ref_model, use_h2=True)`. The cases of a
+    batch are run in nearest neighbour order so each solve starts from the converged solution of the previous one.
+    After a failed case the last converged solution is restored. The first case starts from the closest solution in
+    the warm-start database; converged cases are added to `warm_db` if one is given. The outputs default to
+    `output_vars` of the design and off-design points of the model; outputs it does not have are left out of the
+    results with a warning.
+    """
+
+    def __init__(self, model_factory, fuel="JetA", inputs=DEFAULT_INPUTS, outputs=None, warm_db=None):
+        self.fuel = fuel
+        self.warm_db = warm_db
+
+        prob = self.prob = model_factory()
+        prob.setup()
+
+        self.outputs = output_vars(["TOC"] + od_points(prob)) if outputs is None else list(outputs)
+
+        missing = []
+        for name in self.outputs:
+            try:
+                prob.get_val(name)
+            except KeyError:
+                missing.append(name)
+        if missing:
+            warnings.warn(f"The model has no {', '.join(missing)}; they are left out of the results.")
+            self.outputs = [name for name in self.outputs if name not in missing]
+
+        for name, (val, units) in inputs.items():
+            prob.set_val(name, val, units=units)
+
+        if warm_db is None:
+            warm_db = WarmStartDB()
+        warm_db.warm_start(prob, fuel)
+
+        prob.set_solver_print(level=-1)
+        self.outputs_last = None
+
+    def _get(self, name):
+        try:
+            return np.atleast_1d(self.prob.get_val(name))[0]
+        except KeyError:
+            return np.nan
+
+    def run_case(self, params, states=None):
+        """
+        Run one case from the current solution, or from the given balance states. Returns (converged, dict of output
+        values, Newton iterations).
+        """
+        prob = self.prob
+
+        # the output vector includes the sources of the parameters, so set those after restoring it
+        if self.outputs_last is not None:
+            prob.model._outputs.set_val(self.outputs_last)
+        for name, val in params.items():
+            prob.set_val(name, val)
+        if states is not None:
+            set_states(prob, states)
+
+        converged = run_converged(prob)
+
+        n_iter = prob.model.nonlinear_solver._iter_count
+        if not converged:
+            return False, {name: np.nan for name in self.outputs}, n_iter
+
+        self.outputs_last = prob.model._outputs.asarray(copy=True)
+        if self.warm_db is not None:
+            self.warm_db.add(prob, self.fuel)
+
+        return True, {name: self._get(name) for name in self.outputs}, n_iter
+
+    def evaluate(self, cases, reorder=True):
+        """
+        Evaluate a batch of cases, given as a list of dicts of input values or a dict of equal length input arrays.
+
+        Returns a structured array in the order of `cases`, with a field for every input and output plus
+        `converged`, `n_iter` and `time` (wall time of the solve in seconds).
+        """
+        if isinstance(cases, dict):
+            names = list(cases)
+            x = np.column_stack([np.asarray(cases[name], dtype=float) for name in names])
+        else:
+            names = list(cases[0]) if len(cases) > 0 else []
+            x = np.array([[case[name] for name in names] for case in cases], dtype=float).reshape(len(cases), -1)
+
+        dtype = [(name, "f8") for name in names + self.outputs]
+        dtype += [("converged", "?"), ("n_iter", "i4"), ("time", "f8")]
+        results = np.zeros(x.shape[0], dtype=dtype)
+
+        if reorder:
+            x0 = np.array([self._get(name) for name in names])
+            order = order_cases(x, None if np.any(np.isnan(x0)) else x0)
+        else:
+            order = np.arange(x.shape[0])
+
+        for k in order:
+            params = dict(zip(names, x[k]))
+
+            st = time.time()
+            converged, vals, n_iter = self.run_case(params)
+
+            for name, val in params.items():
+                results[name][k] = val
+            for name, val in vals.items():
+                results[name][k] = val
+            results["converged"][k] = converged
+            results["n_iter"][k] = n_iter
+            results["time"][k] = time.time() - st
+
+        return results
+
+    def get_states(self):
+        """
+        Balance and solver states of the current solution, e.g. to seed another evaluator.
+        """
+        return get_states(self.prob, state_vars(od_points(self.prob)))
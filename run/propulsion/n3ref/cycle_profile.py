@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+@File    :   cycle_profile.py
+@Time    :   2026/10/17
+@Desc    :   Per point and per element timing, call counts and solver iteration counts of cycle runs
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import json
+import time
+from collections import defaultdict
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import openmdao.api as om
+import pycycle.api as pyc
+from openmdao.recorders.case_recorder import CaseRecorder
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+
+# Component methods timed, as (method, category), by component type
+COMP_METHODS = {
+    om.ExplicitComponent: [
+        ("compute", "compute"),
+        ("compute_partials", "linearize"),
+        ("compute_jacvec_product", "linearize"),
+    ],
+    om.ImplicitComponent: [
+        ("apply_nonlinear", "compute"),
+        ("solve_nonlinear", "compute"),
+        ("guess_nonlinear", "compute"),
+        ("linearize", "linearize"),
+        ("apply_linear", "linearize"),
+    ],
+}
+
+
+def _split(path, points, model_name="model"):
+    """
+    (point, element) of a system path, with `points` mapping the paths of the points to their names, e.g.
+    "TOC.burner.mix_fuel" -> ("TOC", "burner") and, with the off-design points in the parallel group of the MPN3,
+    "od.RTO.burner.mix_fuel" -> ("RTO", "burner"). Systems outside the points are reported under the point
+    `model_name` by their first name.
+    """
+    names = path.split(".")
+    for i in range(1, len(names)):
+        point = points.get(".".join(names[:i]))
+        if point is not None:
+            return point, names[i]
+    return model_name, names[0]
+
+
+class IterationCounter(CaseRecorder):
+    """
+    Case recorder that records nothing but counts the iterations of the solvers it is attached to, in the
+    "iterations" entry of their dict in `records` (keyed by solver id). The Newton solver also records its subsystem
+    solves, which are not counted.
+    """
+
+    def __init__(self):
+        super().__init__(record_viewer_data=False)
+        self.records = {}
+
+    def attach(self, solver, record):
+        record["iterations"] = 0
+        self.records[id(solver)] = record
+
+        # only the iteration coordinate is used
+        solver.recording_options["record_inputs"] = False
+        solver.recording_options["record_outputs"] = False
+        solver.add_recorder(self)
+
+    def record_metadata_system(self, system, run_number=None):
+        pass
+
+    def record_metadata_solver(self, solver, run_number=None):
+        pass
+
+    def record_iteration_solver(self, recording_requester, data, metadata):
+        # the coordinate ends with "<solver type>|<iteration>" for an iteration, "Newton_subsolve|0" for a sub-solve
+        if self._iteration_coordinate.rsplit("|", 2)[-2] == type(recording_requester).__name__:
+            self.records[id(recording_requester)]["iterations"] += 1
+
+
+class CycleProfiler(object):
+    """
+    Instruments a set up cycle model (e.g. MPN3) to record:
+        - cumulative compute and linearize time and call counts of the components, summed per point and element
+        - solves, iterations, line search iterations and time of every nonlinear solver
+        - solves, time, and factorizations (linearize) and their time of every linear solver
+
+    Create it after `prob.setup()`. Component times are measured on the leaf components so they do not double count;
+    solver times include the time of everything they solve.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.comps = defaultdict(lambda: defaultdict(lambda: {"calls": 0, "time": 0.0}))
+        self.nl_solvers = {}
+        self.ln_solvers = {}
+        self.wall_time = 0.0
+        self._st = None
+        self._counter = IterationCounter()
+
+        points = {system.pathname: system.name for system in model.system_iter(recurse=True, typ=pyc.Cycle)}
+
+        for system in model.system_iter(include_self=True, recurse=True):
+            path = system.pathname if system.pathname else "model"
+
+            if isinstance(system, om.Group):
+                self._wrap_solvers(system, path)
+                continue
+
+            point, element = _split(path, points)
+            for comp_type, methods in COMP_METHODS.items():
+                if isinstance(system, comp_type):
+                    for method, category in methods:
+                        self._wrap(system, method, self.comps[(point, element)][category])
+
+    def _wrap(self, obj, method, record):
+        func = getattr(obj, method)
+
+        def timed(*args, **kwargs):
+            st = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record["calls"] += 1
+                record["time"] += time.perf_counter() - st
+
+        setattr(obj, method, timed)
+
+    def _wrap_solvers(self, group, path):
+        nl = group.nonlinear_solver
+        if nl is not None and not isinstance(nl, om.NonlinearRunOnce):
+            rec = self.nl_solvers[path] = {"type": type(nl).__name__, "calls": 0, "time": 0.0}
+            self._counter.attach(nl, rec)
+            self._wrap(nl, "solve", rec)
+
+            ls = getattr(nl, "linesearch", None)
+            if ls is not None:
+                ls_rec = rec["linesearch"] = {"type": type(ls).__name__, "calls": 0, "time": 0.0}
+                self._counter.attach(ls, ls_rec)
+                self._wrap(ls, "solve", ls_rec)
+
+        ln = group.linear_solver
+        if ln is not None and not isinstance(ln, om.LinearRunOnce):
+            rec = self.ln_solvers[path] = {"type": type(ln).__name__, "calls": 0, "time": 0.0}
+            rec["factorizations"] = {"calls": 0, "time": 0.0}
+            self._wrap(ln, "solve", rec)
+            self._wrap(ln, "_linearize", rec["factorizations"])
+
+    def start(self):
+        self._st = time.perf_counter()
+
+    def stop(self):
+        if self._st is not None:
+            self.wall_time += time.perf_counter() - self._st
+            self._st = None
+
+    def report(self):
+        """
+        Nested dict of the recorded data, with the component data as points -> elements -> categories.
+        """
+        points = {}
+        for (point, element), data in self.comps.items():
+            if all(rec["calls"] == 0 for rec in data.values()):
+                continue
+            points.setdefault(point, {})[element] = {cat: dict(rec) for cat, rec in data.items()}
+
+        for point, elements in points.items():
+            elements["total"] = {
+                cat: {
+                    "calls": sum(e[cat]["calls"] for e in elements.values() if cat in e),
+                    "time": sum(e[cat]["time"] for e in elements.values() if cat in e),
+                }
+                for cat in ["compute", "linearize"]
+            }
+
+        return {
+            "wall_time": self.wall_time,
+            "points": points,
+            "nonlinear_solvers": self.nl_solvers,
+            "linear_solvers": self.ln_solvers,
+        }
+
+    def save(self, fname):
+        """
+        Write the report as JSON with sorted keys, so reports of two code versions can be diffed.
+        """
+        with open(fname, "w") as f:
+            json.dump(self.report(), f, indent=2, sort_keys=True)
+
+    def print_summary(self, n=10):
+        """
+        Print the `n` elements with the largest compute + linearize time, and the solver totals.
+        """
+        rows = []
+        for point, elements in self.report()["points"].items():
+            for element, data in elements.items():
+                if element != "total":
+                    rows.append((sum(rec["time"] for rec in data.values()), f"{point}.{element}"))
+
+        print(f"Wall time: {self.wall_time:.3f} s")
+        for t, name in sorted(rows, reverse=True)[:n]:
+            print(f"    {name:<30s} {t:10.3f} s")
+        for path, rec in self.nl_solvers.items():
+            print(
+                f"    {path:<30s} {rec['type']}: {rec['calls']} solves, {rec['iterations']} iterations, "
+                f"{rec['time']:.3f} s"
+            )
+        for path, rec in self.ln_solvers.items():
+            fact = rec["factorizations"]
+            print(
+                f"    {path:<30s} {rec['type']}: {rec['calls']} solves {rec['time']:.3f} s, "
+                f"{fact['calls']} factorizations {fact['time']:.3f} s"
+            )
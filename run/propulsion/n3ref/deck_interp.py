@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+"""
+@File    :   deck_interp.py
+@Time    :   2026/10/17
+@Desc    :   Vectorized interpolation, with derivatives, of engine decks and sweep results for mission analysis
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import itertools
+import warnings
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+from scipy.spatial import Delaunay
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from engine_deck import DECK_AXES, read_deck
+from result_store import CONVERGED
+
+# Units of the deck axes
+AXIS_UNITS = {"alt": "ft", "MN": None, "dTs": "degR", "w_frac": None, "throttle": None}
+
+
+def _points(x, inputs):
+    """
+    (n, d) array of query points from an (n, d) array or a dict of arrays (broadcast against each other) by input.
+    """
+    if isinstance(x, dict):
+        vals = np.broadcast_arrays(*[np.asarray(x[name], dtype=float) for name in inputs])
+        return np.column_stack([np.ravel(v) for v in vals])
+    return np.atleast_2d(np.asarray(x, dtype=float))
+
+
+def fill_throttle_lines(vals, converged):
+    """
+    Copy of deck variable `vals` with the points that did not converge filled in along each throttle line (the last
+    axis) by linear interpolation between the converged points, held constant past the ends of the line. Lines
+    without a converged point stay NaN.
+    """
+    vals = np.array(vals, dtype=float)
+    ok = np.asarray(converged, dtype=bool)
+    thr = np.arange(vals.shape[-1])
+
+    for idx in np.ndindex(*vals.shape[:-1]):
+        line_ok = ok[idx]
+        if np.any(line_ok) and not np.all(line_ok):
+            vals[idx] = np.interp(thr, thr[line_ok], vals[idx][line_ok])
+
+    return vals
+
+
+class DeckInterp(object):
+    """
+    Multilinear interpolation of an engine deck written by engine_deck.py, over its axes (DECK_AXES).
+
+    The deck arrays are memory mapped, so only the table entries around the query points are read. Axes with a
+    single value are held at that value. With `extrapolate` the interpolant is extended linearly past the ends of
+    the axes, otherwise the queries are clipped to the grid. Queries the deck does not cover (outside an axis that
+    is not extrapolated, or off the value of a single value axis) give a warning with `out_of_bounds="warn"`, or
+    NaN values and derivatives with `out_of_bounds="nan"`. Points that did not converge are NaN in the deck and
+    propagate to any query that touches them, unless `fill_failed` fills them in along the throttle lines (which
+    reads the whole deck into memory).
+    """
+
+    def __init__(self, path, outputs=None, extrapolate=False, fill_failed=False, out_of_bounds="warn"):
+        if out_of_bounds not in ("warn", "nan"):
+            raise ValueError(f"out_of_bounds must be 'warn' or 'nan', not {out_of_bounds!r}.")
+
+        axes, data, meta = read_deck(path)
+
+        self.inputs = list(DECK_AXES)
+        self.outputs = [name for name in data if name != "converged"] if outputs is None else list(outputs)
+        self.axes = [np.asarray(axes[name], dtype=float) for name in self.inputs]
+        self.extrapolate = extrapolate
+        self.out_of_bounds = out_of_bounds
+        self.meta = meta
+        self.units = dict(AXIS_UNITS)
+        self.units.update(meta.get("units", {}))
+
+        if fill_failed:
+            self.data = {name: fill_throttle_lines(data[name], data["converged"]) for name in self.outputs}
+        else:
+            self.data = {name: data[name] for name in self.outputs}
+
+    def _weights(self, x):
+        """
+        Lower and upper grid indices, interpolation fraction and its derivative for each point and axis.
+        """
+        n, d = x.shape
+        i0 = np.zeros((n, d), dtype=int)
+        i1 = np.zeros((n, d), dtype=int)
+        t = np.zeros((n, d))
+        dt = np.zeros((n, d))
+
+        for k, ax in enumerate(self.axes):
+            if ax.size == 1:
+                continue
+
+            i0[:, k] = np.clip(np.searchsorted(ax, x[:, k], side="right") - 1, 0, ax.size - 2)
+            i1[:, k] = i0[:, k] + 1
+            h = ax[i1[:, k]] - ax[i0[:, k]]
+            t[:, k] = (x[:, k] - ax[i0[:, k]]) / h
+            dt[:, k] = 1.0 / h
+
+            if not self.extrapolate:
+                out = (t[:, k] < 0.0) | (t[:, k] > 1.0)
+                t[:, k] = np.clip(t[:, k], 0.0, 1.0)
+                dt[out, k] = 0.0
+
+        return i0, i1, t, dt
+
+    def _outside(self, x):
+        """
+        (n, d) mask of the query coordinates the deck does not cover.
+        """
+        outside = np.zeros(x.shape, dtype=bool)
+        for k, ax in enumerate(self.axes):
+            tol = 1e-9 * max(ax[-1] - ax[0], np.abs(ax).max(), 1.0)
+            if ax.size == 1 or not self.extrapolate:
+                outside[:, k] = (x[:, k] < ax[0] - tol) | (x[:, k] > ax[-1] + tol)
+        return outside
+
+    def __call__(self, x, derivs=False):
+        """
+        Interpolated outputs at the points `x`, an (n, d) array or a dict of arrays by input name. Returns a dict of
+        (n,) arrays by output, and with `derivs` also a dict of their (n, d) derivatives with respect to the inputs.
+        """
+        x = _points(x, self.inputs)
+        n, d = x.shape
+        i0, i1, t, dt = self._weights(x)
+
+        vals = {name: np.zeros(n) for name in self.outputs}
+        grads = {name: np.zeros((n, d)) for name in self.outputs}
+
+        # sum over the 2^d corners of the cells; corners on a single value axis are visited once
+        for corner in itertools.product(*[[0] if ax.size == 1 else [0, 1] for ax in self.axes]):
+            corner = np.array(corner, dtype=bool)
+            idx = np.where(corner, i1, i0)
+            w = np.where(corner, t, 1.0 - t)
+            dw = np.where(corner, dt, -dt)
+            weight = np.prod(w, axis=1)
+
+            table_idx = tuple(idx.T)
+            for name in self.outputs:
+                corner_vals = np.asarray(self.data[name][table_idx])
+                vals[name] += weight * corner_vals
+
+                if derivs:
+                    for k in range(d):
+                        others = np.prod(np.delete(w, k, axis=1), axis=1)
+                        grads[name][:, k] += dw[:, k] * others * corner_vals
+
+        outside = self._outside(x)
+        out = np.any(outside, axis=1)
+        if np.any(out):
+            if self.out_of_bounds == "nan":
+                for name in self.outputs:
+                    vals[name][out] = np.nan
+                    grads[name][out] = np.nan
+            else:
+                ranges = ", ".join(
+                    f"{name} [{ax[0]:g}, {ax[-1]:g}]"
+                    for name, ax, k_out in zip(self.inputs, self.axes, np.any(outside, axis=0))
+                    if k_out
+                )
+                warnings.warn(
+                    f"{int(np.sum(out))} of {n} deck queries are outside {ranges}; they are clipped to the deck."
+                )
+
+        if derivs:
+            return vals, grads
+        return vals
+
+
+class ScatterInterp(object):
+    """
+    Piecewise linear interpolation of scattered data (e.g. sweep results in a ResultStore) on a Delaunay
+    triangulation of the points, with each input scaled by its range. Queries outside the convex hull of the data
+    are NaN.
+    """
+
+    def __init__(self, x, y, inputs, outputs, units=None):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.units = units if units is not None else {}
+
+        self.lower = x.min(axis=0)
+        span = x.max(axis=0) - self.lower
+        span[span == 0.0] = 1.0
+        self.span = span
+
+        self.tri = Delaunay((x - self.lower) / span)
+        self.y = y.reshape(x.shape[0], -1)
+
+    @classmethod
+    def from_store(cls, store, inputs, outputs, status=CONVERGED, units=None):
+        """
+        Interpolant of the rows of a ResultStore with the given status.
+        """
+        data = store.read()
+        ok = np.asarray(data["status"]) == status
+
+        x = np.column_stack([np.asarray(data[name])[ok] for name in inputs])
+        y = np.column_stack([np.asarray(data[name])[ok] for name in outputs])
+
+        return cls(x, y, inputs, outputs, units=units)
+
+    def __call__(self, x, derivs=False):
+        """
+        Same interface as DeckInterp.__call__.
+        """
+        x = _points(x, self.inputs)
+        u = (x - self.lower) / self.span
+        n, d = u.shape
+
+        simplex = self.tri.find_simplex(u)
+        inside = simplex >= 0
+        s = np.where(inside, simplex, 0)
+
+        # barycentric coordinates: b = T (u - r) for the first d vertices, the last one is 1 - sum(b)
+        T = self.tri.transform[s, :d]
+        b = np.einsum("nij,nj->ni", T, u - self.tri.transform[s, d])
+        b = np.column_stack([b, 1.0 - b.sum(axis=1)])
+
+        y_vert = self.y[self.tri.simplices[s]]
+        vals_all = np.einsum("nv,nvp->np", b, y_vert)
+        # d(value)/du = sum_i (y_i - y_last) T_i
+        grads_all = np.einsum("nip,nij->npj", y_vert[:, :d] - y_vert[:, d:], T) / self.span
+
+        vals_all[~inside] = np.nan
+        grads_all[~inside] = np.nan
+
+        vals = {name: vals_all[:, p] for p, name in enumerate(self.outputs)}
+        if derivs:
+            return vals, {name: grads_all[:, p] for p, name in enumerate(self.outputs)}
+        return vals
+
+
+class InterpComp(om.ExplicitComponent):
+    """
+    Evaluates a DeckInterp or ScatterInterp at `num_nodes` points. The inputs and outputs are named after the
+    interpolant inputs and outputs, and the partials are diagonal.
+    """
+
+    def initialize(self):
+        self.options.declare("num_nodes", default=1, desc="Number of analysis points")
+        self.options.declare("interp", recordable=False, desc="DeckInterp or ScatterInterp")
+
+    def setup(self):
+        nn = self.options["num_nodes"]
+        interp = self.options["interp"]
+        units = interp.units
+        ar = np.arange(nn)
+
+        for name in interp.inputs:
+            self.add_input(name, val=np.zeros(nn), units=units.get(name))
+        for name in interp.outputs:
+            self.add_output(name, val=np.zeros(nn), units=units.get(name))
+            for in_name in interp.inputs:
+                self.declare_partials(name, in_name, rows=ar, cols=ar)
+
+    def _x(self, inputs):
+        return np.column_stack([inputs[name] for name in self.options["interp"].inputs])
+
+    def compute(self, inputs, outputs):
+        vals = self.options["interp"](self._x(inputs))
+        for name, val in vals.items():
+            outputs[name] = val
+
+    def compute_partials(self, inputs, J):
+        interp = self.options["interp"]
+        _, grads = interp(self._x(inputs), derivs=True)
+        for name, grad in grads.items():
+            for k, in_name in enumerate(interp.inputs):
+                J[name, in_name] = grad[:, k]
@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+"""
+@File    :   engine_deck.py
+@Time    :   2026/10/17
+@Desc    :   Engine performance deck of the sized N3 over altitude, Mach number, dTs, water fraction and throttle
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import json
+import os
+import time
+from functools import partial
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from components.emissions import EINOx
+from N3_CLVR_V3 import ALT_WAR, N3, SLS_WAR
+from warm_start import OD_STATE_VARS, get_states, run_converged, set_states
+from work_queue import run_queue, worker_comm
+
+DECK_FILE = "deck.json"
+
+# Grid axes of the deck, in array dimension order. Each (alt, MN, dTs, w_frac) is one throttle line.
+DECK_AXES = ["alt", "MN", "dTs", "w_frac", "throttle"]
+
+# Off-design point inputs set for each throttle line, as (name in the point, units)
+LINE_INPUTS = {
+    "alt": ("fc.alt", "ft"),
+    "MN": ("fc.MN", None),
+    "dTs": ("fc.dTs", "degR"),
+    "w_frac": ("extract.sub_flow.w_frac", None),
+}
+
+# Point outputs stored in the deck, as (name in the point, units). P3, T3 and FAR are kept for the NOx correlation.
+DECK_VARS = {
+    "Fn": ("perf.Fn", "lbf"),
+    "TSFC": ("perf.TSFC", "lbm/(h*lbf)"),
+    "Wfuel": ("burner.Wfuel", "lbm/s"),
+    "W": ("balance.W", "lbm/s"),
+    "W_water_extract": ("extract.W_water", "lbm/s"),
+    "W_water_inject": ("inject.mix:W", "lbm/s"),
+    "P3": ("bld3.Fl_O:tot:P", "lbf/inch**2"),
+    "T3": ("bld3.Fl_O:tot:T", "degK"),
+    "FAR": ("balance.FAR", None),
+    "WAR": ("fc.WAR", None),
+}
+
+# Throttle line reference thrust is fit through the thrust of these sized points
+LAPSE_POINTS = ["SLS", "RTO", "TOC"]
+
+
+def atmos_war(alt):
+    """
+    Water-air ratio of the atmosphere, linear in altitude from SLS_WAR at sea level to ALT_WAR at 35000 ft.
+    """
+    return np.interp(alt, [0.0, 35000.0], [SLS_WAR, ALT_WAR])
+
+
+def clone_point(prob, point):
+    """
+    Everything needed to run off-design point `point` of a converged, sized MPN3 problem on its own: the values of
+    the point inputs driven from outside the point (design map scalars, areas, cooling fractions, and the
+    operating conditions), the connections MPN3 makes between variables of the point, and the balance states.
+    Names are relative to the point.
+    """
+    model = prob.model
+    od = next(s for s in model.system_iter(recurse=True, typ=N3) if s.name == point)
+    path = od.pathname
+    n = len(path) + 1
+
+    # connections are made between promoted names, which `get_source` does not return
+    meta = od.get_io_metadata(iotypes=("input", "output"), metadata_keys=[], return_rel_names=False)
+    prom = {name: m["prom_name"] for name, m in meta.items()}
+
+    inputs = {}
+    internal = {}
+    for tgt in od.get_io_metadata(iotypes="input", metadata_keys=[], return_rel_names=False):
+        src = model.get_source(tgt)
+        if src.startswith(path + "."):
+            internal[prom[tgt]] = prom[src]
+        else:
+            inputs[tgt[n:]] = np.atleast_1d(prob.get_val(tgt)).copy()
+
+    # of the connections within the point, keep those a point set up on its own leaves open, i.e. the ones MPN3 makes
+    bare = point_model(
+        {"inputs": {}, "connections": [], "states": {}},
+        use_h2=od.options["use_h2"],
+        wet_air=od.options["wet_air"],
+        tabular=od.options["tabular"],
+        comm=prob.comm,
+    )
+    connections = [
+        (src, tgt) for tgt, src in internal.items() if not bare.model.get_source("OD." + tgt).startswith("OD.")
+    ]
+
+    states = {name[len(point) :]: val for name, val in get_states(prob, [point + s for s in OD_STATE_VARS]).items()}
+
+    return {"inputs": inputs, "connections": connections, "states": states}
+
+
+def thrust_lapse(prob, points=LAPSE_POINTS):
+    """
+    Coefficients (a, b, c) of the reference thrust Fn = a + b*alt + c*MN fit through the thrust of the sized
+    points. The deck throttle is the fraction of this thrust.
+    """
+    A = np.array(
+        [[1.0, prob.get_val(pt + ".fc.alt", units="ft")[0], prob.get_val(pt + ".fc.MN")[0]] for pt in points]
+    )
+    Fn = np.array([prob.get_val(pt + ".perf.Fn", units="lbf")[0] for pt in points])
+    return np.linalg.lstsq(A, Fn, rcond=None)[0]
+
+
+def point_model(spec, use_h2=False, wet_air=True, tabular=False, comm=None):
+    """
+    Set up a problem with a single off-design N3 named "OD" from the output of `clone_point`.
+    """
+    prob = om.Problem(comm=comm)
+    model = prob.model
+    model.add_subsystem(
+        "OD", N3(design=False, use_h2=use_h2, wet_air=wet_air, tabular=tabular, cooling=False, design_water=False)
+    )
+    for src, tgt in spec["connections"]:
+        model.connect("OD." + src, "OD." + tgt)
+
+    prob.setup()
+    for name, val in spec["inputs"].items():
+        prob.set_val("OD." + name, val)
+    set_states(prob, {"OD" + name: val for name, val in spec["states"].items()})
+    prob.set_solver_print(level=-1)
+
+    return prob
+
+
+class DeckWorker(object):
+    """
+    Runs the throttle lines of the deck on one off-design point problem.
+
+    A line is marched from the highest to the lowest throttle so each point starts from the solution of the previous
+    one. The first point starts from the given states, or from the sized point the deck was cloned from. A point
+    that fails restores the last converged solution of the line before the next one is run, and every line starts
+    from the first converged solution of the worker, so a failure never leaves a diverged solution behind.
+    """
+
+    def __init__(self, spec, throttle, lapse, use_h2=False, wet_air=True, tabular=False):
+        self.throttle = np.sort(np.asarray(throttle, dtype=float))[::-1]
+        self.lapse = lapse
+        self.states0 = {"OD" + name: val for name, val in spec["states"].items()}
+        self.prob = point_model(spec, use_h2=use_h2, wet_air=wet_air, tabular=tabular, comm=worker_comm())
+        self.outputs0 = None
+
+    def _restart(self, params, outputs, states):
+        prob = self.prob
+
+        # the output vector includes the sources of the line inputs, so set those after restoring it
+        if outputs is not None:
+            prob.model.get_nonlinear_vectors()[1].set_val(outputs)
+        for name, (var, units) in LINE_INPUTS.items():
+            prob.set_val("OD." + var, params[name], units=units)
+        prob.set_val("OD.fc.WAR", params.get("WAR", atmos_war(params["alt"])))
+        set_states(prob, states)
+
+    def run(self, params, states):
+        prob = self.prob
+        st = time.time()
+
+        restart = self.states0 if states is None else states
+        restart_outputs = self.outputs0
+        self._restart(params, restart_outputs, restart)
+
+        Fn_ref = self.lapse[0] + self.lapse[1] * params["alt"] + self.lapse[2] * params["MN"]
+        results = {name: np.full(self.throttle.size, np.nan) for name in DECK_VARS}
+        results["converged"] = np.zeros(self.throttle.size, dtype=bool)
+        line_states = None
+
+        for k, thr in enumerate(self.throttle):
+            prob.set_val("OD.balance.rhs:FAR", thr * Fn_ref, units="lbf")
+            if not run_converged(prob, prob.model.OD):
+                # start the next point from the last converged point of the line
+                self._restart(params, restart_outputs, restart)
+                continue
+
+            restart = get_states(prob, ["OD" + s for s in OD_STATE_VARS])
+            restart_outputs = prob.model.get_nonlinear_vectors()[1].asarray(copy=True)
+            if self.outputs0 is None:
+                self.outputs0 = restart_outputs
+            if line_states is None:
+                line_states = restart
+            results["converged"][k] = True
+            for name, (var, units) in DECK_VARS.items():
+                results[name][k] = prob.get_val("OD." + var, units=units)[0]
+
+        # throttle in ascending order, as in the deck
+        results = {name: val[::-1] for name, val in results.items()}
+        results["time"] = time.time() - st
+
+        return line_states is not None, results, line_states
+
+
+def einox(P3, FAR, WAR, P3_SLS, T3_SLS, FAR_SLS, WAR_SLS=SLS_WAR):
+    """
+    NOx emissions index of the deck points from the SLS correlation of components.emissions, evaluated for all
+    points at once; the off-design burner inlet temperature only enters through the SLS reference. P3 in psi,
+    T3_SLS in degK. NaN points are returned as NaN.
+    """
+    shape = np.shape(P3)
+    P3 = np.ravel(P3)
+    ok = ~np.isnan(P3)
+    nn = int(np.sum(ok))
+
+    EI = np.full(P3.size, np.nan)
+    if nn == 0:
+        return EI.reshape(shape)
+
+    prob = om.Problem()
+    prob.model.add_subsystem("EINOx", EINOx(num_nodes=nn), promotes=["*"])
+    prob.setup()
+
+    prob.set_val("P3_OD", P3[ok], units="lbf/inch**2")
+    prob.set_val("FAR_OD", np.ravel(FAR)[ok])
+    prob.set_val("h_OD", np.ravel(WAR)[ok])
+    prob.set_val("P3_SLS", P3_SLS * np.ones(nn), units="lbf/inch**2")
+    prob.set_val("T3_SLS", T3_SLS * np.ones(nn), units="degK")
+    prob.set_val("FAR_SLS", FAR_SLS * np.ones(nn))
+    prob.set_val("h_SLS", WAR_SLS * np.ones(nn))
+    prob.run_model()
+
+    EI[ok] = prob.get_val("EINOx_OD")
+    return EI.reshape(shape)
+
+
+def write_deck(path, axes, data, meta=None):
+    """
+    Write a deck directory: `deck.json` with the axes, variable names and metadata, and one .npy array per variable
+    with a dimension per axis, in DECK_AXES order, so the arrays can be memory mapped.
+    """
+    if os.path.isdir(path) is False:
+        os.makedirs(path)
+
+    for name, val in data.items():
+        np.save(os.path.join(path, name + ".npy"), np.ascontiguousarray(val))
+
+    index = {
+        "axes": [[name, np.asarray(axes[name], dtype=float).tolist()] for name in DECK_AXES],
+        "vars": sorted(data),
+        "meta": meta if meta is not None else {},
+    }
+    with open(os.path.join(path, DECK_FILE), "w") as f:
+        json.dump(index, f, indent=2)
+
+
+def read_deck(path, mmap=True):
+    """
+    Read a deck written by `write_deck`. Returns (dict of axis values, dict of variable arrays, metadata); the
+    arrays are memory mapped read-only unless `mmap` is False.
+    """
+    with open(os.path.join(path, DECK_FILE), "r") as f:
+        index = json.load(f)
+
+    axes = {name: np.array(val) for name, val in index["axes"]}
+    mode = "r" if mmap else None
+    data = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode=mode) for name in index["vars"]}
+
+    return axes, data, index["meta"]
+
+
+def generate_deck(
+    prob,
+    path,
+    axes,
+    template="SLS",
+    use_h2=False,
+    wet_air=True,
+    tabular=False,
+    comm=None,
+    n_procs=1,
+    max_retries=2,
+):
+    """
+    Generate the deck of a converged, sized MPN3 problem and write it to `path`.
+
+    `axes` holds the values of every name in DECK_AXES; throttle is the fraction of the reference thrust of
+    `thrust_lapse`. Off-design point `template` (one that neither sets the cooling flows nor sizes the water
+    system) is cloned and the throttle lines are run in parallel with `run_queue`, over the ranks of `comm` or
+    `n_procs` local processes. Failed lines are retried from their nearest converged line. Returns the deck data
+    on the master, None on the other ranks.
+    """
+    spec = clone_point(prob, template)
+    lapse = thrust_lapse(prob)
+    ref = {
+        "P3_SLS": prob.get_val(template + ".bld3.Fl_O:tot:P", units="lbf/inch**2")[0],
+        "T3_SLS": prob.get_val(template + ".bld3.Fl_O:tot:T", units="degK")[0],
+        "FAR_SLS": prob.get_val(template + ".balance.FAR")[0],
+        "WAR_SLS": prob.get_val(template + ".fc.WAR")[0],
+    }
+
+    axes = {name: np.asarray(axes[name], dtype=float) for name in DECK_AXES}
+    line_axes = DECK_AXES[:-1]
+    shape = tuple(axes[name].size for name in DECK_AXES)
+    n_thr = shape[-1]
+
+    points = []
+    for idx in np.ndindex(*shape[:-1]):
+        points.append((idx, {name: axes[name][i] for name, i in zip(line_axes, idx)}))
+
+    data = {name: np.full(shape, np.nan) for name in DECK_VARS}
+    data["converged"] = np.zeros(shape, dtype=bool)
+
+    def store(idx, params, results):
+        if results is None:
+            print(f"Throttle line {params} failed", flush=True)
+            return
+        for name in data:
+            data[name][idx] = results[name]
+        print(f"Throttle line {params}: {int(np.sum(results['converged']))}/{n_thr} points", flush=True)
+
+    worker_factory = partial(
+        DeckWorker, spec, axes["throttle"], lapse, use_h2=use_h2, wet_air=wet_air, tabular=tabular
+    )
+    sched = run_queue(points, worker_factory, on_result=store, comm=comm, n_procs=n_procs, max_retries=max_retries)
+    if sched is None:
+        return None
+
+    data["EINOx"] = einox(data["P3"], data["FAR"], data["WAR"], **ref)
+
+    meta = {
+        "fuel": "H2" if use_h2 else "JetA",
+        "template": template,
+        "thrust_lapse": list(lapse),
+        "units": {name: units for name, (_, units) in DECK_VARS.items()},
+    }
+    meta.update(ref)
+    write_deck(path, axes, data, meta)
+
+    return data
+
+
+if __name__ == "__main__":
+    from mpi4py import MPI
+
+    from cycle_eval import CycleEvaluator
+    from N3_CLVR_V3 import N3ref_model
+
+    fuel = "JetA"  # "JetA" or "H2"
+    use_h2 = fuel == "H2"
+
+    deck_axes = {
+        "alt": np.linspace(0.0, 40000.0, 9),
+        "MN": np.linspace(0.0001, 0.85, 8),
+        "dTs": np.array([0.0, 27.0]),
+        "w_frac": np.array([0.00001, 0.01, 0.02]),
+        # below ~0.25 the off-design point converges to spurious low-efficiency solutions or fails
+        "throttle": np.linspace(0.25, 1.0, 8),
+    }
+
+    # size the engine on every rank, so each worker can clone the sized off-design point
+    evaluator = CycleEvaluator(partial(N3ref_model, use_h2=use_h2, wet_air=True), fuel=fuel)
+    converged, _, _ = evaluator.run_case({})
+    if not converged:
+        raise RuntimeError("Sizing of the N3 did not converge.")
+
+    generate_deck(
+        evaluator.prob,
+        "../OUTPUT/N3_deck/" + fuel,
+        deck_axes,
+        use_h2=use_h2,
+        comm=MPI.COMM_WORLD,
+        n_procs=int(os.environ.get("DECK_PROCS", 1)),
+    )
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""
+@File    :   file_io.py
+@Time    :   2026/10/17
+@Desc    :   File writing shared by the caches and stores of the studies
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+from contextlib import contextmanager
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+
+
+@contextmanager
+def atomic_write(fname, mode="wb"):
+    """
+    File object to write `fname` with, e.g. `with atomic_write(fname) as f: pkl.dump(data, f)`.
+
+    The data goes to a temporary file next to `fname`, which replaces it only once it is complete, so a concurrent
+    reader or a killed run never sees a partial file. The directory of `fname` is created if needed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(fname)), exist_ok=True)
+
+    tmp = f"{fname}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        os.replace(tmp, fname)
+    finally:
+        if os.path.isfile(tmp):
+            os.remove(tmp)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+@File    :   map_files.py
+@Time    :   2026/10/17
+@Desc    :   Turbomachinery maps stored in a binary file and loaded on first use
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import json
+import os
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from pycycle.maps.map_data import MapData
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+
+MAP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "N3_maps.npz")
+
+
+def _to_json(val):
+    if isinstance(val, np.generic):
+        return val.item()
+    raise TypeError(f"{type(val).__name__} can not be stored in a map file.")
+
+
+def write_map_file(maps, fname=MAP_FILE):
+    """
+    Write MapData objects, given as a dict by name, to a single npz file. The arrays of each map are stored as
+    "<name>/<attribute>" and everything else (defaults, units, the param_data and output_data lists, which refer to
+    the arrays by attribute name) as JSON in "<name>/meta".
+    """
+    arrays = {}
+    for name, map_data in maps.items():
+        attrs = vars(map_data)
+        meta = {"attrs": {}}
+
+        for attr, val in attrs.items():
+            if isinstance(val, np.ndarray):
+                arrays[f"{name}/{attr}"] = val
+            elif attr not in ["param_data", "output_data"]:
+                meta["attrs"][attr] = val
+
+        for key in ["param_data", "output_data"]:
+            entries = []
+            for entry in attrs.get(key, []):
+                entry = dict(entry)
+                entry["values"] = [attr for attr, val in attrs.items() if val is entry["values"]][0]
+                entries.append(entry)
+            meta[key] = entries
+
+        arrays[f"{name}/meta"] = np.array(json.dumps(meta, default=_to_json))
+
+    np.savez_compressed(fname, **arrays)
+
+
+class LazyMapData(MapData):
+    """
+    pyCycle map whose tables are read from the map file on first access of any attribute, so importing the map
+    modules is free and only the maps a model sets up are read.
+    """
+
+    def __init__(self, name, fname=MAP_FILE):
+        self._name = name
+        self._fname = fname
+
+    def __getattr__(self, attr):
+        # only called for attributes that are not set yet
+        if attr.startswith("__") or attr in ["_name", "_fname", "_loaded"] or "_loaded" in self.__dict__:
+            raise AttributeError(attr)
+
+        self._load()
+        return getattr(self, attr)
+
+    def _load(self):
+        name = self._name
+        with np.load(self._fname) as data:
+            meta = json.loads(str(data[f"{name}/meta"]))
+            for key in data.files:
+                if key.startswith(name + "/") and key != f"{name}/meta":
+                    setattr(self, key[len(name) + 1 :], data[key])
+
+        for attr, val in meta["attrs"].items():
+            setattr(self, attr, val)
+
+        for key in ["param_data", "output_data"]:
+            entries = []
+            for entry in meta[key]:
+                entry["values"] = getattr(self, entry["values"])
+                entries.append(entry)
+            setattr(self, key, entries)
+
+        self._loaded = True
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""
+@File    :   mission.py
+@Time    :   2026/10/17
+@Desc    :   Mission fuel burn, water and NOx inventory of the N3 from an engine deck, without running the cycle
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import pickle as pkl
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from engine_deck import atmos_war, einox
+
+# Deck outputs needed along the mission
+MISSION_VARS = ["Fn", "TSFC", "Wfuel", "W_water_extract", "W_water_inject", "P3", "FAR"]
+
+# Flight segments of the default profile: (name, duration in s, alt at the end in ft, MN at the end, thrust per
+# engine at the end in lbf). Each segment is linear in time from the end of the previous one. Descent and approach
+# fly at the lowest throttle of the deck (0.25 of the reference thrust of the sized N3) rather than at flight idle.
+PROFILE_SEGMENTS = [
+    ("takeoff", 60.0, 0.0, 0.25, 22800.0),
+    ("climb", 1500.0, 35000.0, 0.80, 5800.0),
+    ("cruise", 12000.0, 35000.0, 0.80, 5500.0),
+    ("descent", 1500.0, 1500.0, 0.30, 5400.0),
+    ("approach", 300.0, 0.0, 0.20, 6000.0),
+]
+
+
+def flight_profile(segments=PROFILE_SEGMENTS, dt=10.0, start=(0.0, 0.0001, 22800.0)):
+    """
+    Flight profile dict (time in s, alt in ft, MN, Fn in lbf per engine) sampled every `dt` seconds, from segments
+    given as in PROFILE_SEGMENTS, starting at (alt, MN, Fn) = `start`.
+    """
+    t_nodes = [0.0]
+    nodes = [start]
+    for _, duration, alt, MN, Fn in segments:
+        t_nodes.append(t_nodes[-1] + duration)
+        nodes.append((alt, MN, Fn))
+    nodes = np.array(nodes)
+
+    time = np.arange(0.0, t_nodes[-1] + dt / 2, dt)
+    return {
+        "time": time,
+        "alt": np.interp(time, t_nodes, nodes[:, 0]),
+        "MN": np.interp(time, t_nodes, nodes[:, 1]),
+        "Fn": np.interp(time, t_nodes, nodes[:, 2]),
+    }
+
+
+def _cumtrapz(y, t):
+    out = np.zeros_like(y)
+    out[1:] = np.cumsum(0.5 * (y[1:] + y[:-1]) * np.diff(t))
+    return out
+
+
+class MissionIntegrator(object):
+    """
+    Integrates a flight profile on an engine deck interpolant (a DeckInterp from deck_interp.py, or anything with the
+    same call interface over DECK_AXES).
+
+    The thrust of the profile is turned into the deck throttle with the reference thrust of the deck, all time steps
+    are interpolated in one call, and EINOx is evaluated at every step with the correlations of
+    components.emissions from the interpolated burner inlet pressure and fuel-air ratio and the ambient humidity of
+    the profile (default: atmos_war of the altitude). Fuel, extracted and injected water, and NOx mass are
+    integrated with the trapezoidal rule.
+    """
+
+    def __init__(self, interp, dTs=0.0, w_frac=0.00001, n_engines=1):
+        self.interp = interp
+        self.dTs = dTs
+        self.w_frac = w_frac
+        self.n_engines = n_engines
+
+        meta = interp.meta
+        self.lapse = np.asarray(meta["thrust_lapse"])
+        self.ref = {name: meta[name] for name in ["P3_SLS", "T3_SLS", "FAR_SLS", "WAR_SLS"]}
+
+    def throttle(self, profile):
+        Fn_ref = self.lapse[0] + self.lapse[1] * profile["alt"] + self.lapse[2] * profile["MN"]
+        return profile["Fn"] / Fn_ref
+
+    def evaluate(self, profile):
+        """
+        Engine states at every time step of the profile: a dict of arrays of MISSION_VARS plus throttle, WAR and
+        EINOx (g/kg).
+        """
+        n = np.size(profile["time"])
+        x = {
+            "alt": profile["alt"],
+            "MN": profile["MN"],
+            "dTs": profile.get("dTs", self.dTs * np.ones(n)),
+            "w_frac": profile.get("w_frac", self.w_frac * np.ones(n)),
+            "throttle": self.throttle(profile),
+        }
+
+        vals = self.interp(x)
+        states = {name: np.asarray(vals[name]) for name in MISSION_VARS}
+        states["throttle"] = x["throttle"]
+        states["WAR"] = np.asarray(profile.get("WAR", atmos_war(profile["alt"])))
+        states["EINOx"] = einox(states["P3"], states["FAR"], states["WAR"], **self.ref)
+
+        return states
+
+    def integrate(self, profile):
+        """
+        Evaluate and integrate the profile. Returns a dict with the engine states along the profile, the cumulative
+        fuel, water and NOx masses (lbm, all engines) and their mission totals; EINOx_mission is the NOx mass per
+        fuel mass of the whole mission (g/kg).
+        """
+        t = np.asarray(profile["time"], dtype=float)
+        states = self.evaluate(profile)
+        n_eng = self.n_engines
+
+        W_NOx = states["Wfuel"] * states["EINOx"] * 1e-3
+        cumulative = {
+            "fuel": n_eng * _cumtrapz(states["Wfuel"], t),
+            "water_extract": n_eng * _cumtrapz(states["W_water_extract"], t),
+            "water_inject": n_eng * _cumtrapz(states["W_water_inject"], t),
+            "NOx": n_eng * _cumtrapz(W_NOx, t),
+        }
+        totals = {name: val[-1] for name, val in cumulative.items()}
+        totals["EINOx_mission"] = 1e3 * totals["NOx"] / totals["fuel"]
+
+        return {"profile": profile, "states": states, "cumulative": cumulative, "totals": totals}
+
+
+def compare_missions(results, base):
+    """
+    Print the mission totals of each case in `results` (dict of integrate outputs) and their difference from case
+    `base`.
+    """
+    names = ["fuel", "water_extract", "water_inject", "NOx", "EINOx_mission"]
+    print(f"{'':<16s}" + "".join(f"{name:>16s}" for name in names))
+    for case, res in results.items():
+        print(f"{case:<16s}" + "".join(f"{res['totals'][name]:16.4f}" for name in names))
+        if case != base:
+            diff = [
+                100.0 * (res["totals"][name] - results[base]["totals"][name]) / results[base]["totals"][name]
+                for name in names
+            ]
+            print(f"{'  % diff':<16s}" + "".join(f"{d:16.2f}" for d in diff))
+
+
+if __name__ == "__main__":
+    from deck_interp import DeckInterp
+
+    n_engines = 2
+    w_frac = 0.01
+    profile = flight_profile()
+
+    results = {}
+    for fuel in ["JetA", "H2"]:
+        interp = DeckInterp("../OUTPUT/N3_deck/" + fuel, outputs=MISSION_VARS, fill_failed=True)
+        results[fuel] = MissionIntegrator(interp, w_frac=w_frac, n_engines=n_engines).integrate(profile)
+
+    compare_missions(results, "JetA")
+
+    out_dir = "../OUTPUT/N3_mission/"
+    if os.path.isdir(out_dir) is False:
+        os.makedirs(out_dir)
+    with open(out_dir + f"mission_w_frac-{w_frac}.pkl", "wb") as f:
+        pkl.dump(results, f)
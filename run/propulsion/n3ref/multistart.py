@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+"""
+@File    :   multistart.py
+@Time    :   2026/10/17
+@Desc    :   Multi-start optimization of the CLVR studies from Latin hypercube starting points, run in parallel
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import pickle as pkl
+import time
+from functools import partial
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from openmdao.core.analysis_error import AnalysisError
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from cycle_eval import DEFAULT_INPUTS
+from warm_start import WARM_START_FILE, WarmStartDB, get_states, is_converged, od_points, set_states, state_vars
+from work_queue import run_queue, worker_comm
+
+# Inputs of the CLVR optimization models set before every start, as (value, units)
+CLVR_INPUTS = {
+    **DEFAULT_INPUTS,
+    "SLS.fc.MN": (0.001, None),
+    "bal.rhs:TOC_BPR": (1.40, None),
+    "TOC.inject.area": (117.730, "inch**2"),
+    "TOC.extract.area": (1053.492, "inch**2"),
+}
+
+
+def dv_bounds(prob):
+    """
+    Physical (unscaled) bounds of the design variables of a set up problem, as a dict of (lower, upper) arrays.
+    """
+    bounds = {}
+    for name, meta in prob.model.get_design_vars().items():
+        scaler = 1.0 if meta["scaler"] is None else meta["scaler"]
+        adder = 0.0 if meta["adder"] is None else meta["adder"]
+        bounds[name] = tuple(np.atleast_1d(meta[side] / scaler - adder) for side in ["lower", "upper"])
+    return bounds
+
+
+def lhs_starts(bounds, n_starts, seed=0):
+    """
+    Latin hypercube of `n_starts` starting points within `bounds` (as from dv_bounds). Every entry of every design
+    variable is stratified into n_starts equal intervals, each sampled once. Returns a list of dicts of arrays.
+    """
+    rng = np.random.default_rng(seed)
+    sizes = [np.size(lower) for lower, _ in bounds.values()]
+
+    strata = rng.permuted(np.tile(np.arange(n_starts), (sum(sizes), 1)), axis=1).T
+    u = (strata + rng.random(strata.shape)) / n_starts
+
+    starts = []
+    for k in range(n_starts):
+        start, i = {}, 0
+        for (name, (lower, upper)), size in zip(bounds.items(), sizes):
+            start[name] = lower + u[k, i : i + size] * (upper - lower)
+            i += size
+        starts.append(start)
+    return starts
+
+
+class StartWorker(object):
+    """
+    Sets up an optimization problem once per process and runs it from given starting design vectors.
+
+    `model_factory(comm=comm)` returns the problem with its driver, design variables, constraints and objective on
+    the given communicator, e.g. `partial(N3_MDP_Opt_model, output_dir, False, use_h2)` of N3_CLVR_OPT.py (or of
+    N3_CLVR_H2_OPT.py and N3_NOx_Opt.py). Each worker builds its problem on MPI.COMM_SELF, as a problem on
+    COMM_WORLD would wait on the other ranks in setup. Each start restores the initial solution, takes the cycle states of the nearest converged
+    solution in the shared warm-start database (or the states it is given), and adds its own optimum to the database
+    so later starts of every worker begin from it.
+
+    The starting point is given flattened, as a dict of values by (design variable, entry index), so the sweep
+    scheduler of run_queue can measure distances between starts.
+    """
+
+    def __init__(self, model_factory, fuel="JetA", inputs=CLVR_INPUTS, feas_tol=1e-6, warm_start_file=WARM_START_FILE):
+        self.fuel = fuel
+        self.feas_tol = feas_tol
+        self.warm_start_file = warm_start_file
+
+        prob = self.prob = model_factory(comm=worker_comm())
+        prob.setup()
+        for name, (val, units) in inputs.items():
+            try:
+                prob.set_val(name, val, units=units)
+            except KeyError:
+                pass
+
+        prob.set_solver_print(level=-1)
+        prob.final_setup()
+        self.outputs_init = prob.model._outputs.asarray(copy=True)
+
+    def _violation(self):
+        """
+        Largest constraint violation in driver scaling.
+        """
+        driver = self.prob.driver
+        vals = driver.get_constraint_values()
+        viol = 0.0
+        for name, meta in driver._cons.items():
+            val = np.atleast_1d(vals[name])
+            if meta["equals"] is not None:
+                viol = max(viol, np.max(np.abs(val - meta["equals"])))
+                continue
+            if meta["lower"] is not None:
+                viol = max(viol, np.max(meta["lower"] - val))
+            if meta["upper"] is not None:
+                viol = max(viol, np.max(val - meta["upper"]))
+        return float(viol)
+
+    def run(self, params, states=None):
+        prob = self.prob
+        driver = prob.driver
+
+        start = {}
+        for (name, i), val in sorted(params.items()):
+            start.setdefault(name, []).append(val)
+
+        # the output vector includes the sources of the design variables, so set those after restoring it
+        prob.model._outputs.set_val(self.outputs_init)
+        for name, val in start.items():
+            prob.set_val(name, np.array(val))
+
+        warm_db = WarmStartDB(self.warm_start_file)
+        if states is None:
+            warm_db.warm_start(prob, self.fuel)
+        else:
+            set_states(prob, states)
+
+        st = time.time()
+        try:
+            fail = prob.run_driver()
+        except AnalysisError:
+            fail = True
+
+        converged = is_converged(prob)
+        results = {
+            "start": {name: np.array(val) for name, val in start.items()},
+            "dvs": {name: val.copy() for name, val in driver.get_design_var_values(driver_scaling=False).items()},
+            "objective": float(list(driver.get_objective_values(driver_scaling=False).values())[0][0]),
+            "violation": self._violation(),
+            "fail": bool(fail),
+            "n_iter": driver.iter_count,
+            "time": time.time() - st,
+        }
+        results["feasible"] = converged and results["violation"] <= self.feas_tol
+
+        if not converged:
+            return False, results, None
+
+        # share the optimum with the other workers
+        warm_db.add(prob, self.fuel)
+        warm_db.save()
+
+        return True, results, get_states(prob, state_vars(od_points(prob)))
+
+
+def multi_start(model_factory, n_starts, fuel="JetA", inputs=CLVR_INPUTS, seed=0, comm=None, n_procs=1, **kwargs):
+    """
+    Optimize from `n_starts` Latin hypercube starting points within the declared design variable bounds, over the
+    ranks of `comm` (rank 0 is the master) or a pool of `n_procs` processes, each with its own problem. A start whose
+    cycle fails to converge is retried from the optimum of its nearest converged start. Returns the list of results
+    of all starts (None for starts that failed every retry) on the master, None on the workers. Other keyword
+    arguments are passed to StartWorker.
+    """
+    prob = model_factory(comm=worker_comm())
+    prob.setup()
+    starts = lhs_starts(dv_bounds(prob), n_starts, seed)
+    del prob
+
+    # the scheduler measures distances on scalars, so the starts are keyed by flattened entry
+    points = []
+    for k, start in enumerate(starts):
+        params = {}
+        for name, val in start.items():
+            for i, v in enumerate(np.atleast_1d(val)):
+                params[(name, i)] = v
+        points.append((k, params))
+
+    results = [None] * n_starts
+
+    def on_result(k, params, res):
+        results[k] = res
+        if res is not None:
+            print(f"start {k}: objective {res['objective']:.6g}, feasible {res['feasible']}", flush=True)
+
+    worker_factory = partial(StartWorker, model_factory, fuel, inputs, **kwargs)
+    sched = run_queue(points, worker_factory, on_result, comm=comm, n_procs=n_procs)
+    if sched is None:
+        return None
+
+    return results
+
+
+def summarize(results, file=None):
+    """
+    Print the best feasible design and the spread of the optima over the starts. Returns the best results, or None
+    if no start is feasible.
+    """
+    done = [res for res in results if res is not None]
+    feasible = [res for res in done if res["feasible"]]
+
+    print(f"{len(results)} starts, {len(done)} converged, {len(feasible)} feasible", file=file)
+    if not feasible:
+        return None
+
+    obj = np.array([res["objective"] for res in feasible])
+    best = feasible[int(np.argmin(obj))]
+
+    print(
+        f"objective: best {obj.min():.6g}, worst {obj.max():.6g}, mean {obj.mean():.6g}, std {obj.std():.3g}", file=file
+    )
+    print(f"{'design variable':<36s}{'best':>14s}{'min':>14s}{'max':>14s}", file=file)
+    for name, val in best["dvs"].items():
+        vals = np.array([np.atleast_1d(res["dvs"][name]) for res in feasible])
+        for i in range(vals.shape[1]):
+            label = name if vals.shape[1] == 1 else f"{name}[{i}]"
+            print(
+                f"{label:<36s}{np.atleast_1d(val)[i]:14.6g}{vals[:, i].min():14.6g}{vals[:, i].max():14.6g}", file=file
+            )
+
+    return best
+
+
+if __name__ == "__main__":
+    from N3_CLVR_OPT import N3_MDP_Opt_model
+
+    use_h2 = True
+    n_starts = 16
+    fuel = "H2" if use_h2 else "JetA"
+
+    try:
+        from mpi4py import MPI
+
+        comm = MPI.COMM_WORLD
+    except ImportError:
+        comm = None
+    n_procs = int(os.environ.get("MULTISTART_PROCS", 1))
+
+    output_dir = f"../OUTPUT/N3_opt/CLVR/multistart/N3_{fuel}"
+    model_factory = partial(N3_MDP_Opt_model, output_dir, False, use_h2)
+
+    st = time.time()
+    results = multi_start(model_factory, n_starts, fuel=fuel, comm=comm, n_procs=n_procs)
+
+    if results is not None:
+        if os.path.isdir(output_dir) is False:
+            os.makedirs(output_dir)
+        with open(os.path.join(output_dir, "multistart.pkl"), "wb") as f:
+            pkl.dump(results, f)
+        with open(os.path.join(output_dir, "multistart.txt"), "w") as file:
+            summarize(results, file)
+        summarize(results)
+        print("time", time.time() - st)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+"""
+@File    :   opt_cache.py
+@Time    :   2026/10/17
+@Desc    :   Memo cache and checkpoints of the function and gradient evaluations of the pyOptSparse driver
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import copy
+import hashlib
+import os
+import pickle as pkl
+import shutil
+import warnings
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from file_io import atomic_write
+from warm_start import get_states, is_converged, od_points, set_states, state_vars
+
+
+class EvalCache(object):
+    """
+    Function values, total derivatives and converged cycle states by scaled design vector.
+
+    A design vector matches a record if no entry differs by more than `tol`. The `signature` (design variable and
+    response names of the study) is stored with the records, and a file written for another study is rejected. The
+    `inputs` key (e.g. a hash of the values of all other model inputs) is stored as well; the records of a file
+    written for other inputs are stale and are discarded with a warning. With a file name, the cache is read on
+    creation and every new evaluation is appended to the file, unless `readonly`.
+
+    The file is a stream of pickles: a header with the signature and inputs, then one (record index, fields) entry
+    per evaluation, where an index past the last record starts a new one. An entry cut short by a killed run is
+    dropped when the file is read.
+    """
+
+    def __init__(self, fname=None, tol=1e-10, signature=None, inputs=None, readonly=False):
+        self.fname = fname
+        self.tol = tol
+        self.signature = signature
+        self.inputs = inputs
+        self.readonly = readonly
+        self.records = []
+
+        if fname is None:
+            return
+
+        header = {"signature": signature, "inputs": inputs}
+        if os.path.isfile(fname):
+            records = self._read(fname)
+            if records is not None:
+                self.records = records
+                return
+
+        if not readonly:
+            with atomic_write(fname) as f:
+                pkl.dump(header, f)
+
+    def _read(self, fname):
+        """
+        Records of the file, or None if they are stale.
+        """
+        records = []
+        with open(fname, "rb") as f:
+            header = pkl.load(f)
+            if header["signature"] != self.signature:
+                raise ValueError(f"{fname} was written for a different set of design variables or responses.")
+            if header["inputs"] != self.inputs:
+                warnings.warn(f"{fname} was written for different model inputs, its records are discarded.")
+                return None
+
+            # files written in one piece keep their records in the header
+            records.extend(header.get("records", []))
+            end = f.tell()
+            while True:
+                try:
+                    i, fields = pkl.load(f)
+                except (EOFError, pkl.UnpicklingError):
+                    break
+                if i == len(records):
+                    records.append({})
+                records[i].update(fields)
+                end = f.tell()
+
+        # drop a partial last entry, so new entries are appended after the last complete one
+        if end < os.path.getsize(fname) and not self.readonly:
+            os.truncate(fname, end)
+
+        return records
+
+    def __len__(self):
+        return len(self.records)
+
+    def _nearest(self, x):
+        if not self.records:
+            return None, np.inf
+
+        dist = [np.max(np.abs(r["x"] - x)) if r["x"].shape == x.shape else np.inf for r in self.records]
+        i = int(np.argmin(dist))
+        return i, dist[i]
+
+    def nearest(self, x):
+        """
+        Closest record to `x` and its distance (max norm), or (None, inf) for an empty cache.
+        """
+        i, dist = self._nearest(x)
+        return (None if i is None else self.records[i]), dist
+
+    def lookup(self, x):
+        """
+        Record matching `x`, or None.
+        """
+        rec, dist = self.nearest(x)
+        return rec if dist <= self.tol else None
+
+    def add(self, x, **fields):
+        """
+        Store `fields` (e.g. funcs, fail, sens, states) for `x`, in the matching record if there is one.
+        """
+        fields = copy.deepcopy(fields)
+
+        i, dist = self._nearest(x)
+        if dist > self.tol:
+            fields["x"] = np.array(x, dtype=float)
+            i = len(self.records)
+            self.records.append({})
+        self.records[i].update(fields)
+
+        if self.fname is not None and not self.readonly:
+            with open(self.fname, "ab") as f:
+                pkl.dump((i, fields), f)
+
+
+class CachedPyOptSparseDriver(om.pyOptSparseDriver):
+    """
+    pyOptSparseDriver that serves repeated design vectors from an EvalCache instead of re-solving the cycle.
+
+    Objective and constraint values and total derivatives are cached by scaled design vector, for the values the
+    other model inputs (everything set through independent variables that is not a design variable) have when the
+    driver is run. A new point is solved
+    from the converged states of the nearest cached point when that is closer than the point the model holds, so a
+    re-run of the same study (with `cache_file`) replays the stored evaluations and then continues from a converged
+    cycle.
+
+    With `checkpoint_file`, the design vector and the full nonlinear state of the model (all outputs of all points)
+    are written at every gradient evaluation, i.e. at each major iteration of SNOPT. A run with `resume` restarts
+    from the checkpoint: the model is set to the checkpointed state, and SNOPT is hot started from a copy of the
+    history file (`hist_file`) of the killed run, so the iterations already done are replayed without solving the
+    cycle.
+
+    pyOptSparseDriver hands its _objfunc and _gradfunc methods to pyOptSparse as the function and gradient
+    callbacks, so the cache wraps those; everything else goes through the public Driver and System interfaces.
+    """
+
+    def _declare_options(self):
+        super()._declare_options()
+
+        self.options.declare("cache_file", default=None, allow_none=True, desc="File the evaluation cache is kept in")
+        self.options.declare("cache_tol", default=1e-10, desc="Max difference of matching scaled design vectors")
+        self.options.declare(
+            "state_vars",
+            default=None,
+            allow_none=True,
+            desc="Cycle states stored with each evaluation, by default the balance states of the model",
+        )
+        self.options.declare(
+            "checkpoint_file", default=None, allow_none=True, desc="File the state of each major iteration is kept in"
+        )
+        self.options.declare("resume", default=False, types=bool, desc="Restart from the checkpoint and history files")
+
+    def run(self):
+        prob = self._problem()
+        self._dv_names = list(self.get_design_var_values())
+        signature = (self._dv_names, list(self.get_objective_values()) + list(self.get_constraint_values()))
+
+        # every rank keeps the cache, one writes the file
+        self.cache = EvalCache(
+            self.options["cache_file"],
+            self.options["cache_tol"],
+            signature,
+            self._input_hash(),
+            readonly=prob.comm.rank != 0,
+        )
+        self.cache_hits = 0
+        self._x_model = None
+        self.n_major = 0
+
+        if self.options["resume"] is True:
+            self._resume()
+
+        return super().run()
+
+    def _input_hash(self):
+        """
+        Hash of the values of all independent variables of the model other than the design variables, e.g. thrust
+        targets, temperatures and humidities.
+        """
+        prob = self._problem()
+        dv_srcs = {meta["source"] for meta in prob.model.get_design_vars().values()}
+
+        sha = hashlib.sha1()
+        for ivc in prob.model.system_iter(recurse=True, typ=om.IndepVarComp):
+            for name in ivc.get_io_metadata(iotypes="output", metadata_keys=[], return_rel_names=False):
+                if name not in dv_srcs:
+                    sha.update(name.encode())
+                    sha.update(np.ascontiguousarray(prob.get_val(name), dtype=float).tobytes())
+        return sha.hexdigest()
+
+    def _output_names(self):
+        return list(self._problem().model.get_io_metadata(iotypes="output", metadata_keys=[], get_remote=True))
+
+    def _checkpoint(self, x, dv_dict):
+        fname = self.options["checkpoint_file"]
+        if fname is None:
+            return
+
+        self.n_major += 1
+        data = {
+            "n_major": self.n_major,
+            "x": x,
+            "dvs": {name: np.array(val) for name, val in dv_dict.items()},
+            "names": self._output_names(),
+            "outputs": self._problem().model.get_nonlinear_vectors()[1].asarray(copy=True),
+        }
+
+        with atomic_write(fname) as f:
+            pkl.dump(data, f)
+
+    def _resume(self):
+        """
+        Set the model to the checkpointed state and hot start from the history of the previous run, if there are any.
+        """
+        fname = self.options["checkpoint_file"]
+        if fname is not None and os.path.isfile(fname):
+            with open(fname, "rb") as f:
+                data = pkl.load(f)
+
+            if data["names"] != self._output_names():
+                raise ValueError(f"{fname} was written for a different model.")
+
+            self._problem().model.get_nonlinear_vectors()[1].set_val(data["outputs"])
+            self._x_model = data["x"]
+            self.n_major = data["n_major"]
+
+        # pyOptSparse writes the new history from the start, so the old one is replayed from a copy
+        if self.hist_file is not None and os.path.isfile(self.hist_file):
+            hot_file = self.hist_file + ".hot"
+            shutil.copyfile(self.hist_file, hot_file)
+            self.hotstart_file = hot_file
+
+    def _dv_vector(self, dv_dict):
+        return np.concatenate([np.atleast_1d(dv_dict[name]).ravel() for name in self._dv_names]).astype(float)
+
+    def _warm_start(self, x):
+        """
+        Set the states of the cached point nearest to `x` if it is closer than the point the model was solved at.
+        """
+        rec, dist = self.cache.nearest(x)
+        if rec is None or rec.get("states") is None:
+            return
+        if self._x_model is None or dist < np.max(np.abs(self._x_model - x)):
+            set_states(self._problem(), rec["states"])
+
+    def _objfunc(self, dv_dict):
+        x = self._dv_vector(dv_dict)
+
+        rec = self.cache.lookup(x)
+        if rec is not None and "funcs" in rec:
+            self.cache_hits += 1
+            return copy.deepcopy(rec["funcs"]), rec["fail"]
+
+        self._warm_start(x)
+        func_dict, fail = super()._objfunc(dv_dict)
+        self._x_model = x
+
+        # keep neither user terminations nor unexpected exceptions, for which pyOptSparseDriver returns no values
+        if fail < 2 and func_dict:
+            prob = self._problem()
+            names = self.options["state_vars"]
+            if names is None:
+                names = state_vars(od_points(prob))
+            states = get_states(prob, names) if is_converged(prob) else None
+            self.cache.add(x, funcs=func_dict, fail=fail, states=states)
+
+        return func_dict, fail
+
+    def _failed_sens(self, dv_dict, func_dict):
+        """
+        Zero derivatives of the right sizes, as pyOptSparseDriver returns for a failed gradient evaluation.
+        """
+        sens_dict = {}
+        for okey, oval in func_dict.items():
+            sens_dict[okey] = {ikey: np.zeros((len(oval), len(ival))) for ikey, ival in dv_dict.items()}
+        return sens_dict
+
+    def _gradfunc(self, dv_dict, func_dict):
+        x = self._dv_vector(dv_dict)
+
+        rec = self.cache.lookup(x)
+        if rec is not None and "sens" in rec:
+            self.cache_hits += 1
+            return copy.deepcopy(rec["sens"]), 0
+
+        # the function values may have been served from the cache, so the model can be at another point
+        if self._x_model is None or np.max(np.abs(self._x_model - x)) > self.cache.tol:
+            for name in self._dv_names:
+                self.set_design_var(name, dv_dict[name])
+            self._warm_start(x)
+            try:
+                self._problem().model.run_solve_nonlinear()
+            except om.AnalysisError:
+                # derivatives of a failed cycle are meaningless, so let the optimizer back off like for the functions;
+                # the next point is then warm started from the cache again
+                self._x_model = None
+                return self._failed_sens(dv_dict, func_dict), 1
+            self._x_model = x
+
+        sens_dict, fail = super()._gradfunc(dv_dict, func_dict)
+
+        # pyOptSparseDriver returns zero or no derivatives with a failure
+        if fail == 0:
+            self.cache.add(x, sens=sens_dict)
+            self._checkpoint(x, dv_dict)
+
+        return sens_dict, fail
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""
+@File    :   pareto.py
+@Time    :   2026/10/17
+@Desc    :   Epsilon-constraint Pareto fronts of the CLVR optimizations (fuel burn vs NOx or water), run in parallel
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import pickle as pkl
+import time
+from functools import partial
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from openmdao.core.analysis_error import AnalysisError
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from multistart import CLVR_INPUTS, StartWorker
+from warm_start import WarmStartDB, is_converged, set_states
+from work_queue import run_queue
+
+# Results recorded at every optimum of the front. Names missing from a model are recorded as NaN.
+FRONT_VARS = (
+    ["CRZ.perf.TSFC", "CRZ.burner.Wfuel", "CRZ.tsec_perf.TSEC"]
+    + [f"{pt}_EINOx.EINOx_OD" for pt in ["TOC", "RTO", "CRZ"]]
+    + [f"{pt}.extract.W_water" for pt in ["TOC", "RTO", "SLS", "CRZ"]]
+)
+
+
+def bounded_model(model_factory, con_name, upper, ref=None, comm=None):
+    """
+    Problem of `model_factory(comm=comm)` with the epsilon constraint `con_name` <= `upper` added.
+    """
+    prob = model_factory(comm=comm)
+    prob.model.add_constraint(con_name, upper=upper, ref=ref)
+    return prob
+
+
+class FrontWorker(StartWorker):
+    """
+    Solves chains of epsilon-constraint sub-problems on a problem set up once per process.
+
+    A chain is a run of neighbouring bounds, from the loosest to the tightest. Its first sub-problem starts from the
+    initial design (and the nearest solution in the warm-start database, or the states it is given); every following
+    one starts from the optimum and converged cycle of the previous bound. A sub-problem whose cycle fails is
+    reported and the chain continues from the last converged optimum.
+    """
+
+    def __init__(self, model_factory, con_name, chains, fuel="JetA", inputs=CLVR_INPUTS, outputs=FRONT_VARS, **kwargs):
+        super().__init__(model_factory, fuel, inputs, **kwargs)
+        self.con_name = con_name
+        self.chains = chains
+        self.outputs = list(outputs)
+
+    def _get(self, name):
+        try:
+            return np.atleast_1d(self.prob.get_val(name))[0]
+        except KeyError:
+            return np.nan
+
+    def _set_bound(self, bound):
+        # the scaling of the constraint is kept; final_setup passes the new bound on to the driver
+        self.prob.model.set_constraint_options(self.con_name, upper=bound)
+        self.prob.final_setup()
+
+    def run(self, params, states=None):
+        prob = self.prob
+        driver = prob.driver
+
+        prob.model._outputs.set_val(self.outputs_init)
+        if states is None:
+            WarmStartDB(self.warm_start_file).warm_start(prob, self.fuel)
+        else:
+            set_states(prob, states)
+        outputs_last = prob.model._outputs.asarray(copy=True)
+
+        front = []
+        for bound in self.chains[int(params["chain"])]:
+            self._set_bound(bound)
+
+            st = time.time()
+            try:
+                fail = prob.run_driver()
+            except AnalysisError:
+                fail = True
+            converged = is_converged(prob)
+
+            res = {
+                "bound": bound,
+                "dvs": {name: val.copy() for name, val in driver.get_design_var_values(driver_scaling=False).items()},
+                "objective": float(list(driver.get_objective_values(driver_scaling=False).values())[0][0]),
+                "violation": self._violation(),
+                "fail": bool(fail),
+                "converged": converged,
+                "n_iter": driver.iter_count,
+                "time": time.time() - st,
+            }
+            res["feasible"] = converged and res["violation"] <= self.feas_tol
+            res.update({name: self._get(name) for name in self.outputs})
+            front.append(res)
+
+            # the next bound starts from this optimum, or from the last converged one
+            if converged:
+                outputs_last = prob.model._outputs.asarray(copy=True)
+            else:
+                prob.model._outputs.set_val(outputs_last)
+
+        return True, front, None
+
+
+def pareto_front(model_factory, con_name, bounds, ref=None, n_chains=None, fuel="JetA", comm=None, n_procs=1, **kwargs):
+    """
+    Pareto front of the objective of the problem of `model_factory` against `con_name` by the epsilon-constraint
+    method: one optimization with `con_name` <= bound for every entry of `bounds`. As in multi_start, each worker
+    builds its own problem with `model_factory(comm=MPI.COMM_SELF)`.
+
+    The bounds are sorted from the loosest to the tightest and split into `n_chains` contiguous chains (default: one
+    per worker), solved in parallel over the ranks of `comm` or a pool of `n_procs` processes. Within a chain each
+    sub-problem is warm started from its neighbour's optimum. Returns the results of all sub-problems sorted by
+    bound on the master, None on the workers. Other keyword arguments are passed to FrontWorker.
+    """
+    if n_chains is None:
+        n_chains = comm.size - 1 if comm is not None and comm.size > 1 else n_procs
+
+    bounds = np.sort(np.asarray(bounds, dtype=float))[::-1]
+    chains = [list(chain) for chain in np.array_split(bounds, n_chains) if len(chain) > 0]
+
+    front = []
+
+    def on_result(k, params, res):
+        if res is not None:
+            front.extend(res)
+            print(f"chain {k}: {len(res)} bounds, {sum(r['feasible'] for r in res)} feasible", flush=True)
+
+    factory = partial(bounded_model, model_factory, con_name, bounds[0], ref)
+    worker_factory = partial(FrontWorker, factory, con_name, chains, fuel, **kwargs)
+    points = [(k, {"chain": float(k)}) for k in range(len(chains))]
+
+    sched = run_queue(points, worker_factory, on_result, comm=comm, n_procs=n_procs)
+    if sched is None:
+        return None
+
+    return sorted(front, key=lambda res: res["bound"], reverse=True)
+
+
+def nondominated(front, names=("objective", "bound")):
+    """
+    Feasible results of a front that no other feasible result improves in all of `names` (all minimized).
+    """
+    feasible = [res for res in front if res["feasible"]]
+    vals = np.array([[res[name] for name in names] for res in feasible], dtype=float).reshape(len(feasible), len(names))
+
+    keep = []
+    for i, val in enumerate(vals):
+        dominated = np.any(np.all(vals <= val, axis=1) & np.any(vals < val, axis=1))
+        if not dominated:
+            keep.append(feasible[i])
+    return keep
+
+
+def print_front(front, con_name, outputs=FRONT_VARS, file=None):
+    names = ["bound", "objective"] + [name for name in outputs if name != con_name]
+    print(f"epsilon constraint: {con_name}", file=file)
+    print("".join(f"{name:>22s}" for name in names + ["feasible"]), file=file)
+    for res in front:
+        print("".join(f"{res[name]:22.6g}" for name in names) + f"{str(res['feasible']):>22s}", file=file)
+
+
+if __name__ == "__main__":
+    from N3_CLVR_OPT import N3_MDP_Opt_model
+    from N3_CLVR_V3 import ALT_WAR, SLS_WAR, einox_model
+
+    use_h2 = True
+    fuel = "H2" if use_h2 else "JetA"
+
+    # Cruise EINOx bound from unconstrained to tight; for a water usage front use e.g. "CRZ.extract.W_water"
+    con_name = "CRZ_EINOx.EINOx_OD"
+    bounds = np.linspace(18.0, 6.0, 20)
+    ref = 18.0
+
+    try:
+        from mpi4py import MPI
+
+        comm = MPI.COMM_WORLD
+    except ImportError:
+        comm = None
+    n_procs = int(os.environ.get("PARETO_PROCS", 1))
+
+    output_dir = f"../OUTPUT/N3_opt/CLVR/pareto/N3_{fuel}"
+    model_factory = partial(N3_MDP_Opt_model, output_dir, False, use_h2)
+    if con_name.endswith("EINOx_OD"):
+        # the CLVR model has no EINOx correlations of its own
+        model_factory = partial(einox_model, model_factory, ALT_WAR, SLS_WAR)
+
+    st = time.time()
+    front = pareto_front(model_factory, con_name, bounds, ref=ref, fuel=fuel, comm=comm, n_procs=n_procs)
+
+    if front is not None:
+        if os.path.isdir(output_dir) is False:
+            os.makedirs(output_dir)
+        with open(os.path.join(output_dir, f"front_{con_name}.pkl"), "wb") as f:
+            pkl.dump(front, f)
+        with open(os.path.join(output_dir, f"front_{con_name}.txt"), "w") as file:
+            print_front(front, con_name, file=file)
+        print_front(nondominated(front), con_name)
+        print("time", time.time() - st)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+@File    :   result_store.py
+@Time    :   2026/10/17
+@Desc    :   Columnar store for sweep results, appended to binary shards and read back memory-mapped
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import glob
+import json
+import os
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from file_io import atomic_write
+
+# Status values of a stored point
+CONVERGED = 1
+FAILED = 0
+
+
+class ResultStore(object):
+    """
+    Sweep results stored as rows of named float columns in the directory `path`.
+
+    The column names are written to `columns.json` when the store is created. Every writer appends whole rows to
+    its own shard file (`shard-<name>.bin`, raw little endian float64 records), so MPI ranks or processes can append
+    concurrently without locking. Readers memory-map the shards; a row cut short by an interrupted write is ignored.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        meta = os.path.join(path, "columns.json")
+
+        if os.path.isfile(meta):
+            with open(meta, "r") as f:
+                stored = json.load(f)
+            if columns is not None and list(columns) != stored:
+                raise ValueError(f"{path} was written with different columns.")
+            columns = stored
+
+        elif columns is None:
+            raise ValueError(f"{path} is not a result store and no columns were given.")
+
+        else:
+            # a concurrent writer never reads a partial file
+            with atomic_write(meta, "w") as f:
+                json.dump(list(columns), f)
+
+        self.columns = list(columns)
+        self.dtype = np.dtype([(name, "<f8") for name in self.columns])
+        self._files = {}
+
+    def append(self, rows, writer=None):
+        """
+        Append one row (a dict of column values) or a list of rows to the shard of `writer` (default: this process).
+        Columns missing from a row are stored as NaN.
+        """
+        if isinstance(rows, dict):
+            rows = [rows]
+        if writer is None:
+            writer = str(os.getpid())
+
+        data = np.full(len(rows), np.nan, dtype=self.dtype)
+        for k, row in enumerate(rows):
+            for name, val in row.items():
+                data[name][k] = np.asarray(val, dtype=float).item()
+
+        f = self._files.get(writer)
+        if f is None:
+            f = self._files[writer] = open(os.path.join(self.path, f"shard-{writer}.bin"), "ab")
+        f.write(data.tobytes())
+        f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def shards(self):
+        """
+        Read-only memory maps of the rows of each shard.
+        """
+        maps = []
+        for fname in sorted(glob.glob(os.path.join(self.path, "shard-*.bin"))):
+            n_rows = os.path.getsize(fname) // self.dtype.itemsize
+            if n_rows > 0:
+                maps.append(np.memmap(fname, dtype=self.dtype, mode="r", shape=(n_rows,)))
+        return maps
+
+    def read(self, columns=None):
+        """
+        Dict of column arrays over all shards. A store with a single shard is returned without copying.
+        """
+        maps = self.shards()
+        if len(maps) == 0:
+            data = np.zeros(0, dtype=self.dtype)
+        elif len(maps) == 1:
+            data = maps[0]
+        else:
+            data = np.concatenate(maps)
+
+        if columns is None:
+            columns = self.columns
+        return {name: data[name] for name in columns}
+
+    def latest(self, key_columns):
+        """
+        Like read(), but keeping only the last row written for each combination of the `key_columns` values (e.g.
+        the grid indices of a sweep that was restarted).
+        """
+        data = self.read()
+        if len(data[self.columns[0]]) == 0:
+            return data
+
+        keys = np.stack([data[name] for name in key_columns], axis=1)
+        # last occurrence of each key: unique on the reversed rows
+        _, idx = np.unique(keys[::-1], axis=0, return_index=True)
+        idx = np.sort(len(keys) - 1 - idx)
+
+        return {name: np.asarray(data[name])[idx] for name in self.columns}
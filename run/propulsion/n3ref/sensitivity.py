@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""
+@File    :   sensitivity.py
+@Time    :   2026/10/17
+@Desc    :   Adjoint sensitivities of the MPN3 performance to the cycle parameters at a converged solution
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import pickle as pkl
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+
+# Performance measures differentiated. Names missing from a model are skipped.
+SENS_OF = [
+    "TOC.perf.TSFC",
+    "CRZ.perf.TSFC",
+    "TOC.tsec_perf.TSEC",
+    "CRZ.tsec_perf.TSEC",
+    "TOC_EINOx.EINOx_OD",
+    "CRZ_EINOx.EINOx_OD",
+    "TOC.perf.Fn",
+    "CRZ.perf.Fn",
+    "TOC.fan_dia.FanDia",
+]
+
+# Cycle parameters, with the ranges of the bound sweeps used for the trend lines
+SENS_WRT = {
+    "TOC.balance.rhs:hpc_PR": (40.0, 65.0),
+    "fan:PRdes": (1.2, 1.4),
+    "lpc:PRdes": (2.5, 4.0),
+    "T4_ratio.TR": (0.8, 0.95),
+    "RTO_T4": (3000.0, 3600.0),
+    "TOC.extract.sub_flow.w_frac": (0.0, 0.10),
+    "CRZ.extract.sub_flow.w_frac": (0.0, 0.15),
+    "RTO.extract.sub_flow.w_frac": (0.0, 0.06),
+    "SLS.extract.sub_flow.w_frac": (0.0, 0.06),
+}
+
+
+def _present(prob, names):
+    present = []
+    for name in names:
+        try:
+            prob.get_val(name)
+        except KeyError:
+            continue
+        present.append(name)
+    return present
+
+
+def sensitivities(prob, of=SENS_OF, wrt=SENS_WRT):
+    """
+    Total derivatives of `of` with respect to `wrt` at the current (converged) solution of a run problem, computed
+    in one linear solve per output when the problem is set up in "rev" mode.
+
+    Returns a dict with the names, the values at the solution (f0, x0), the derivatives (dfdx[i, j] = d of[i] /
+    d wrt[j]) and two normalized sensitivities:
+
+    - S_range[i, j] = (upper - lower) * dfdx[i, j] / f0[i], the first-order relative change of the output over the
+      range of the parameter in `wrt`. It stays defined at x0 = 0 (e.g. no water extraction), so it is the one to
+      rank the parameters by.
+    - S[i, j] = d ln of[i] / d ln wrt[j], the % change of the output per % change of the parameter; NaN where the
+      parameter or output is zero.
+    """
+    ranges = wrt
+    of = _present(prob, of)
+    wrt = _present(prob, list(wrt))
+
+    totals = prob.compute_totals(of=of, wrt=wrt, return_format="dict")
+
+    f0 = np.array([np.atleast_1d(prob.get_val(name))[0] for name in of])
+    x0 = np.array([np.atleast_1d(prob.get_val(name))[0] for name in wrt])
+    dfdx = np.array([[np.atleast_2d(totals[f][x])[0, 0] for x in wrt] for f in of])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        S = dfdx * x0[np.newaxis, :] / f0[:, np.newaxis]
+        S_range = dfdx * np.array([ranges[x][1] - ranges[x][0] for x in wrt])[np.newaxis, :] / f0[:, np.newaxis]
+    S[:, x0 == 0.0] = np.nan
+
+    return {"of": of, "wrt": wrt, "f0": f0, "x0": x0, "dfdx": dfdx, "S": S, "S_range": S_range}
+
+
+def trend_lines(sens, ranges=SENS_WRT, n=11):
+    """
+    First-order extrapolation of every output over the range of every parameter, the others held at the solution:
+    a dict by parameter of dicts with the parameter values ("x") and the linear trend of each output.
+    """
+    trends = {}
+    for j, name in enumerate(sens["wrt"]):
+        lower, upper = ranges[name]
+        x = np.linspace(lower, upper, n)
+        trend = {"x": x}
+        for i, f in enumerate(sens["of"]):
+            trend[f] = sens["f0"][i] + sens["dfdx"][i, j] * (x - sens["x0"][j])
+        trends[name] = trend
+    return trends
+
+
+def print_sensitivities(sens, file=None):
+    """
+    Normalized sensitivity tables, one row per parameter and one column per output: the relative change of the
+    output over the parameter range, then the logarithmic derivatives.
+    """
+    width = max(len(name) for name in sens["wrt"]) + 2
+    tables = [
+        ("Relative change over the parameter range (upper - lower) * d ln(output) / d(parameter)", "S_range"),
+        ("Logarithmic sensitivities d ln(output) / d ln(parameter)", "S"),
+    ]
+    for title, key in tables:
+        print(title, file=file)
+        print(f"{'parameter':<{width}s}{'value':>12s}" + "".join(f"{f:>22s}" for f in sens["of"]), file=file)
+        for j, name in enumerate(sens["wrt"]):
+            row = "".join(f"{val:22.4g}" for val in sens[key][:, j])
+            print(f"{name:<{width}s}{sens['x0'][j]:12.5g}" + row, file=file)
+        print(file=file)
+    print(f"{'output':<{width}s}{'value':>12s}", file=file)
+    for i, f in enumerate(sens["of"]):
+        print(f"{f:<{width}s}{sens['f0'][i]:12.5g}", file=file)
+
+
+def plot_trends(trends, of, output_dir):
+    """
+    Plot the trend lines of output `of` over every parameter, one figure per parameter.
+    """
+    import matplotlib.pyplot as plt
+
+    for name, trend in trends.items():
+        fig, axs = plt.subplots(1, 1, figsize=(10, 6))
+        axs.plot(trend["x"], trend[of], linestyle="--", label="linear")
+        axs.set_xlabel(name)
+        axs.set_ylabel(of)
+        plt.legend()
+        fig.savefig(os.path.join(output_dir, f"{name}_{of}_trend.pdf"))
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    from N3_CLVR_V3 import ALT_WAR, SLS_WAR, MPN3, add_einox
+    from cycle_eval import DEFAULT_INPUTS
+    from warm_start import WarmStartDB, is_converged
+
+    use_h2 = True
+    make_trends = True
+    fuel = "H2" if use_h2 else "JetA"
+
+    prob = om.Problem()
+    prob.model = MPN3(use_h2=use_h2, wet_air=True)
+    add_einox(prob.model, ALT_WAR, SLS_WAR)
+    prob.setup(mode="rev")
+
+    for name, (val, units) in DEFAULT_INPUTS.items():
+        prob.set_val(name, val, units=units)
+    WarmStartDB().warm_start(prob, fuel)
+
+    prob.set_solver_print(level=-1)
+    prob.set_solver_print(level=2, depth=1)
+    prob.run_model()
+    if not is_converged(prob):
+        raise RuntimeError("The cycle did not converge; sensitivities are only valid at a converged solution.")
+
+    sens = sensitivities(prob)
+
+    output_dir = f"../OUTPUT/N3_trends/sensitivity/{fuel}"
+    if os.path.isdir(output_dir) is False:
+        os.makedirs(output_dir)
+
+    print_sensitivities(sens)
+    with open(os.path.join(output_dir, "sensitivity.txt"), "w") as file:
+        print_sensitivities(sens, file)
+    with open(os.path.join(output_dir, "sensitivity.pkl"), "wb") as f:
+        pkl.dump(sens, f)
+
+    if make_trends:
+        trends = trend_lines(sens)
+        with open(os.path.join(output_dir, "trends.pkl"), "wb") as f:
+            pkl.dump(trends, f)
+        for of in ["CRZ.tsec_perf.TSEC", "CRZ.perf.TSFC"]:
+            if of in sens["of"]:
+                plot_trends(trends, of, output_dir)
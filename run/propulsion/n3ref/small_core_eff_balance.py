@@ -1,6 +1,6 @@
 from openmdao.api import ImplicitComponent
 import numpy as np
-from  scipy.interpolate import Akima1DInterpolator as Akima
+from functools import lru_cache
 
 
 """ Create tables for table lookup functions """
@@ -13,15 +13,16 @@ EtaPoly_SE1 =np.array([0, 0.84,  0.88,  0.891, 0.901, 0.905, 0.9075, 0.909, 0.91
 # TGL 2 - beyond next generation technology level ~4% better
 EtaPoly_SE2 =np.array([0, 0.855, 0.900, 0.912, 0.917, 0.920, 0.922, 0.9235, 0.926, 0.930, 0.931, 0.931])
 
-# Create continuously differentiable interpolations
-EtaPoly_SE0_interp = Akima(Wc_SE, EtaPoly_SE0)
-EtaPoly_SE1_interp = Akima(Wc_SE, EtaPoly_SE1)
-EtaPoly_SE2_interp = Akima(Wc_SE, EtaPoly_SE2)
+EtaPoly_SE = [EtaPoly_SE0, EtaPoly_SE1, EtaPoly_SE2]
+
+@lru_cache(maxsize=None)
+def EtaPoly_SE_interp(TGL):
+    """ Continuously differentiable interpolation of the small engine curve and its derivative, built on first use """
+    from scipy.interpolate import Akima1DInterpolator as Akima
+
+    interp = Akima(Wc_SE, EtaPoly_SE[TGL])
+    return interp, interp.derivative(1)
 
-# gather derivatives
-EtaPoly_SE0_interp_deriv = EtaPoly_SE0_interp.derivative(1)
-EtaPoly_SE1_interp_deriv = EtaPoly_SE1_interp.derivative(1)
-EtaPoly_SE2_interp_deriv = EtaPoly_SE2_interp.derivative(1)
 
 class SmallCoreEffBalance(ImplicitComponent):
     """ Polytropic/ Adiabatic efficiency balance. """
@@ -46,12 +47,7 @@ class SmallCoreEffBalance(ImplicitComponent):
         CS = inputs['CS']
 
         if Type == 'small':
-            if TGL == 1:
-                EtaPoly_Calc = EtaPoly_SE1_interp(CS)
-            elif TGL == 2:
-                EtaPoly_Calc = EtaPoly_SE2_interp(CS)
-            else:
-                EtaPoly_Calc = EtaPoly_SE0_interp(CS)
+            EtaPoly_Calc = EtaPoly_SE_interp(TGL)[0](CS)
         else:
             if CS < 5.30218862:
                 EtaPoly_Calc = -9.025e-4*(CS**4.) + 0.01816*(CS**3.) - 0.1363*(CS**2.) + 0.4549*(CS) + 0.33620
@@ -72,12 +68,7 @@ class SmallCoreEffBalance(ImplicitComponent):
         Type  = self.options['eng_type']
 
         if Type == 'small':
-            if TGL == 1:
-                partl = EtaPoly_SE1_interp_deriv(CS).reshape(1,)[0]
-            elif TGL == 2:
-                partl = EtaPoly_SE2_interp_deriv(CS).reshape(1,)[0]
-            else:
-                partl = EtaPoly_SE0_interp_deriv(CS).reshape(1,)[0]
+            partl = EtaPoly_SE_interp(TGL)[1](CS).reshape(1,)[0]
         else:
             if CS < 5.30218862:
                 partl = -0.00361*(CS**3.) + 0.05448*(CS**2.) - 0.2726*CS + 0.4549
@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+"""
+@File    :   surrogate.py
+@Time    :   2026/10/17
+@Desc    :   Gradient-enhanced Kriging surrogate of the MPN3 cycle for screening and trust-region optimization
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import pickle as pkl
+import warnings
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+from scipy.linalg import cho_factor, cho_solve
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+
+# Design variables of the CLVR optimizations
+SURR_INPUTS = [
+    "fan:PRdes",
+    "lpc:PRdes",
+    "TOC.balance.rhs:hpc_PR",
+    "RTO_T4",
+    "T4_ratio.TR",
+    "TOC.extract.sub_flow.w_frac",
+    "RTO.extract.sub_flow.w_frac",
+    "SLS.extract.sub_flow.w_frac",
+    "CRZ.extract.sub_flow.w_frac",
+]
+
+# Cycle outputs to fit. For the EINOx outputs (cycle_eval.EINOX_VARS) sample a model built with
+# N3_CLVR_V3.add_einox and pass them in `outputs`.
+SURR_OUTPUTS = [
+    "TOC.perf.TSFC",
+    "CRZ.perf.TSFC",
+    "TOC.tsec_perf.TSEC",
+    "CRZ.tsec_perf.TSEC",
+    "TOC.perf.Fn",
+    "TOC.fan_dia.FanDia",
+]
+
+
+class GEKriging(object):
+    """
+    Ordinary Kriging with a Gaussian correlation, enhanced with gradient observations.
+
+    The inputs are scaled to [0, 1] by `lower`/`upper` and the values by their mean and spread. Gradients are
+    optional per sample (NaN entries are left out of the fit), so sweep records without derivatives can be mixed
+    with samples whose totals were computed. The correlation length is isotropic in the scaled inputs and set by
+    maximizing the likelihood over `thetas`.
+    """
+
+    def __init__(self, lower, upper, thetas=np.geomspace(0.1, 100.0, 25), nugget=1e-10):
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.thetas = thetas
+        self.nugget = nugget
+
+    def _scale(self, x):
+        return (np.atleast_2d(x) - self.lower) / (self.upper - self.lower)
+
+    def _corr(self, u, theta):
+        """
+        Correlation between the observations (values, then gradient components) at the scaled points `u`.
+        """
+        n, d = u.shape
+        diff = u[:, None, :] - u[None, :, :]
+        k = np.exp(-theta * np.sum(diff ** 2, axis=2))
+
+        R = np.zeros((n * (1 + d), n * (1 + d)))
+        R[:n, :n] = k
+        for a in range(d):
+            # cov(f(u_i), df/du_a(u_j)) = dk/du'_a
+            R[:n, n * (1 + a) : n * (2 + a)] = 2.0 * theta * diff[:, :, a] * k
+            R[n * (1 + a) : n * (2 + a), :n] = -2.0 * theta * diff[:, :, a] * k
+            for b in range(d):
+                R[n * (1 + a) : n * (2 + a), n * (1 + b) : n * (2 + b)] = (
+                    2.0 * theta * (a == b) - 4.0 * theta ** 2 * diff[:, :, a] * diff[:, :, b]
+                ) * k
+
+        return R
+
+    def _fit(self, theta):
+        R = self._corr(self.u, theta)[np.ix_(self.mask, self.mask)]
+        R[np.diag_indices_from(R)] += self.nugget
+        c = cho_factor(R, lower=True)
+
+        F, y = self.F, self.y
+        RiF = cho_solve(c, F)
+        mu = np.dot(F, cho_solve(c, y)) / np.dot(F, RiF)
+        res = y - mu * F
+        alpha = cho_solve(c, res)
+        sigma2 = max(np.dot(res, alpha) / len(y), 1e-300)
+
+        loglike = -0.5 * len(y) * np.log(sigma2) - np.sum(np.log(np.diag(c[0])))
+
+        return loglike, {"theta": theta, "c": c, "mu": mu, "alpha": alpha, "sigma2": sigma2, "FRiF": np.dot(F, RiF)}
+
+    def train(self, x, y, dy=None):
+        """
+        Fit to the values `y` (n) and, optionally, the gradients `dy` (n x d) at the points `x` (n x d).
+        """
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+        y = np.asarray(y, dtype=float).ravel()
+        n, d = x.shape
+        if dy is None:
+            dy = np.full((n, d), np.nan)
+        dy = np.asarray(dy, dtype=float).reshape(n, d)
+
+        # drop samples without a value
+        ok = np.isfinite(y)
+        x, y, dy = x[ok], y[ok], dy[ok]
+        n = len(y)
+
+        self.y_mean = np.mean(y)
+        self.y_std = np.std(y) if np.std(y) > 0.0 else 1.0
+
+        self.u = self._scale(x)
+        obs = np.concatenate([(y - self.y_mean) / self.y_std, (dy * (self.upper - self.lower) / self.y_std).T.ravel()])
+        self.mask = np.isfinite(obs)
+        self.y = obs[self.mask]
+        self.F = np.concatenate([np.ones(n), np.zeros(n * d)])[self.mask]
+
+        best = None
+        for theta in self.thetas:
+            try:
+                loglike, fit = self._fit(theta)
+            except np.linalg.LinAlgError:
+                continue
+            if best is None or loglike > best[0]:
+                best = (loglike, fit)
+
+        if best is None:
+            raise ValueError("Kriging correlation matrix is singular for all correlation lengths.")
+        self.fit = best[1]
+
+        return self
+
+    def _cross(self, x):
+        """
+        Correlation of the values at `x` with the observations, and its derivative with respect to the scaled x.
+        """
+        theta = self.fit["theta"]
+        u = self._scale(x)
+        m, d = u.shape
+        n = self.u.shape[0]
+
+        diff = u[:, None, :] - self.u[None, :, :]
+        k = np.exp(-theta * np.sum(diff ** 2, axis=2))
+
+        r = np.zeros((m, n * (1 + d)))
+        dr = np.zeros((m, n * (1 + d), d))
+        r[:, :n] = k
+        for a in range(d):
+            r[:, n * (1 + a) : n * (2 + a)] = 2.0 * theta * diff[:, :, a] * k
+            dr[:, :n, a] = -2.0 * theta * diff[:, :, a] * k
+            for b in range(d):
+                dr[:, n * (1 + b) : n * (2 + b), a] = (
+                    2.0 * theta * (a == b) - 4.0 * theta ** 2 * diff[:, :, a] * diff[:, :, b]
+                ) * k
+
+        return r[:, self.mask], dr[:, self.mask, :]
+
+    def predict(self, x):
+        """
+        Predicted values at the points `x` (m x d).
+        """
+        r, _ = self._cross(x)
+        return self.y_mean + self.y_std * (self.fit["mu"] + r.dot(self.fit["alpha"]))
+
+    def predict_derivatives(self, x):
+        """
+        Gradient of the prediction at the points `x` (m x d).
+        """
+        _, dr = self._cross(x)
+        return self.y_std * np.einsum("mnd,n->md", dr, self.fit["alpha"]) / (self.upper - self.lower)
+
+    def predict_std(self, x):
+        """
+        Kriging standard error of the prediction at the points `x` (m x d).
+        """
+        fit = self.fit
+        r, _ = self._cross(x)
+        Rir = cho_solve(fit["c"], r.T)
+        mse = 1.0 - np.sum(r.T * Rir, axis=0) + (1.0 - self.F.dot(Rir)) ** 2 / fit["FRiF"]
+        return self.y_std * np.sqrt(fit["sigma2"] * np.maximum(mse, 0.0))
+
+    def predict_std_derivatives(self, x):
+        """
+        Gradient of the standard error at the points `x` (m x d).
+        """
+        fit = self.fit
+        r, dr = self._cross(x)
+        Rir = cho_solve(fit["c"], r.T).T
+        RiF = cho_solve(fit["c"], self.F)
+        q = 1.0 - Rir.dot(self.F)
+        dmse = -2.0 * np.einsum("mnd,mn->md", dr, Rir)
+        dmse -= 2.0 * q[:, None] * np.einsum("mnd,n->md", dr, RiF) / fit["FRiF"]
+
+        std = self.predict_std(x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dstd = self.y_std ** 2 * fit["sigma2"] * dmse / (2.0 * std[:, None])
+        dstd[~np.isfinite(dstd)] = 0.0
+        return dstd / (self.upper - self.lower)
+
+
+class CycleSurrogate(object):
+    """
+    Kriging models of several cycle outputs over the same design variables, trained from sample sets.
+
+    A sample set is a dict with the input names, output names, the points `x` (n x d), the values `y` (n x p) and,
+    optionally, the total derivatives `dy` (n x p x d, NaN where not available).
+    """
+
+    def __init__(self, inputs, outputs, lower, upper):
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.models = {}
+
+    def train(self, samples, **kwargs):
+        x, y = samples["x"], samples["y"]
+        dy = samples.get("dy")
+
+        for p, name in enumerate(self.outputs):
+            model = GEKriging(self.lower, self.upper, **kwargs)
+            self.models[name] = model.train(x, y[:, p], None if dy is None else dy[:, p, :])
+
+        return self
+
+    def predict(self, x):
+        """
+        Dict of (predicted values, standard errors) of each output at the points `x` (m x d).
+        """
+        return {name: (model.predict(x), model.predict_std(x)) for name, model in self.models.items()}
+
+    def save(self, fname):
+        with open(fname, "wb") as f:
+            pkl.dump(self, f)
+
+    @staticmethod
+    def load(fname):
+        with open(fname, "rb") as f:
+            return pkl.load(f)
+
+
+def _present(prob, names):
+    present, missing = [], []
+    for name in names:
+        try:
+            prob.get_val(name)
+        except KeyError:
+            missing.append(name)
+            continue
+        present.append(name)
+
+    if missing:
+        warnings.warn(f"The model has no {', '.join(missing)}; they are left out of the samples.")
+    return present
+
+
+def sample_totals(evaluator, cases, inputs=SURR_INPUTS, outputs=SURR_OUTPUTS):
+    """
+    Run the cases (dicts of input values) with a CycleEvaluator and collect the outputs and their total
+    derivatives with respect to the inputs at every converged case. Inputs and outputs the model does not have are
+    left out with a warning. Returns a sample set for CycleSurrogate.train.
+    """
+    prob = evaluator.prob
+    inputs = _present(prob, inputs)
+    outputs = _present(prob, outputs)
+
+    x, y, dy = [], [], []
+    for params in cases:
+        converged, _, _ = evaluator.run_case(params)
+        if not converged:
+            continue
+
+        totals = prob.compute_totals(of=outputs, wrt=inputs)
+        x.append([prob.get_val(name)[0] for name in inputs])
+        y.append([prob.get_val(name)[0] for name in outputs])
+        dy.append([[totals[o, i][0, 0] for i in inputs] for o in outputs])
+
+    return {"inputs": inputs, "outputs": outputs, "x": np.array(x), "y": np.array(y), "dy": np.array(dy)}
+
+
+def samples_from_store(store, inputs, outputs, status=1):
+    """
+    Sample set, without derivatives, from the rows of a ResultStore with the given status.
+    """
+    data = store.read()
+    ok = np.asarray(data["status"]) == status
+
+    x = np.column_stack([np.asarray(data[name])[ok] for name in inputs])
+    y = np.column_stack([np.asarray(data[name])[ok] for name in outputs])
+
+    return {"inputs": list(inputs), "outputs": list(outputs), "x": x, "y": y}
+
+
+def merge_samples(*sample_sets):
+    """
+    Concatenate sample sets with the same inputs and outputs; missing derivatives become NaN.
+    """
+    inputs, outputs = sample_sets[0]["inputs"], sample_sets[0]["outputs"]
+    p, d = len(outputs), len(inputs)
+
+    x = np.concatenate([s["x"] for s in sample_sets])
+    y = np.concatenate([s["y"] for s in sample_sets])
+    dy = np.concatenate([s["dy"] if "dy" in s else np.full((len(s["x"]), p, d), np.nan) for s in sample_sets])
+
+    return {"inputs": inputs, "outputs": outputs, "x": x, "y": y, "dy": dy}
+
+
+def _var_name(name):
+    return name.replace(".", "_").replace(":", "_")
+
+
+class CycleSurrogateComp(om.ExplicitComponent):
+    """
+    Predicts the cycle outputs of a trained CycleSurrogate from the design variables. Each output `<name>` (with "."
+    and ":" replaced by "_") comes with its standard error `<name>_err`, so an optimizer can constrain the
+    uncertainty or a trust-region driver can decide when to run the full cycle.
+    """
+
+    def initialize(self):
+        self.options.declare("surrogate", recordable=False, desc="trained CycleSurrogate")
+
+    def setup(self):
+        surr = self.options["surrogate"]
+
+        for name, lower, upper in zip(surr.inputs, surr.lower, surr.upper):
+            self.add_input(_var_name(name), val=0.5 * (lower + upper))
+
+        for name in surr.models:
+            self.add_output(_var_name(name), val=0.0)
+            self.add_output(_var_name(name) + "_err", val=0.0)
+
+        self.declare_partials("*", "*")
+
+    def _x(self, inputs):
+        surr = self.options["surrogate"]
+        return np.array([[inputs[_var_name(name)][0] for name in surr.inputs]])
+
+    def compute(self, inputs, outputs):
+        x = self._x(inputs)
+
+        for name, model in self.options["surrogate"].models.items():
+            outputs[_var_name(name)] = model.predict(x)
+            outputs[_var_name(name) + "_err"] = model.predict_std(x)
+
+    def compute_partials(self, inputs, J):
+        surr = self.options["surrogate"]
+        x = self._x(inputs)
+
+        for name, model in surr.models.items():
+            dval = model.predict_derivatives(x)[0]
+            derr = model.predict_std_derivatives(x)[0]
+            for i, in_name in enumerate(surr.inputs):
+                J[_var_name(name), _var_name(in_name)] = dval[i]
+                J[_var_name(name) + "_err", _var_name(in_name)] = derr[i]
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+"""
+@File    :   tab_thermo_gen.py
+@Time    :   2026/10/17
+@Desc    :   Generate tabular thermodynamic property tables for wet air/fuel mixtures from CEA
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import pickle as pkl
+import warnings
+from functools import lru_cache
+from multiprocessing import Pool
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.om_warnings import SolverWarning
+from pycycle.constants import CEA_AIR_COMPOSITION
+from pycycle.thermo.cea.chem_eq import SetTotalTP
+from pycycle.thermo.cea.species_data import Properties, wet_air
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+
+# Composition keys of the tabular flow: fuel-to-dry-air and water-to-dry-air mass ratios.
+# A negative WAR represents water removed from the combustion products.
+TAB_WET_AIR_FUEL_COMPOSITION = {"FAR": 0.0, "WAR": 0.0}
+
+TAB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "OUTPUT", "thermo_tables")
+
+FUELS = {"JetA": "Jet-A(g)", "H2": "H2"}
+
+# Default table bounds for each fuel
+TAB_GRIDS = {
+    "JetA": {
+        "T": np.linspace(150.0, 2600.0, 80),  # degK
+        "P": np.geomspace(1.0e3, 7.0e6, 40),  # Pa
+        "FAR": np.linspace(0.0, 0.05, 11),
+        "WAR": np.linspace(-0.03, 0.05, 17),
+    },
+    "H2": {
+        "T": np.linspace(150.0, 2600.0, 80),
+        "P": np.geomspace(1.0e3, 7.0e6, 40),
+        "FAR": np.linspace(0.0, 0.025, 11),
+        "WAR": np.linspace(-0.08, 0.08, 17),
+    },
+}
+
+PROPS = [
+    ("h", "J/kg"),
+    ("S", "J/kg/degK"),
+    ("gamma", None),
+    ("Cp", "J/kg/degK"),
+    ("Cv", "J/kg/degK"),
+    ("rho", "kg/m**3"),
+    ("R", "J/kg/degK"),
+]
+
+
+def _mass_fractions(elements, composition, spec=wet_air):
+    """
+    Elemental mass fractions, ordered as `elements`, of a composition given in moles per element.
+    """
+    mass = np.zeros(len(elements))
+    for e, moles in composition.items():
+        mass[elements.index(e)] += moles * spec.element_wts[e]
+    return mass / np.sum(mass)
+
+
+def mixture_elements(fuel, spec=wet_air):
+    """
+    Properties object holding every element present in dry air, fuel and water.
+    """
+    elements = dict(CEA_AIR_COMPOSITION)
+    elements.update(spec.reactants[FUELS[fuel]])
+    elements.update(spec.reactants["Water"])
+    return Properties(spec, init_elements=elements)
+
+
+def min_WAR(fuel, FAR, spec=wet_air):
+    """
+    Lowest WAR with a non-negative amount of hydrogen, i.e. all the water formed from the fuel removed.
+    """
+    thermo = mixture_elements(fuel, spec)
+    fuel_H = _mass_fractions(thermo.elements, spec.reactants[FUELS[fuel]], spec)[thermo.elements.index("H")]
+    water_H = _mass_fractions(thermo.elements, spec.reactants["Water"], spec)[thermo.elements.index("H")]
+    return -FAR * fuel_H / water_H
+
+
+def element_composition(fuel, FAR, WAR, spec=wet_air):
+    """
+    CEA composition vector (moles of each element per unit mass) of 1 kg of dry air mixed with
+    FAR kg of fuel and WAR kg of water.
+    """
+    thermo = mixture_elements(fuel, spec)
+    elements = thermo.elements
+
+    mass = _mass_fractions(elements, CEA_AIR_COMPOSITION, spec)
+    mass += FAR * _mass_fractions(elements, spec.reactants[FUELS[fuel]], spec)
+    mass += WAR * _mass_fractions(elements, spec.reactants["Water"], spec)
+    mass = np.maximum(mass, 0.0)
+    mass /= np.sum(mass)
+
+    return mass / thermo.element_wt
+
+
+def _cea_problem(fuel, spec=wet_air):
+    thermo = mixture_elements(fuel, spec)
+    elements = {e: 1.0 for e in thermo.elements}
+
+    prob = om.Problem(reports=False)
+    prob.model.add_subsystem("tp", SetTotalTP(spec=spec, composition=elements), promotes=["*"])
+    prob.model.set_input_defaults("T", 400.0, units="degK")
+    prob.model.set_input_defaults("P", 1.0, units="bar")
+    prob.setup()
+    prob.set_solver_print(level=-1)
+    prob.final_setup()
+
+    return prob, thermo
+
+
+def _table_slice(args):
+    """
+    CEA properties over the full (P, T) grid for a single (FAR, WAR) pair.
+    """
+    fuel, FAR, WAR, P, T = args
+    prob, thermo = _cea_problem(fuel)
+
+    # Clip to physically realizable compositions; clipped points repeat the boundary values
+    WAR = max(WAR, min_WAR(fuel, FAR) * (1.0 - 1e-3))
+    composition = element_composition(fuel, FAR, WAR)
+    idx_h2o = thermo.products.index("H2O")
+    wt_h2o = 2.0 * wet_air.element_wts["H"] + wet_air.element_wts["O"]
+
+    data = {name: np.zeros((len(P), len(T))) for name, _ in PROPS}
+    data["Y_H2O"] = np.zeros((len(P), len(T)))
+
+    prob.set_val("composition", composition)
+    for i, Pi in enumerate(P):
+        for j, Tj in enumerate(T):
+            prob.set_val("P", Pi, units="Pa")
+            prob.set_val("T", Tj, units="degK")
+            # trace species sit on their lower bound at low T, which the chem_eq line search reports every point
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", SolverWarning)
+                prob.run_model()
+
+            for name, units in PROPS:
+                data[name][i, j] = prob.get_val(name, units=units)[0]
+            data["Y_H2O"][i, j] = prob.get_val("n")[idx_h2o] * wt_h2o / np.sum(composition * thermo.element_wt)
+
+    return data
+
+
+def generate_tables(fuel, T=None, P=None, FAR=None, WAR=None, n_procs=1):
+    """
+    Build a pyCycle tabular thermo spec for wet air burning the given fuel.
+
+    The spec is a dictionary with the grid vectors ("FAR", "WAR", "P", "T") and every property
+    tabulated on a (FAR, WAR, P, T) grid. In addition to the properties pyCycle's tabular thermo
+    reads, "Y_H2O" holds the equilibrium mass fraction of water, which the tabular WaterBleed uses.
+    """
+    grid = TAB_GRIDS[fuel]
+    T = grid["T"] if T is None else np.asarray(T, dtype=float)
+    P = grid["P"] if P is None else np.asarray(P, dtype=float)
+    FAR = grid["FAR"] if FAR is None else np.asarray(FAR, dtype=float)
+    WAR = grid["WAR"] if WAR is None else np.asarray(WAR, dtype=float)
+
+    jobs = [(fuel, f, w, P, T) for f in FAR for w in WAR]
+    if n_procs > 1:
+        with Pool(n_procs) as pool:
+            slices = pool.map(_table_slice, jobs)
+    else:
+        slices = [_table_slice(job) for job in jobs]
+
+    spec = {"FAR": FAR, "WAR": WAR, "P": P, "T": T}
+    shape = (len(FAR), len(WAR), len(P), len(T))
+    for name in [p[0] for p in PROPS] + ["Y_H2O"]:
+        spec[name] = np.array([s[name] for s in slices]).reshape(shape)
+
+    return spec
+
+
+def tab_spec_file(fuel, tab_dir=TAB_DIR):
+    return os.path.join(tab_dir, f"wet_air_{fuel}.pkl")
+
+
+def save_tab_spec(spec, fuel, tab_dir=TAB_DIR):
+    if os.path.isdir(tab_dir) is False:
+        os.makedirs(tab_dir)
+    with open(tab_spec_file(fuel, tab_dir), "wb") as f:
+        pkl.dump(spec, f)
+
+
+@lru_cache(maxsize=None)
+def load_tab_spec(fuel, tab_dir=TAB_DIR):
+    """
+    Load a table written by `generate_tables`, shared by every model in the process.
+    """
+    fname = tab_spec_file(fuel, tab_dir)
+    if os.path.isfile(fname) is False:
+        raise FileNotFoundError(f"No tabular thermo data for {fuel} at {fname}, run tab_thermo_gen.py first.")
+    with open(fname, "rb") as f:
+        return pkl.load(f)
+
+
+def compare_cea(spec, fuel, n_pts=20, seed=0):
+    """
+    Max relative error of the tables against CEA at random points inside the table bounds.
+    """
+    from scipy.interpolate import RegularGridInterpolator
+
+    prob, thermo = _cea_problem(fuel)
+    rng = np.random.default_rng(seed)
+    grid = (spec["FAR"], spec["WAR"], spec["P"], spec["T"])
+    err = {name: 0.0 for name, _ in PROPS}
+
+    for _ in range(n_pts):
+        FAR = rng.uniform(spec["FAR"][0], spec["FAR"][-1])
+        WAR = rng.uniform(max(spec["WAR"][0], 0.0), spec["WAR"][-1])
+        P = np.exp(rng.uniform(np.log(spec["P"][0]), np.log(spec["P"][-1])))
+        T = rng.uniform(spec["T"][0], spec["T"][-1])
+
+        prob.set_val("composition", element_composition(fuel, FAR, WAR))
+        prob.set_val("P", P, units="Pa")
+        prob.set_val("T", T, units="degK")
+        prob.run_model()
+
+        for name, units in PROPS:
+            tab = RegularGridInterpolator(grid, spec[name])([FAR, WAR, P, T])[0]
+            cea = prob.get_val(name, units=units)[0]
+            err[name] = max(err[name], abs((tab - cea) / cea))
+
+    return err
+
+
+if __name__ == "__main__":
+    import time
+
+    n_procs = os.cpu_count()
+
+    for fuel in ["JetA", "H2"]:
+        st = time.time()
+        spec = generate_tables(fuel, n_procs=n_procs)
+        save_tab_spec(spec, fuel)
+        print(f"{fuel} tables written to {tab_spec_file(fuel)} in {time.time() - st:.1f} s")
+
+        for name, err in compare_cea(spec, fuel).items():
+            print(f"    {name}: max relative error {err:.2e}")
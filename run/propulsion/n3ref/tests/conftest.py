@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""
+@File    :   conftest.py
+@Time    :   2026/10/17
+@Desc    :   Shared fixtures of the n3ref tests
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import sys
+from functools import partial
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import pytest
+
+# the n3ref scripts import each other as top level modules
+N3REF_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, N3REF_DIR)
+os.environ.setdefault("OPENMDAO_REPORTS", "0")
+
+
+@pytest.fixture(scope="session")
+def sized_n3(tmp_path_factory):
+    """
+    Converged N3ref MPN3 problem (JetA, wet air), started from the seed states rather than a local warm-start database.
+    """
+    from cycle_eval import CycleEvaluator
+    from N3_CLVR_V3 import N3ref_model
+    from warm_start import WarmStartDB
+
+    warm_db = WarmStartDB(str(tmp_path_factory.mktemp("warm_start") / "N3_CLVR.pkl"))
+    evaluator = CycleEvaluator(partial(N3ref_model, wet_air=True), warm_db=warm_db)
+    converged, _, _ = evaluator.run_case({})
+    assert converged, "Sizing of the N3 did not converge."
+
+    return evaluator.prob
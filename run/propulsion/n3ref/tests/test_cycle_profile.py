@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+@File    :   test_cycle_profile.py
+@Time    :   2026/10/17
+@Desc    :   Point/element split and solver iteration counts of the cycle profiler
+"""
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import openmdao.api as om
+import pycycle.api as pyc
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from cycle_profile import CycleProfiler, _split
+
+
+class Point(pyc.Cycle):
+    """
+    x**2 = rhs solved by a Newton solver, standing in for a cycle point.
+    """
+
+    def setup(self):
+        self.add_subsystem("sq", om.ExecComp("y = x**2"), promotes=["*"])
+        balance = self.add_subsystem("balance", om.BalanceComp(), promotes=["*"])
+        balance.add_balance("x", val=1.0, rhs_val=4.0)
+        self.connect("y", "lhs:x")
+
+        newton = self.nonlinear_solver = om.NewtonSolver(solve_subsystems=True, maxiter=20, iprint=-1)
+        newton.options["atol"] = 1e-10
+        newton.options["rtol"] = 1e-10
+        newton.linesearch = om.ArmijoGoldsteinLS(iprint=-1)
+        self.linear_solver = om.DirectSolver()
+
+        super().setup()
+
+
+def test_split():
+    points = {"DESIGN": "DESIGN", "od.RTO": "RTO"}
+
+    assert _split("DESIGN.burner.mix_fuel", points) == ("DESIGN", "burner")
+    assert _split("od.RTO.burner.mix_fuel", points) == ("RTO", "burner")
+    assert _split("balance", points) == ("model", "balance")
+
+
+def test_profile():
+    prob = om.Problem()
+    prob.model.add_subsystem("DESIGN", Point())
+    od = prob.model.add_subsystem("od", om.ParallelGroup())
+    od.add_subsystem("RTO", Point())
+    prob.setup()
+
+    profiler = CycleProfiler(prob.model)
+    profiler.start()
+    prob.run_model()
+    profiler.stop()
+    report = profiler.report()
+
+    # the auto IVC is reported under "model"
+    assert set(report["points"]) == {"DESIGN", "RTO", "model"}
+    assert set(report["points"]["RTO"]) == {"sq", "balance", "total"}
+
+    newton = report["nonlinear_solvers"]["od.RTO"]
+    assert newton["calls"] == 1
+    assert newton["iterations"] == prob.model.od.RTO.nonlinear_solver._iter_count
+    assert newton["iterations"] > 1
+    assert newton["linesearch"]["iterations"] >= 0
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+@File    :   test_deck_interp.py
+@Time    :   2026/10/17
+@Desc    :   Values and derivatives of the deck and scattered data interpolants and their component
+"""
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+import pytest
+from numpy.testing import assert_allclose
+from openmdao.utils.assert_utils import assert_check_partials
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from deck_interp import DeckInterp, InterpComp, ScatterInterp
+from engine_deck import DECK_AXES, write_deck
+
+AXES = {
+    "alt": [0.0, 10000.0, 25000.0],
+    "MN": [0.0, 0.5, 0.8],
+    "dTs": [0.0],
+    "w_frac": [0.00001],
+    "throttle": [0.25, 0.5, 1.0],
+}
+
+
+def fn(alt, MN, throttle):
+    """
+    Multilinear in the axes, so the deck interpolates it exactly.
+    """
+    return 20000.0 * throttle - 0.3 * alt - 4000.0 * MN + 0.2 * alt * throttle + 1000.0 * MN * throttle
+
+
+def dfn(alt, MN, throttle):
+    zero = np.zeros_like(alt)
+    return np.column_stack(
+        [-0.3 + 0.2 * throttle, -4000.0 + 1000.0 * throttle, zero, zero, 20000.0 + 0.2 * alt + 1000.0 * MN]
+    )
+
+
+@pytest.fixture
+def deck(tmp_path):
+    grid = np.meshgrid(*[np.array(AXES[name]) for name in DECK_AXES], indexing="ij")
+    alt, MN, _, _, throttle = grid
+    data = {"Fn": fn(alt, MN, throttle), "TSFC": 0.5 + 0.0 * alt, "converged": np.ones(alt.shape, dtype=bool)}
+    write_deck(str(tmp_path), AXES, data, meta={"units": {"Fn": "lbf", "TSFC": "lbm/(h*lbf)"}})
+    return str(tmp_path)
+
+
+def queries(n=20, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "alt": rng.uniform(0.0, 25000.0, n),
+        "MN": rng.uniform(0.0, 0.8, n),
+        "dTs": np.zeros(n),
+        "w_frac": np.full(n, 0.00001),
+        "throttle": rng.uniform(0.25, 1.0, n),
+    }
+
+
+def test_deck_interp(deck):
+    interp = DeckInterp(deck, outputs=["Fn"])
+    x = queries()
+
+    vals, grads = interp(x, derivs=True)
+    assert_allclose(vals["Fn"], fn(x["alt"], x["MN"], x["throttle"]), rtol=1e-10)
+    assert_allclose(grads["Fn"], dfn(x["alt"], x["MN"], x["throttle"]), rtol=1e-10, atol=1e-12)
+
+    # an (n, d) array is the same query as a dict
+    array_vals = interp(np.column_stack([x[name] for name in DECK_AXES]))
+    assert_allclose(array_vals["Fn"], vals["Fn"])
+
+
+def test_deck_bounds(deck):
+    x = {"alt": [30000.0, 10000.0], "MN": 0.5, "dTs": [0.0, 10.0], "w_frac": 0.00001, "throttle": 0.5}
+
+    # clipped to the deck with a warning
+    with pytest.warns(UserWarning, match="2 of 2 deck queries"):
+        vals = DeckInterp(deck)(x)
+    assert_allclose(vals["Fn"], fn(np.array([25000.0, 10000.0]), 0.5, 0.5))
+
+    vals, grads = DeckInterp(deck, out_of_bounds="nan")(x, derivs=True)
+    assert np.all(np.isnan(vals["Fn"])) and np.all(np.isnan(grads["Fn"]))
+
+    # extrapolation is linear past the ends of the axes, the single value dTs axis still can not be left
+    vals = DeckInterp(deck, extrapolate=True, out_of_bounds="nan")(x)
+    assert_allclose(vals["Fn"][0], fn(30000.0, 0.5, 0.5))
+    assert np.isnan(vals["Fn"][1])
+
+
+def test_fill_failed(tmp_path):
+    grid = np.meshgrid(*[np.array(AXES[name]) for name in DECK_AXES], indexing="ij")
+    alt, MN, _, _, throttle = grid
+    Fn = fn(alt, MN, throttle)
+    converged = np.ones(alt.shape, dtype=bool)
+    Fn[1, 1, 0, 0, 1] = np.nan
+    converged[1, 1, 0, 0, 1] = False
+    write_deck(str(tmp_path), AXES, {"Fn": Fn, "converged": converged})
+
+    x = {"alt": 10000.0, "MN": 0.5, "dTs": 0.0, "w_frac": 0.00001, "throttle": 0.5}
+    assert np.isnan(DeckInterp(str(tmp_path))(x)["Fn"][0])
+
+    # filled halfway between the neighbouring points of the throttle line
+    expected = 0.5 * (fn(10000.0, 0.5, 0.25) + fn(10000.0, 0.5, 1.0))
+    assert_allclose(DeckInterp(str(tmp_path), fill_failed=True)(x)["Fn"], expected)
+
+
+def test_scatter_interp():
+    rng = np.random.default_rng(0)
+    x = np.column_stack([rng.uniform(0.0, 35000.0, 60), rng.uniform(0.2, 0.8, 60)])
+    x = np.vstack([x, [[0.0, 0.2], [0.0, 0.8], [35000.0, 0.2], [35000.0, 0.8]]])
+    y = np.column_stack([1.0 + 2e-4 * x[:, 0] - 3.0 * x[:, 1], 0.5 * x[:, 1]])
+    interp = ScatterInterp(x, y, ["alt", "MN"], ["Fn", "TSFC"])
+
+    q = {"alt": [1000.0, 20000.0, 34000.0, 40000.0], "MN": [0.3, 0.5, 0.7, 0.5]}
+    vals, grads = interp(q, derivs=True)
+
+    # linear data is interpolated exactly inside the hull, NaN outside
+    alt, MN = np.array(q["alt"][:3]), np.array(q["MN"][:3])
+    assert_allclose(vals["Fn"][:3], 1.0 + 2e-4 * alt - 3.0 * MN)
+    assert_allclose(grads["Fn"][:3], np.tile([2e-4, -3.0], (3, 1)))
+    assert_allclose(grads["TSFC"][:3], np.tile([0.0, 0.5], (3, 1)), atol=1e-12)
+    assert np.isnan(vals["Fn"][3]) and np.all(np.isnan(grads["TSFC"][3]))
+
+
+# the finite differences step off the single value axes of the deck
+@pytest.mark.filterwarnings("ignore:.*deck queries are outside")
+def test_interp_comp_partials(deck):
+    nn = 5
+    x = queries(nn, seed=1)
+
+    prob = om.Problem()
+    comp = prob.model.add_subsystem("deck", InterpComp(num_nodes=nn, interp=DeckInterp(deck)), promotes=["*"])
+    comp.set_check_partial_options(wrt="alt", step=1.0)
+    prob.setup()
+    for name, val in x.items():
+        prob.set_val(name, val)
+    prob.run_model()
+
+    assert_allclose(prob.get_val("Fn", units="lbf"), fn(x["alt"], x["MN"], x["throttle"]), rtol=1e-10)
+    assert_check_partials(prob.check_partials(method="fd", out_stream=None), atol=1e-4, rtol=1e-6)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+@File    :   test_engine_deck.py
+@Time    :   2026/10/17
+@Desc    :   End to end run of one throttle line of the engine deck
+"""
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from numpy.testing import assert_allclose
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from engine_deck import DECK_AXES, clone_point, generate_deck, read_deck, thrust_lapse
+
+
+def test_clone_point_connections(sized_n3):
+    spec = clone_point(sized_n3, "SLS")
+
+    # the water loop is closed by MPN3, not by the point itself
+    assert ("extract.W_water", "inject.mix:W") in spec["connections"]
+    assert_allclose(spec["inputs"]["fc.ambient.dTs.dTs"], sized_n3.get_val("SLS.fc.dTs", units="degR"))
+    assert ".balance.W" in spec["states"]
+
+
+def test_throttle_line(sized_n3, tmp_path):
+    axes = {
+        "alt": [0.0],
+        "MN": [0.0001],
+        "dTs": [0.0],
+        "w_frac": [0.00001],
+        "throttle": [0.4, 0.7, 1.0],
+    }
+    data = generate_deck(sized_n3, str(tmp_path), axes, wet_air=True)
+
+    assert np.all(data["converged"])
+
+    # the SLS line at full throttle is the sized SLS point
+    a, _, _ = thrust_lapse(sized_n3)
+    assert_allclose(data["Fn"].ravel(), a * np.array(axes["throttle"]), rtol=1e-3)
+    assert_allclose(data["Fn"].ravel()[-1], sized_n3.get_val("SLS.perf.Fn", units="lbf")[0], rtol=1e-3)
+    assert np.all(np.diff(data["Wfuel"].ravel()) > 0.0)
+    assert np.all(data["EINOx"] > 0.0)
+
+    deck_axes, deck_data, meta = read_deck(str(tmp_path))
+    assert [name for name in deck_axes] == DECK_AXES
+    assert deck_data["Fn"].shape == (1, 1, 1, 1, 3)
+    assert_allclose(deck_data["Fn"], data["Fn"])
+    assert meta["fuel"] == "JetA"
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+@File    :   test_file_io.py
+@Time    :   2026/10/17
+@Desc    :   Atomic file writes
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import pytest
+from numpy.testing import assert_equal
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from file_io import atomic_write
+
+
+def test_atomic_write(tmp_path):
+    fname = str(tmp_path / "tables" / "table.npz")
+
+    with atomic_write(fname) as f:
+        np.savez(f, x=np.arange(3))
+    with np.load(fname) as data:
+        assert_equal(data["x"], np.arange(3))
+
+    # a failed write leaves the old file and no temporary file
+    with pytest.raises(RuntimeError):
+        with atomic_write(fname) as f:
+            f.write(b"partial")
+            raise RuntimeError("killed")
+
+    assert os.listdir(tmp_path / "tables") == ["table.npz"]
+    with np.load(fname) as data:
+        assert_equal(data["x"], np.arange(3))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+@File    :   test_multistart.py
+@Time    :   2026/10/17
+@Desc    :   Multi-start optimization of a constrained paraboloid with SLSQP
+"""
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+from numpy.testing import assert_allclose, assert_equal
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from multistart import lhs_starts, multi_start, summarize
+
+
+def paraboloid_model(comm=None, constrained=True):
+    """
+    Paraboloid of the OpenMDAO examples with the constraint c = y - x <= -15, solved by a Newton solver like the
+    cycle models so the workers can check convergence. The optimum is f = -27.0833 at x = 7.1667, y = -7.8333.
+    """
+    prob = om.Problem(comm=comm)
+    model = prob.model
+    model.add_subsystem("parab", om.ExecComp("f = (x - 3.0)**2 + x*y + (y + 4.0)**2 - 3.0"), promotes=["*"])
+    model.add_subsystem("con", om.ExecComp("c = y - x"), promotes=["*"])
+    model.nonlinear_solver = om.NewtonSolver(solve_subsystems=False, atol=1e-10, rtol=1e-10, iprint=-1)
+    model.linear_solver = om.DirectSolver()
+
+    prob.driver = om.ScipyOptimizeDriver(optimizer="SLSQP", tol=1e-9, disp=False)
+    model.add_design_var("x", lower=-50.0, upper=50.0)
+    model.add_design_var("y", lower=-50.0, upper=50.0)
+    if constrained:
+        model.add_constraint("c", upper=-15.0)
+    model.add_objective("f")
+
+    return prob
+
+
+def test_multi_start_paraboloid(tmp_path):
+    n_starts = 4
+    results = multi_start(
+        paraboloid_model, n_starts, inputs={}, seed=1, warm_start_file=str(tmp_path / "warm_start.pkl")
+    )
+
+    assert len(results) == n_starts
+    starts = set()
+    for res in results:
+        assert res["feasible"]
+        assert_allclose(res["objective"], -27.083333, rtol=1e-5)
+        starts.add((float(res["start"]["x"][0]), float(res["start"]["y"][0])))
+    assert len(starts) == n_starts
+
+    best = summarize(results)
+    assert_allclose(best["dvs"]["x"], 7.166667, rtol=1e-4)
+    assert_allclose(best["dvs"]["y"], -7.833333, rtol=1e-4)
+
+
+def test_lhs_starts():
+    n_starts = 6
+    bounds = {"x": (np.array([-1.0, 0.0]), np.array([1.0, 10.0])), "y": (2.0, 3.0)}
+    starts = lhs_starts(bounds, n_starts, seed=3)
+
+    assert len(starts) == n_starts
+    for name, (lower, upper) in bounds.items():
+        u = (np.array([start[name] for start in starts]) - lower) / (np.asarray(upper) - lower)
+        assert np.all((u >= 0.0) & (u < 1.0))
+        # every entry has one start in each of the n_starts intervals of its range
+        for strata in np.floor(u * n_starts).astype(int).T:
+            assert_equal(np.sort(strata), np.arange(n_starts))
+
+    assert_allclose(lhs_starts(bounds, n_starts, seed=3)[2]["x"], starts[2]["x"])
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+@File    :   test_opt_cache.py
+@Time    :   2026/10/17
+@Desc    :   Evaluation cache of the pyOptSparse driver, run by a mock optimizer that replays design vectors
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import copy
+import types
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+import openmdao.api as om
+import openmdao.drivers.pyoptsparse_driver as pyoptsparse_driver
+import pytest
+from numpy.testing import assert_allclose
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from opt_cache import CachedPyOptSparseDriver, EvalCache
+
+# Design vectors the mock optimizer evaluates, with a repeat of the first one
+SEQUENCE = [1.0, 1.0, 2.0, 1.0]
+
+
+class Optimization(object):
+    """
+    The parts of pyoptsparse.Optimization the driver sets up.
+    """
+
+    def __init__(self, title, objfunc, comm=None):
+        self.objfunc = objfunc
+
+    def addVarGroup(self, name, size, **kwargs):
+        pass
+
+    def finalizeDesignVariables(self):
+        pass
+
+    def addObj(self, name):
+        pass
+
+    def addConGroup(self, name, size, **kwargs):
+        pass
+
+
+class Solution(object):
+    def __init__(self, dvs, n_calls):
+        self.dvs = dvs
+        self.optInform = {"value": 0}
+        self.userObjCalls = self.userSensCalls = n_calls
+
+    def getDVs(self):
+        return self.dvs
+
+
+class SLSQP(object):
+    """
+    Optimizer that evaluates the functions and gradients of SEQUENCE and returns the last design vector.
+    """
+
+    def setOption(self, name, value):
+        pass
+
+    def __call__(self, opt_prob, sens=None, storeHistory=None, hotStart=None):
+        self.funcs = []
+        self.sens = []
+        for a in SEQUENCE:
+            dvs = {"a": np.array([a])}
+            # OpenMDAO reuses the arrays it returns, the optimizers copy them
+            funcs, fail = copy.deepcopy(opt_prob.objfunc(dvs))
+            self.funcs.append((funcs, fail))
+            self.sens.append(copy.deepcopy(sens(dvs, funcs)))
+        return Solution(dvs, len(SEQUENCE))
+
+
+@pytest.fixture
+def optimizer(monkeypatch):
+    opt = SLSQP()
+    pyoptsparse = types.ModuleType("pyoptsparse")
+    pyoptsparse.Optimization = Optimization
+    pyoptsparse.SLSQP = lambda: opt
+
+    monkeypatch.setitem(__import__("sys").modules, "pyoptsparse", pyoptsparse)
+    monkeypatch.setattr(pyoptsparse_driver, "pyoptsparse", pyoptsparse)
+    monkeypatch.setattr(pyoptsparse_driver, "Optimization", Optimization, raising=False)
+    return opt
+
+
+def optimization(fname, rhs_scale=1.0):
+    """
+    min (x - 2)**2 with x**2 = rhs_scale * a solved by a Newton solver.
+    """
+    prob = om.Problem()
+    model = prob.model
+    model.add_subsystem("ivc", om.IndepVarComp("scale", rhs_scale), promotes=["*"])
+    model.add_subsystem("rhs", om.ExecComp("rhs = scale * a"), promotes=["*"])
+    model.add_subsystem("sq", om.ExecComp("y = x**2"), promotes=["*"])
+    balance = model.add_subsystem("balance", om.BalanceComp(), promotes=["*"])
+    balance.add_balance("x", val=1.0)
+    model.add_subsystem("obj", om.ExecComp("f = (x - 2.0)**2"), promotes=["*"])
+    model.connect("y", "lhs:x")
+    model.connect("rhs", "rhs:x")
+    model.nonlinear_solver = om.NewtonSolver(solve_subsystems=False, atol=1e-12, rtol=1e-12, maxiter=20, iprint=-1)
+    model.linear_solver = om.DirectSolver()
+
+    model.add_design_var("a", lower=0.5, upper=5.0)
+    model.add_objective("f")
+    model.add_constraint("x", lower=0.0)
+
+    prob.driver = CachedPyOptSparseDriver(print_results=False, cache_file=fname, state_vars=["balance.x"])
+    prob.setup()
+    prob.set_val("a", 1.0)
+    return prob
+
+
+def test_cached_driver(optimizer, tmp_path):
+    fname = str(tmp_path / "cache.pkl")
+
+    prob = optimization(fname)
+    prob.run_driver()
+    driver = prob.driver
+
+    # the repeated design vectors are served from the cache, the others solved
+    assert driver.cache_hits == 4
+    assert driver.iter_count == 3  # two solves and the final run
+    assert len(driver.cache) == 2
+    for (funcs, fail), a in zip(optimizer.funcs, SEQUENCE):
+        assert fail == 0
+        assert_allclose(funcs["obj.f"], (np.sqrt(a) - 2.0) ** 2)
+    for (sens, fail), a in zip(optimizer.sens, SEQUENCE):
+        assert fail == 0
+        assert_allclose(sens["obj.f"]["a"], (np.sqrt(a) - 2.0) / np.sqrt(a), rtol=1e-6)
+    assert_allclose(driver.cache.records[1]["states"]["balance.x"], np.sqrt(2.0))
+
+    # a re-run of the study only replays the file
+    prob = optimization(fname)
+    prob.run_driver()
+    assert prob.driver.cache_hits == 2 * len(SEQUENCE)
+    assert prob.driver.iter_count == 1
+
+    # other values of the other inputs make the records stale
+    with pytest.warns(UserWarning, match="different model inputs"):
+        prob = optimization(fname, rhs_scale=2.0)
+        prob.run_driver()
+    assert prob.driver.cache_hits == 4
+
+
+def test_cache_file(tmp_path):
+    fname = str(tmp_path / "cache.pkl")
+    signature = (["a"], ["f"])
+
+    cache = EvalCache(fname, tol=1e-6, signature=signature)
+    cache.add(np.array([1.0]), funcs={"f": 1.0})
+    cache.add(np.array([2.0]), funcs={"f": 4.0})
+    cache.add(np.array([1.0 + 1e-7]), sens={"f": {"a": 2.0}})
+
+    # a killed run leaves a partial entry, which is dropped before new ones are appended
+    with open(fname, "ab") as f:
+        f.write(b"\x80\x04\x95")
+
+    cache = EvalCache(fname, tol=1e-6, signature=signature)
+    assert len(cache) == 2
+    assert cache.lookup(np.array([1.0 - 5e-7]))["sens"] == {"f": {"a": 2.0}}
+    assert cache.lookup(np.array([1.0 + 2e-6])) is None
+    cache.add(np.array([3.0]), funcs={"f": 9.0})
+
+    cache = EvalCache(fname, tol=1e-6, signature=signature)
+    assert len(cache) == 3
+    assert cache.lookup(np.array([3.0]))["funcs"] == {"f": 9.0}
+
+    with pytest.raises(ValueError):
+        EvalCache(fname, signature=(["b"], ["f"]))
+
+
+def test_lookup_tolerance():
+    cache = EvalCache(tol=1e-6)
+    assert cache.lookup(np.array([1.0, 2.0])) is None
+
+    cache.add(np.array([1.0, 2.0]), funcs={"f": 1.0})
+    cache.add(np.array([1.0, 3.0]), funcs={"f": 2.0})
+
+    # the max norm of the difference is compared with the tolerance
+    assert cache.lookup(np.array([1.0 + 9e-7, 2.0 - 9e-7]))["funcs"] == {"f": 1.0}
+    assert cache.lookup(np.array([1.0, 2.0 + 2e-6])) is None
+    assert cache.lookup(np.array([1.0, 2.9999999]))["funcs"] == {"f": 2.0}
+    assert cache.lookup(np.array([1.0])) is None
+
+    # a matching vector updates its record
+    cache.add(np.array([1.0, 2.0 + 5e-7]), sens={"f": 0.0})
+    assert len(cache) == 2
+    assert set(cache.lookup(np.array([1.0, 2.0]))) == {"x", "funcs", "sens"}
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+@File    :   test_pareto.py
+@Time    :   2026/10/17
+@Desc    :   Epsilon-constraint front of a constrained paraboloid
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+from functools import partial
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from numpy.testing import assert_allclose
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from pareto import nondominated, pareto_front
+from test_multistart import paraboloid_model
+
+
+def paraboloid_front(bound):
+    # optimum of the paraboloid on y - x = bound, for bounds tighter than the unconstrained optimum at y - x = -14
+    x = -(3.0 * bound + 2.0) / 6.0
+    y = x + bound
+    return (x - 3.0) ** 2 + x * y + (y + 4.0) ** 2 - 3.0
+
+
+def test_pareto_front(tmp_path):
+    bounds = [-12.0, -15.0, -18.0, -21.0]
+    front = pareto_front(
+        partial(paraboloid_model, constrained=False),
+        "c",
+        bounds,
+        n_chains=2,
+        inputs={},
+        outputs=["x", "y"],
+        warm_start_file=str(tmp_path / "ws.pkl"),
+    )
+
+    assert [res["bound"] for res in front] == bounds
+    assert all(res["feasible"] for res in front)
+
+    # the loosest bound is inactive; every tighter bound is met with equality
+    expected = [-27.0 - 1.0 / 3.0] + [paraboloid_front(b) for b in bounds[1:]]
+    assert_allclose([res["objective"] for res in front], expected, rtol=1e-5)
+    assert_allclose([res["y"] - res["x"] for res in front[1:]], bounds[1:], atol=1e-6)
+
+    # the objective rises as the bound tightens, so no point of the front dominates another
+    assert len(nondominated(front)) == len(bounds)
+    assert np.all(np.diff([res["objective"] for res in front]) > 0.0)
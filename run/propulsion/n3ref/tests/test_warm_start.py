@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+@File    :   test_warm_start.py
+@Time    :   2026/10/17
+@Desc    :   Variable names, seeds and convergence checks of the warm-start database
+"""
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import openmdao.api as om
+from numpy.testing import assert_allclose
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from warm_start import OD_PTS, WarmStartDB, is_converged, key_vars, od_points, run_converged, seed_states, state_vars
+
+
+def balance_model(rhs=4.0):
+    """
+    x**2 = rhs solved by a Newton solver like the cycle models; no solution for rhs < 0.
+    """
+    prob = om.Problem()
+    model = prob.model
+    model.add_subsystem("sq", om.ExecComp("y = x**2"), promotes=["*"])
+    balance = model.add_subsystem("balance", om.BalanceComp(), promotes=["*"])
+    balance.add_balance("x", val=1.0, rhs_val=rhs)
+    model.connect("y", "lhs:x")
+    model.nonlinear_solver = om.NewtonSolver(solve_subsystems=False, atol=1e-10, rtol=1e-10, maxiter=20, iprint=-1)
+    model.linear_solver = om.DirectSolver()
+    prob.setup()
+    return prob
+
+
+def test_names_follow_od_points():
+    od_pts = ["SLS", "HOT"]
+
+    names = state_vars(od_pts)
+    assert "HOT.balance.W" in names and "SLS.balance.W" in names
+    assert not any(name.startswith(("RTO.", "CRZ.")) for name in names)
+    assert "HOT.fc.WAR" in key_vars(od_pts)
+
+    seed = seed_states("JetA", od_pts)
+    assert_allclose(seed["SLS.balance.W"], 1900.0)
+    assert "TOC.balance.FAR" in seed
+    assert not any(name.startswith(("HOT.", "RTO.", "CRZ.")) for name in seed)
+    assert_allclose(seed_states("JetA")["CRZ.inject.mix:W"], 0.01)
+
+
+def test_is_converged():
+    prob = balance_model()
+    assert od_points(prob) == OD_PTS
+
+    assert run_converged(prob)
+    assert_allclose(prob.get_val("x"), 2.0)
+    assert is_converged(prob)
+
+    # a perturbed solution converges again, a model without a solution does not
+    prob.set_val("x", 2.1)
+    assert is_converged(prob)
+    assert_allclose(prob.get_val("x"), 2.0)
+
+    prob.set_val("rhs:x", -1.0)
+    assert not run_converged(prob)
+    assert not is_converged(prob)
+
+
+def test_records_by_points(tmp_path):
+    fname = str(tmp_path / "warm_start.pkl")
+    prob = balance_model()
+    prob.run_model()
+
+    db = WarmStartDB(fname)
+    assert db.add(prob, "JetA")
+    db.save()
+
+    db = WarmStartDB(fname)
+    assert len(db) == 1
+    assert db.records[0]["od_pts"] == tuple(OD_PTS)
+    assert db.lookup(db.get_key(prob), "JetA", db.records[0]["model"]) is not None
+    assert db.lookup(db.get_key(prob), "JetA", db.records[0]["model"], od_pts=["SLS"]) is None
@@ -0,0 +1,402 @@
+#!/usr/bin/env python
+"""
+@File    :   warm_start.py
+@Time    :   2026/10/17
+@Desc    :   Database of converged MPN3 states used to warm start new runs
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import os
+import pickle as pkl
+import sys
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+from openmdao.core.analysis_error import AnalysisError
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+from file_io import atomic_write
+
+WARM_START_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "OUTPUT", "warm_start", "N3_CLVR.pkl")
+
+# Off-design points of the default MPN3 (see N3_CLVR_V3.OD_POINTS). The variable names of a model are built from
+# its own points, see `od_points`.
+OD_PTS = ["RTO", "SLS", "CRZ"]
+
+# Balance and solver state values recorded for each solution. Names missing from a model (e.g. the `bal`
+# states that only exist in the optimization model) are skipped.
+DES_STATE_VARS = [
+    "TOC.balance.FAR",
+    "TOC.balance.lpt_PR",
+    "TOC.balance.hpt_PR",
+    "TOC.fc.balance.Pt",
+    "TOC.fc.balance.Tt",
+    "TOC.inject.mix:W",
+    "bal.TOC_W",
+    "bal.TOC_BPR",
+    "bal.CRZ_Fn_target",
+    "bal.SLS_Fn_target",
+]
+
+OD_STATE_VARS = [
+    ".balance.FAR",
+    ".balance.W",
+    ".balance.BPR",
+    ".balance.fan_Nmech",
+    ".balance.lp_Nmech",
+    ".balance.hp_Nmech",
+    ".fc.balance.Pt",
+    ".fc.balance.Tt",
+    ".hpt.PR",
+    ".lpt.PR",
+    ".fan.map.RlineMap",
+    ".lpc.map.RlineMap",
+    ".hpc.map.RlineMap",
+    ".gearbox.trq_base",
+    ".inject.mix:W",
+]
+
+
+def od_points(prob):
+    """
+    Names of the off-design points of the MPN3 of a set up problem (`model.od_pts`), OD_PTS for other models.
+    """
+    return list(getattr(prob.model, "od_pts", OD_PTS))
+
+
+def key_vars(od_pts=OD_PTS):
+    """
+    Design and operating parameters that identify a converged solution of an MPN3 with the off-design points `od_pts`.
+    """
+    return (
+        ["fan:PRdes", "lpc:PRdes", "TOC.balance.rhs:hpc_PR", "RTO_T4", "T4_ratio.TR"]
+        + [f"{pt}.extract.sub_flow.w_frac" for pt in ["TOC"] + list(od_pts)]
+        + [f"{pt}.fc.WAR" for pt in ["TOC"] + list(od_pts)]
+    )
+
+
+def state_vars(od_pts=OD_PTS):
+    """
+    Balance and solver states of an MPN3 with the off-design points `od_pts`.
+    """
+    return DES_STATE_VARS + [pt + name for name in OD_STATE_VARS for pt in od_pts]
+
+
+KEY_VARS = key_vars()
+STATE_VARS = state_vars()
+
+
+def _od_seed(**kwargs):
+    """
+    Seeds of the off-design points, each given as a list of values ordered as OD_PTS.
+    """
+    return {name: dict(zip(OD_PTS, vals)) for name, vals in kwargs.items()}
+
+
+# Initial guesses used until the database holds a converged solution for the fuel: the design point states and the
+# states of each point of OD_PTS (see `seed_states`)
+SEED_STATES = {
+    "JetA": {
+        "TOC.balance.FAR": 0.02650,
+        "TOC.balance.lpt_PR": 10.937,
+        "TOC.balance.hpt_PR": 4.185,
+        "TOC.fc.balance.Pt": 5.272,
+        "TOC.fc.balance.Tt": 444.41,
+        "TOC.inject.mix:W": 0.0,
+        "bal.TOC_W": 820.95,
+    },
+    "H2": {
+        "TOC.balance.FAR": 0.0102,
+        "TOC.balance.lpt_PR": 9.8,
+        "TOC.balance.hpt_PR": 4.2,
+        "TOC.fc.balance.Pt": 5.2,
+        "TOC.fc.balance.Tt": 444.3,
+        "TOC.inject.mix:W": 0.0,
+        "bal.TOC_W": 820.95,
+    },
+}
+
+SEED_OD_STATES = {
+    "JetA": _od_seed(
+        **{
+            "balance.FAR": [0.02832, 0.02541, 0.02510],
+            "balance.W": [1916.13, 1900.0, 802.79],
+            "balance.BPR": [25.5620, 22.3467, 24.3233],
+            "balance.fan_Nmech": [2132.6, 1953.1, 2118.7],
+            "balance.lp_Nmech": [6611.2, 6054.5, 6567.9],
+            "balance.hp_Nmech": [22288.2, 21594.0, 20574.1],
+            "fc.balance.Pt": [15.349, 14.696, 5.272],
+            "fc.balance.Tt": [552.49, 545.67, 444.41],
+            "hpt.PR": [4.210, 4.245, 4.197],
+            "lpt.PR": [8.161, 7.001, 10.803],
+            "fan.map.RlineMap": [1.7500, 1.7500, 1.9397],
+            "lpc.map.RlineMap": [2.0052, 1.8632, 2.1075],
+            "hpc.map.RlineMap": [2.0589, 2.0281, 1.9746],
+            "gearbox.trq_base": [52509.1, 41779.4, 22369.7],
+            "inject.mix:W": [0.0, 0.0, 0.01],
+        }
+    ),
+    "H2": _od_seed(
+        **{
+            "balance.FAR": [0.0106, 0.02541, 0.0094],
+            "balance.W": [1906.3, 1900.4, 797.5],
+            "balance.BPR": [26.1, 22.3467, 24.8],
+            "balance.fan_Nmech": [2119.9, 1953.1, 2095.7],
+            "balance.lp_Nmech": [6572.0, 6054.5, 6496.8],
+            "balance.hp_Nmech": [22150.0, 21594.0, 20431.0],
+            "fc.balance.Pt": [15.349, 14.696, 5.272],
+            "fc.balance.Tt": [552.49, 545.67, 444.41],
+            "hpt.PR": [4.2, 4.245, 4.2],
+            "lpt.PR": [8.0, 7.001, 9.9],
+            "fan.map.RlineMap": [1.7500, 1.7500, 1.9397],
+            "lpc.map.RlineMap": [1.9, 1.8632, 2.0],
+            "hpc.map.RlineMap": [2.0, 2.0281, 1.9],
+            "gearbox.trq_base": [52047.8, 41779.4, 21780.5],
+            "inject.mix:W": [0.0, 0.0, 0.0],
+        }
+    ),
+}
+
+
+def seed_states(fuel, od_pts=OD_PTS):
+    """
+    Initial guesses of an MPN3 with the off-design points `od_pts`. Points not in OD_PTS get no guesses and start from
+    the initial values of the model.
+    """
+    seed = dict(SEED_STATES[fuel])
+    for name, vals in SEED_OD_STATES[fuel].items():
+        for pt in od_pts:
+            if pt in vals:
+                seed[f"{pt}.{name}"] = vals[pt]
+    return seed
+
+
+def model_name(prob):
+    """
+    Name of the model class of a problem (module and class), which separates the records of different cycle models.
+    """
+    cls = type(prob.model)
+    module = cls.__module__
+    if module == "__main__":
+        # the model file run as a script
+        module = os.path.splitext(os.path.basename(sys.modules["__main__"].__file__))[0]
+    return f"{module}.{cls.__qualname__}"
+
+
+def _get(prob, name):
+    try:
+        return np.atleast_1d(prob.get_val(name)).copy()
+    except KeyError:
+        return None
+
+
+def _solve_converged(system, run):
+    # the solver reports non-convergence (or NaN) as an AnalysisError with err_on_non_converge set
+    options = system.nonlinear_solver.options
+
+    err_on_non_converge = options["err_on_non_converge"]
+    options["err_on_non_converge"] = True
+    try:
+        run()
+    except AnalysisError:
+        return False
+    finally:
+        options["err_on_non_converge"] = err_on_non_converge
+
+    return True
+
+
+def is_converged(prob, system=None):
+    """
+    True if the current solution of `system` (default: the model) is converged: its residual norm is within the
+    absolute tolerance of its nonlinear solver, or else the solver converges again from the current solution (one or
+    two Newton iterations for a solution converged on the relative tolerance). Pass the group that owns the Newton
+    solver when the model itself only runs once.
+    """
+    system = prob.model if system is None else system
+
+    system.run_apply_nonlinear()
+    if system.get_nonlinear_vectors()[2].get_norm() <= system.nonlinear_solver.options["atol"]:
+        return True
+
+    return _solve_converged(system, system.run_solve_nonlinear)
+
+
+def run_converged(prob, system=None):
+    """
+    Run the model and return True if the nonlinear solver of `system` (default: the model) reports convergence.
+    """
+    system = prob.model if system is None else system
+    return _solve_converged(system, prob.run_model)
+
+
+def get_states(prob, names):
+    """
+    Current values of the given variables, skipping names the problem does not have.
+    """
+    states = {}
+    for name in names:
+        val = _get(prob, name)
+        if val is not None:
+            states[name] = val
+    return states
+
+
+def set_states(prob, states):
+    """
+    Set the given state values on the problem, skipping names it does not have.
+    """
+    for name, val in states.items():
+        try:
+            prob.set_val(name, val)
+        except KeyError:
+            pass
+
+
+def _record_id(rec):
+    return (rec["fuel"], rec.get("model"), rec["od_pts"], rec["key"].tobytes())
+
+
+class WarmStartDB(object):
+    """
+    Persistent store of converged cycle states, keyed by fuel, model (see `model_name`), off-design points (see
+    `od_points`) and the design/operating parameters in `key_vars` of those points.
+
+    Each record holds the key vector and the values of `state_vars` of a converged solution. Lookups are done
+    within a fuel, model and set of points on key values scaled by the spread of the stored keys, either returning the
+    nearest solution or an inverse distance weighted blend of the nearest `n_neighbors`. States of one model are never
+    used to start another, e.g. the N3_CLVR and N3_CLVR_V3 MPN3 share the variable names but not their solutions.
+    """
+
+    def __init__(self, fname=WARM_START_FILE):
+        self.fname = fname
+        self.records = []
+
+        if os.path.isfile(fname):
+            self.records = self._read(fname)
+
+    def _read(self, fname):
+        with open(fname, "rb") as f:
+            data = pkl.load(f)
+
+        # files written before the points were stored per record hold the OD_PTS records only
+        if data.get("key_vars", KEY_VARS) != KEY_VARS:
+            raise ValueError(f"{fname} was written with different key variables.")
+        for rec in data["records"]:
+            rec.setdefault("od_pts", tuple(OD_PTS))
+
+        return data["records"]
+
+    def __len__(self):
+        return len(self.records)
+
+    def get_key(self, prob):
+        """
+        Key vector of the current problem inputs; NaN for keys the model does not have.
+        """
+        names = key_vars(od_points(prob))
+        key = np.full(len(names), np.nan)
+        for i, name in enumerate(names):
+            val = _get(prob, name)
+            if val is not None:
+                key[i] = val[0]
+        return key
+
+    def add(self, prob, fuel):
+        """
+        Record the current solution of the problem if it is converged. Returns True if the solution was recorded.
+        """
+        if not is_converged(prob):
+            return False
+
+        od_pts = od_points(prob)
+        states = get_states(prob, state_vars(od_pts))
+        self.records.append(
+            {
+                "fuel": fuel,
+                "model": model_name(prob),
+                "od_pts": tuple(od_pts),
+                "key": self.get_key(prob),
+                "states": states,
+            }
+        )
+
+        return True
+
+    def save(self):
+        """
+        Write the database, merging in any records written to the same file by other runs since it was read.
+        """
+        records = self.records
+        if os.path.isfile(self.fname):
+            stored = self._read(self.fname)
+            ids = {_record_id(r) for r in records}
+            records = [r for r in stored if _record_id(r) not in ids] + records
+
+        with atomic_write(self.fname) as f:
+            pkl.dump({"records": records}, f)
+
+        self.records = records
+
+    def _distances(self, key, fuel, model, od_pts):
+        # records written before the model was stored have no model and are never matched
+        records = [
+            r for r in self.records if r["fuel"] == fuel and r.get("model") == model and r["od_pts"] == tuple(od_pts)
+        ]
+        if len(records) == 0:
+            return records, np.zeros(0)
+
+        keys = np.array([r["key"] for r in records])
+
+        # scale each key by the spread of the stored values; keys missing from either side are ignored
+        scale = np.nanmax(keys, axis=0) - np.nanmin(keys, axis=0)
+        scale[~(scale > 0.0)] = 1.0
+        diff = (keys - key) / scale
+        diff[np.isnan(diff)] = 0.0
+
+        return records, np.sqrt(np.sum(diff**2, axis=1))
+
+    def lookup(self, key, fuel, model, od_pts=OD_PTS, n_neighbors=1, power=2.0):
+        """
+        State values for the given key, from the nearest record (n_neighbors=1) or an inverse distance weighted
+        blend of the nearest n_neighbors records. Returns None if there are no records for the fuel, model and points.
+        """
+        records, dist = self._distances(key, fuel, model, od_pts)
+        if len(records) == 0:
+            return None
+
+        idx = np.argsort(dist)[:n_neighbors]
+        if dist[idx[0]] == 0.0 or len(idx) == 1:
+            return dict(records[idx[0]]["states"])
+
+        weights = 1.0 / dist[idx] ** power
+        states = {}
+        for name in records[idx[0]]["states"]:
+            vals = [records[i]["states"][name] for i in idx if name in records[i]["states"]]
+            if len(vals) == len(idx):
+                states[name] = np.sum([w * v for w, v in zip(weights, vals)], axis=0) / np.sum(weights)
+            else:
+                states[name] = records[idx[0]]["states"][name]
+
+        return states
+
+    def warm_start(self, prob, fuel, n_neighbors=1):
+        """
+        Set the problem states from the closest converged solution to its current inputs, falling back to the seed
+        guesses when the database has no solution for the fuel and model. Returns True if a stored solution was used.
+        """
+        od_pts = od_points(prob)
+        states = self.lookup(self.get_key(prob), fuel, model_name(prob), od_pts, n_neighbors=n_neighbors)
+
+        if states is None:
+            set_states(prob, seed_states(fuel, od_pts))
+            return False
+
+        set_states(prob, states)
+        return True
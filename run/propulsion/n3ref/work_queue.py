@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+"""
+@File    :   work_queue.py
+@Time    :   2026/10/17
+@Desc    :   Master/worker queue to run sweep points dynamically over MPI ranks or local processes
+"""
+
+# ==============================================================================
+# Standard Python modules
+# ==============================================================================
+import queue
+import traceback
+from collections import deque
+from functools import partial
+from multiprocessing import Pool
+
+# ==============================================================================
+# External Python modules
+# ==============================================================================
+import numpy as np
+
+# ==============================================================================
+# Extension modules
+# ==============================================================================
+
+
+class SweepScheduler(object):
+    """
+    Hands out sweep points and collects their results on the master.
+
+    Each point is a dictionary of parameter values. A failed point is queued again (up to `max_retries` times) with
+    the converged states of its nearest converged neighbour, measured in parameters scaled by the sweep range. Failed
+    points without a converged neighbour yet wait until one is available.
+    """
+
+    def __init__(self, points, max_retries=2):
+        self.max_retries = max_retries
+        self.tasks = {}
+        self.pending = deque()
+        self.waiting = []
+        self.converged = {}
+        self.failed = []
+
+        for pid, params in points:
+            task = {"id": pid, "params": params, "states": None, "tries": 0, "tried": []}
+            self.tasks[pid] = task
+            self.pending.append(task)
+
+        names = sorted({name for _, params in points for name in params})
+        self.names = names
+        vals = np.array([[params.get(name, 0.0) for name in names] for _, params in points], dtype=float)
+        span = vals.max(axis=0) - vals.min(axis=0) if len(points) > 0 else np.ones(len(names))
+        span[span == 0.0] = 1.0
+        self.span = span
+
+    def _x(self, params):
+        return np.array([params.get(name, 0.0) for name in self.names], dtype=float) / self.span
+
+    def _neighbor(self, task):
+        x = self._x(task["params"])
+        best, best_dist = None, np.inf
+        for pid, (params, states) in self.converged.items():
+            if pid in task["tried"]:
+                continue
+            dist = np.linalg.norm(self._x(params) - x)
+            if dist < best_dist:
+                best, best_dist = pid, dist
+        return best
+
+    def next_task(self):
+        """
+        Next point to run, or None if nothing can be run right now.
+        """
+        if len(self.pending) > 0:
+            return self.pending.popleft()
+        return None
+
+    def give_up(self):
+        """
+        Give up the failed points still waiting for a converged neighbour, e.g. once nothing else is running. Returns
+        the given up points.
+        """
+        waiting, self.waiting = self.waiting, []
+        self.failed.extend(waiting)
+        return waiting
+
+    def report(self, task, success, states):
+        """
+        Record the outcome of a point. Returns True if it is finished (converged or out of retries).
+        """
+        if success:
+            self.converged[task["id"]] = (task["params"], states)
+            self._release_waiting()
+            return True
+
+        task["tries"] += 1
+        if task["tries"] > self.max_retries:
+            self.failed.append(task)
+            return True
+
+        self._retry(task)
+        return False
+
+    def _retry(self, task):
+        pid = self._neighbor(task)
+        if pid is None:
+            self.waiting.append(task)
+        else:
+            task["tried"].append(pid)
+            task["states"] = self.converged[pid][1]
+            self.pending.append(task)
+
+    def _release_waiting(self):
+        waiting, self.waiting = self.waiting, []
+        for task in waiting:
+            self._retry(task)
+
+
+def _run_task(worker, task):
+    try:
+        success, results, states = worker.run(task["params"], task["states"])
+    except Exception:
+        traceback.print_exc()
+        success, results, states = False, None, None
+    return task, success, results, states
+
+
+def _finish(sched, task, success, results, states, on_result):
+    done = sched.report(task, success, states)
+    if done and on_result is not None:
+        on_result(task["id"], task["params"], results if success else None)
+
+
+def _next_task(sched, n_running, on_result):
+    """
+    Next point of the scheduler. Once nothing is left to run, the points still waiting for a neighbour are reported
+    as failed.
+    """
+    task = sched.next_task()
+    if task is None and n_running == 0:
+        for failed in sched.give_up():
+            if on_result is not None:
+                on_result(failed["id"], failed["params"], None)
+    return task
+
+
+def _run_mpi(sched, worker_factory, on_result, comm):
+    from mpi4py import MPI
+
+    if comm.rank > 0:
+        worker = worker_factory()
+        comm.send(None, dest=0)
+        while True:
+            task = comm.recv(source=0)
+            if task is None:
+                break
+            comm.send(_run_task(worker, task), dest=0)
+        return
+
+    status = MPI.Status()
+    idle = []
+    n_running = 0
+    n_workers = comm.size - 1
+
+    while True:
+        msg = comm.recv(source=MPI.ANY_SOURCE, status=status)
+        idle.append(status.Get_source())
+        if msg is not None:
+            n_running -= 1
+            _finish(sched, *msg, on_result)
+
+        while len(idle) > 0:
+            task = _next_task(sched, n_running, on_result)
+            if task is None:
+                break
+            comm.send(task, dest=idle.pop())
+            n_running += 1
+
+        if n_running == 0 and len(idle) == n_workers:
+            break
+
+    for rank in idle:
+        comm.send(None, dest=rank)
+
+
+_worker = None
+
+
+def _init_pool_worker(worker_factory):
+    global _worker
+    _worker = worker_factory()
+
+
+def _run_pool_task(task):
+    return _run_task(_worker, task)
+
+
+def _pool_error(done, task, exc):
+    traceback.print_exception(type(exc), exc, exc.__traceback__)
+    done.put((task, False, None, None))
+
+
+def _run_pool(sched, worker_factory, on_result, n_procs):
+    if n_procs == 1:
+        worker = worker_factory()
+        while True:
+            task = _next_task(sched, 0, on_result)
+            if task is None:
+                break
+            _finish(sched, *_run_task(worker, task), on_result)
+        return
+
+    done = queue.Queue()
+    n_running = 0
+
+    with Pool(n_procs, initializer=_init_pool_worker, initargs=(worker_factory,)) as pool:
+        while True:
+            while n_running < n_procs:
+                task = _next_task(sched, n_running, on_result)
+                if task is None:
+                    break
+                # a result that cannot be sent back (e.g. fails to pickle) is reported as a failed run of the point
+                pool.apply_async(
+                    _run_pool_task, (task,), callback=done.put, error_callback=partial(_pool_error, done, task)
+                )
+                n_running += 1
+
+            if n_running == 0:
+                break
+
+            msg = done.get()
+            n_running -= 1
+            _finish(sched, *msg, on_result)
+
+
+def worker_comm():
+    """
+    Communicator for the problem of a queue worker: MPI.COMM_SELF, so each rank sets up and runs its own problem
+    without waiting on the other ranks, or None when mpi4py is not installed.
+    """
+    try:
+        from mpi4py import MPI
+    except ImportError:
+        return None
+    return MPI.COMM_SELF
+
+
+def run_queue(points, worker_factory, on_result=None, comm=None, n_procs=1, max_retries=2):
+    """
+    Run sweep points with a dynamic master/worker queue.
+
+    points : list of (point id, dict of parameter values)
+    worker_factory : picklable callable returning a worker, built once per process. The worker's
+        `run(params, states)` sets the parameters (and the states, if given, to warm start from a converged
+        neighbour), runs the point, and returns (success, results, converged states).
+    on_result : called on the master as on_result(point id, params, results) once a point is finished; results is
+        None for a point that failed all its retries.
+
+    With an MPI communicator of more than one rank, rank 0 is the master and the other ranks are workers. Otherwise
+    the points are run in a pool of `n_procs` local processes. Returns the scheduler on the master, None on workers.
+    """
+    sched = SweepScheduler(points, max_retries=max_retries)
+
+    if comm is not None and comm.size > 1:
+        _run_mpi(sched, worker_factory, on_result, comm)
+        if comm.rank > 0:
+            return None
+    else:
+        _run_pool(sched, worker_factory, on_result, n_procs)
+
+    return sched